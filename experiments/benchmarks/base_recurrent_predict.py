@@ -0,0 +1,67 @@
+import argparse
+import logging
+import time
+
+import pandas as pd
+
+from neuralforecast import NeuralForecast
+from neuralforecast.losses.pytorch import MAE, DistributionLoss
+from neuralforecast.models import LSTM
+from neuralforecast.utils import generate_series
+
+
+def legacy_predict_step(model, batch, batch_idx):
+    """Reference `BaseRecurrent.predict_step` that decodes, inverts the normalization
+    and samples every position of the series, `predict` keeps only the last ones."""
+    batch = model._normalization(batch, val_size=0, test_size=model.test_size)
+    windows = model._create_windows(batch, step="predict")
+    insample_y, insample_mask, _, _, hist_exog, futr_exog, stat_exog = model._parse_windows(batch, windows)
+    windows_batch = dict(insample_y=insample_y, insample_mask=insample_mask, futr_exog=futr_exog,
+                         hist_exog=hist_exog, stat_exog=stat_exog)
+    output = model(windows_batch)
+    return model._denormalize_output(output, temporal_cols=batch["temporal_cols"])
+
+
+def timeit(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-series", "--series", type=int, default=32)
+    parser.add_argument("-lengths", "--lengths", type=int, nargs="+", default=[125, 250, 500])
+    parser.add_argument("-repeats", "--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger("pytorch_lightning").setLevel(logging.ERROR)
+
+    losses = {
+        "MAE": MAE(),
+        "Normal": DistributionLoss(distribution="Normal", level=[80, 90], return_params=True),
+    }
+    print("| Loss   | Series | Length | All positions (s) | Returned positions (s) | Speedup |")
+    print("|--------|--------|--------|-------------------|------------------------|---------|")
+    for loss_name, loss in losses.items():
+        for length in args.lengths:
+            df = generate_series(n_series=args.series, min_length=length, max_length=length, freq="D")
+            model = LSTM(h=24, input_size=48, loss=loss, max_steps=1, batch_size=args.series,
+                         callbacks=[], enable_progress_bar=False, enable_model_summary=False, logger=False)
+            nf = NeuralForecast(models=[model], freq="D")
+            nf.fit(df=df)
+
+            new_time, new = timeit(lambda: nf.predict(), args.repeats)
+            # Lightning looks the hook up on the class
+            LSTM.predict_step = legacy_predict_step
+            legacy_time, legacy = timeit(lambda: nf.predict(), args.repeats)
+            del LSTM.predict_step
+            # Samples differ with the number of sampled positions, the distribution parameters do not
+            if loss.is_distribution_output:
+                cols = [c for c in new.columns if c.endswith(("-loc", "-scale"))]
+            else:
+                cols = ["LSTM"]
+            pd.testing.assert_frame_equal(new[cols], legacy[cols])
+            print(f"| {loss_name:<6} | {args.series:<6} | {length:<6,} | {legacy_time:17.3f} | {new_time:22.3f} | {legacy_time / new_time:6.1f}x |")
@@ -0,0 +1,100 @@
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+
+from neuralforecast import NeuralForecast
+from neuralforecast.models import NHITS
+from neuralforecast.utils import generate_series
+
+
+def legacy_create_windows(model, batch, step, w_idxs=None):
+    """Reference implementation of `BaseWindows._create_windows(step='predict')`
+    that pads, unfolds and copies every window of the batch on each call."""
+    window_size = model.input_size + model.h
+    temporal_cols = batch["temporal_cols"]
+    temporal = batch["temporal"]
+    initial_input = temporal.shape[-1] - model.test_size
+    if initial_input <= model.input_size:
+        padder_left = nn.ConstantPad1d(padding=(model.input_size - initial_input, 0), value=0)
+        temporal = padder_left(temporal)
+    temporal = temporal[:, :, -model.input_size - model.test_size :]
+    if (model.test_size == 0) and (len(model.futr_exog_list) == 0):
+        temporal = nn.ConstantPad1d(padding=(0, model.h), value=0)(temporal)
+    windows = temporal.unfold(dimension=-1, size=window_size, step=model.predict_step_size)
+    windows_per_serie = windows.shape[2]
+    windows = windows.permute(0, 2, 3, 1).contiguous()
+    windows = windows.reshape(-1, window_size, len(temporal_cols))
+    static = batch.get("static", None)
+    if static is not None:
+        static = torch.repeat_interleave(static, repeats=windows_per_serie, dim=0)
+    if w_idxs is not None:
+        windows = windows[w_idxs]
+        if static is not None:
+            static = static[w_idxs]
+    return dict(temporal=windows, temporal_cols=temporal_cols,
+                static=static, static_cols=batch.get("static_cols", None))
+
+
+def legacy_predict_step(model, batch, batch_idx):
+    """Reference `BaseWindows.predict_step` that rebuilds the windows for every chunk."""
+    windows = legacy_create_windows(model, batch, step="predict")
+    n_windows = len(windows["temporal"])
+    windows_batch_size = model.inference_windows_batch_size
+    if windows_batch_size < 0:
+        windows_batch_size = n_windows
+    n_batches = int(np.ceil(n_windows / windows_batch_size))
+    y_hats = []
+    for i in range(n_batches):
+        w_idxs = np.arange(i * windows_batch_size, min((i + 1) * windows_batch_size, n_windows))
+        windows = legacy_create_windows(model, batch, step="predict", w_idxs=w_idxs)
+        windows = model._normalization(windows=windows)
+        insample_y, insample_mask, _, _, hist_exog, futr_exog, stat_exog = model._parse_windows(batch, windows)
+        windows_batch = dict(insample_y=insample_y, insample_mask=insample_mask, futr_exog=futr_exog,
+                             hist_exog=hist_exog, stat_exog=stat_exog)
+        output_batch = model(windows_batch)
+        y_hat, _, _ = model._inv_normalization(y_hat=output_batch, temporal_cols=batch["temporal_cols"])
+        y_hats.append(y_hat)
+    return torch.cat(y_hats, dim=0)
+
+
+def timeit(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-series", "--series", type=int, default=64)
+    parser.add_argument("-lengths", "--lengths", type=int, nargs="+", default=[250, 500, 1_000, 2_000])
+    parser.add_argument("-inference_windows_batch_size", "--inference_windows_batch_size", type=int, default=256)
+    parser.add_argument("-repeats", "--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger("pytorch_lightning").setLevel(logging.ERROR)
+
+    print("| Series | Length | Windows | Legacy (s) | View + gather (s) | Speedup |")
+    print("|--------|--------|---------|------------|-------------------|---------|")
+    for length in args.lengths:
+        df = generate_series(n_series=args.series, min_length=length, max_length=length, freq="D")
+        # Small MLPs so that the timing is dominated by the windowing
+        model = NHITS(h=24, input_size=48, mlp_units=3 * [[32, 32]], max_steps=1, batch_size=args.series,
+                      inference_windows_batch_size=args.inference_windows_batch_size,
+                      callbacks=[], enable_progress_bar=False, enable_model_summary=False, logger=False)
+        nf = NeuralForecast(models=[model], freq="D")
+        nf.fit(df=df)
+
+        new_time, new = timeit(lambda: nf.predict_insample(step_size=1), args.repeats)
+        # Lightning looks the hook up on the class
+        NHITS.predict_step = legacy_predict_step
+        legacy_time, legacy = timeit(lambda: nf.predict_insample(step_size=1), args.repeats)
+        del NHITS.predict_step
+        pd.testing.assert_frame_equal(new, legacy)
+        print(f"| {args.series:<6} | {length:<6,} | {len(new) // model.h:<7,} | {legacy_time:10.3f} | {new_time:17.3f} | {legacy_time / new_time:6.1f}x |")
@@ -0,0 +1,79 @@
+import argparse
+import logging
+import platform
+import time
+
+import numpy as np
+import torch
+
+from neuralforecast import NeuralForecast
+from neuralforecast.models import LSTM, NHITS, PatchTST
+from neuralforecast.utils import generate_series
+
+
+def timeit(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+def cpu_name():
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def make_model(name, h, input_size, max_steps, compile, dynamic):
+    kwargs = dict(h=h, input_size=input_size, max_steps=max_steps, scaler_type="robust", val_check_steps=max_steps,
+                  enable_progress_bar=False, enable_model_summary=False, logger=False, accelerator="cpu")
+    model = {"NHITS": NHITS, "PatchTST": PatchTST, "LSTM": LSTM}[name](**kwargs)
+    if compile:
+        model.enable_compile(dynamic=dynamic)
+    return model
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-series", "--series", type=int, default=1_000)
+    parser.add_argument("-max_steps", "--max_steps", type=int, default=200)
+    parser.add_argument("-dynamic", "--dynamic", action="store_true")
+    parser.add_argument("-threads", "--threads", type=int, default=None)
+    parser.add_argument("-repeats", "--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger("pytorch_lightning").setLevel(logging.ERROR)
+    if args.threads is not None:
+        torch.set_num_threads(args.threads)
+
+    print(f"CPU: {cpu_name()}, torch {torch.__version__}, {torch.get_num_threads()} threads")
+    h, input_size = 24, 96
+    df = generate_series(n_series=args.series, min_length=500, max_length=500, freq="H", equal_ends=True)
+    print("| Model    | Compile (s) | Eager fit (s) | Compiled fit (s) | Fit speedup | Eager predict (s) | Compiled predict (s) | Predict speedup |")
+    print("|----------|-------------|---------------|------------------|-------------|-------------------|----------------------|-----------------|")
+    for name in ["NHITS", "PatchTST", "LSTM"]:
+        # The first compiled fit and predict compile the graphs. The timed runs reuse the normalization
+        # graphs, the forward of every fitted copy of the model is compiled again
+        start = time.perf_counter()
+        nf = NeuralForecast(models=[make_model(name, h, input_size, 2, True, args.dynamic)], freq="H")
+        nf.fit(df=df)
+        nf.predict()
+        compile_time = time.perf_counter() - start
+
+        fits = {}
+        for compile in [False, True]:
+            nf = NeuralForecast(models=[make_model(name, h, input_size, args.max_steps, compile, args.dynamic)], freq="H")
+            fit_time, _ = timeit(lambda: nf.fit(df=df), 1)
+            nf.predict()  # warm up
+            predict_time, fcst = timeit(lambda: nf.predict(), args.repeats)
+            fits[compile] = (fit_time, predict_time, fcst)
+        (eager_fit, eager_predict, eager_fcst), (compiled_fit, compiled_predict, compiled_fcst) = fits[False], fits[True]
+        np.testing.assert_allclose(eager_fcst[name], compiled_fcst[name], rtol=1e-2, atol=1e-2)
+        print(f"| {name:<8} | {compile_time:11.1f} | {eager_fit:13.2f} | {compiled_fit:16.2f} | {eager_fit / compiled_fit:10.2f}x "
+              f"| {eager_predict:17.3f} | {compiled_predict:20.3f} | {eager_predict / compiled_predict:14.2f}x |")
@@ -0,0 +1,77 @@
+import argparse
+import logging
+import platform
+import time
+
+import numpy as np
+import torch
+
+from neuralforecast import NeuralForecast
+from neuralforecast.models import LSTM, MLP, NBEATS, NHITS, TFT
+from neuralforecast.utils import generate_series
+
+
+def timeit(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+def cpu_name():
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def mae(fcst, test_df, col):
+    merged = test_df.merge(fcst, on=["unique_id", "ds"])
+    return np.abs(merged["y"] - merged[col]).mean()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-series", "--series", type=int, default=10_000)
+    parser.add_argument("-max_steps", "--max_steps", type=int, default=200)
+    parser.add_argument("-threads", "--threads", type=int, default=None)
+    parser.add_argument("-repeats", "--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger("pytorch_lightning").setLevel(logging.ERROR)
+    if args.threads is not None:
+        torch.set_num_threads(args.threads)
+
+    print(f"CPU: {cpu_name()}, torch {torch.__version__}, {torch.get_num_threads()} threads, quantized engine {torch.backends.quantized.engine}")
+    h, input_size = 24, 96
+    df = generate_series(n_series=args.series, min_length=500, max_length=500, freq="H", equal_ends=True)
+    test_df = df.groupby("unique_id", observed=True).tail(h)
+    train_df = df.drop(test_df.index)
+    trainer_kwargs = dict(max_steps=args.max_steps, enable_progress_bar=False, enable_model_summary=False,
+                          logger=False, accelerator="cpu")
+    models = {
+        "NHITS": NHITS(h=h, input_size=input_size, scaler_type="robust", **trainer_kwargs),
+        "NBEATS": NBEATS(h=h, input_size=input_size, scaler_type="robust", **trainer_kwargs),
+        "MLP": MLP(h=h, input_size=input_size, scaler_type="robust", **trainer_kwargs),
+        "TFT": TFT(h=h, input_size=input_size, scaler_type="robust", **trainer_kwargs),
+        "LSTM": LSTM(h=h, input_size=input_size, scaler_type="robust", **trainer_kwargs),
+    }
+    print("| Model  | Series | fp32 (s) | INT8 (s) | Speedup | fp32 MAE | INT8 MAE | MAE delta |")
+    print("|--------|--------|----------|----------|---------|----------|----------|-----------|")
+    for name, model in models.items():
+        nf = NeuralForecast(models=[model], freq="H")
+        nf.fit(df=train_df)
+        nf.predict(engine="torch")  # warm up
+        fp32_time, fp32 = timeit(lambda: nf.predict(engine="torch").reset_index(), args.repeats)
+        nf.quantize(dtype="int8")
+        nf.predict(engine="torch")
+        int8_time, int8 = timeit(lambda: nf.predict(engine="torch").reset_index(), args.repeats)
+
+        fp32_mae, int8_mae = mae(fp32, test_df, name), mae(int8, test_df, name)
+        print(f"| {name:<6} | {args.series:<6,} | {fp32_time:8.3f} | {int8_time:8.3f} | {fp32_time / int8_time:6.2f}x "
+              f"| {fp32_mae:8.4f} | {int8_mae:8.4f} | {(int8_mae - fp32_mae) / fp32_mae:+9.2%} |")
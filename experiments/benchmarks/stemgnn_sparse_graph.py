@@ -0,0 +1,71 @@
+import argparse
+import logging
+import time
+
+import torch
+import torch.nn.functional as F
+
+from neuralforecast.models import StemGNN
+
+
+def dense_graph_conv(model, key, query, x):
+    """Reference dense latent graph of `StemGNN.latent_correlation_layer` from the attention
+    keys and queries, followed by the graph convolution of a `StockBlockLayer`."""
+    data = model.leakyrelu(key + query.permute(0, 2, 1))
+    attention = torch.mean(F.softmax(data, dim=2), dim=0)
+    degree = torch.sum(attention, dim=1)
+    attention = 0.5 * (attention + attention.T)
+    degree_l = torch.diag(degree)
+    diagonal_degree_hat = torch.diag(1 / (torch.sqrt(degree) + 1e-7))
+    laplacian = torch.matmul(diagonal_degree_hat, torch.matmul(degree_l - attention, diagonal_degree_hat))
+    mul_L = model.cheb_polynomial(laplacian)
+    return torch.matmul(mul_L.unsqueeze(1), x.unsqueeze(1)), mul_L.numel()
+
+
+def sparse_graph_conv(model, key, query, x):
+    values, cols = model.sparse_graph_attention(key, query)
+    laplacian, _ = model.sparse_laplacian(values, cols)
+    return model.stock_block[0].cheb_graph_conv(laplacian, x.unsqueeze(1)), laplacian._nnz()
+
+
+def timeit(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-series", "--series", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("-top_k", "--top_k", type=int, default=16)
+    parser.add_argument("-batch_size", "--batch_size", type=int, default=1)
+    parser.add_argument("-input_size", "--input_size", type=int, default=24)
+    parser.add_argument("-dense_max_series", "--dense_max_series", type=int, default=10_000)
+    parser.add_argument("-repeats", "--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger("lightning_fabric").setLevel(logging.ERROR)
+    torch.manual_seed(0)
+
+    # Only the graph layers of the model are used, their size does not depend on n_series
+    model = StemGNN(h=12, input_size=args.input_size, n_series=8, graph_top_k=args.top_k)
+    model.eval()
+    print("| Series | Top-k | Dense (s) | Sparse (s) | Speedup | Dense laplacian entries | Sparse laplacian entries |")
+    print("|--------|-------|-----------|------------|---------|-------------------------|--------------------------|")
+    with torch.no_grad():
+        for n_series in args.series:
+            key = torch.randn(args.batch_size, n_series, 1)
+            query = torch.randn(args.batch_size, n_series, 1)
+            x = torch.randn(args.batch_size, 1, n_series, args.input_size)
+
+            sparse_time, (sparse, sparse_entries) = timeit(lambda: sparse_graph_conv(model, key, query, x), args.repeats)
+            if n_series <= args.dense_max_series:
+                dense_time, (dense, dense_entries) = timeit(lambda: dense_graph_conv(model, key, query, x), args.repeats)
+                assert dense.shape == sparse.shape
+                del dense
+                print(f"| {n_series:<6,} | {args.top_k:<5} | {dense_time:9.3f} | {sparse_time:10.3f} | {dense_time / sparse_time:6.1f}x | {dense_entries:23,} | {sparse_entries:24,} |")
+            else:
+                dense_entries = 4 * n_series**2
+                print(f"| {n_series:<6,} | {args.top_k:<5} | {'OOM':>9} | {sparse_time:10.3f} | {'-':>7} | {dense_entries:23,} | {sparse_entries:24,} |")
@@ -0,0 +1,104 @@
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from neuralforecast.tsdataset import TimeSeriesDataset
+
+
+def loop_append(dataset, futr_dataset):
+    """Per-series reference implementation of `TimeSeriesDataset.append`."""
+    len_temporal, col_temporal = dataset.temporal.shape
+    len_futr = futr_dataset.temporal.shape[0]
+    new_temporal = torch.empty(size=(len_temporal + len_futr, col_temporal))
+    new_sizes = np.diff(dataset.indptr) + np.diff(futr_dataset.indptr)
+    new_indptr = np.append(0, new_sizes.cumsum()).astype(np.int32)
+    for i in range(dataset.n_groups):
+        curr_slice = slice(dataset.indptr[i], dataset.indptr[i + 1])
+        curr_size = curr_slice.stop - curr_slice.start
+        futr_slice = slice(futr_dataset.indptr[i], futr_dataset.indptr[i + 1])
+        new_temporal[new_indptr[i] : new_indptr[i] + curr_size] = dataset.temporal[curr_slice]
+        new_temporal[new_indptr[i] + curr_size : new_indptr[i + 1]] = futr_dataset.temporal[futr_slice]
+    return new_temporal, new_indptr
+
+
+def loop_trim(dataset, left_trim, right_trim):
+    """Per-series reference implementation of `TimeSeriesDataset.trim_dataset`."""
+    len_temporal, col_temporal = dataset.temporal.shape
+    total_trim = (left_trim + right_trim) * dataset.n_groups
+    new_temporal = torch.zeros(size=(len_temporal - total_trim, col_temporal))
+    new_indptr = [0]
+    acum = 0
+    for i in range(dataset.n_groups):
+        new_length = dataset.indptr[i + 1] - dataset.indptr[i] - left_trim - right_trim
+        new_temporal[acum : acum + new_length] = dataset.temporal[
+            dataset.indptr[i] + left_trim : dataset.indptr[i + 1] - right_trim
+        ]
+        acum += new_length
+        new_indptr.append(acum)
+    return new_temporal, np.array(new_indptr, dtype=np.int32)
+
+
+def make_dataset(n_groups, min_length, max_length, n_cols, seed=0):
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(min_length, max_length + 1, size=n_groups)
+    indptr = np.append(0, sizes.cumsum()).astype(np.int32)
+    temporal = rng.standard_normal((indptr[-1], n_cols), dtype=np.float32)
+    return TimeSeriesDataset(
+        temporal=temporal,
+        temporal_cols=[f"c{i}" for i in range(n_cols)],
+        indptr=indptr,
+        max_size=sizes.max(),
+        min_size=sizes.min(),
+    )
+
+
+def timeit(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-groups", "--groups", type=int, nargs="+",
+                        default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("-repeats", "--repeats", type=int, default=3)
+    parser.add_argument("-max_loop_groups", "--max_loop_groups", type=int, default=1_000_000,
+                        help="skip the per-series reference above this number of groups")
+    args = parser.parse_args()
+
+    print("| Groups    | Method | Loop (s) | Vectorized (s) | Speedup |")
+    print("|-----------|--------|----------|----------------|---------|")
+    for n_groups in args.groups:
+        dataset = make_dataset(n_groups, min_length=20, max_length=30, n_cols=3)
+        futr_dataset = make_dataset(n_groups, min_length=12, max_length=12, n_cols=3, seed=1)
+        run_loop = n_groups <= args.max_loop_groups
+
+        # Append
+        vec = dataset.append(futr_dataset)
+        vec_time = timeit(lambda: dataset.append(futr_dataset), args.repeats)
+        if run_loop:
+            loop_temporal, loop_indptr = loop_append(dataset, futr_dataset)
+            np.testing.assert_array_equal(vec.temporal.numpy(), loop_temporal.numpy())
+            np.testing.assert_array_equal(vec.indptr, loop_indptr)
+            loop_time = timeit(lambda: loop_append(dataset, futr_dataset), args.repeats)
+            print(f"| {n_groups:<9,} | append | {loop_time:8.3f} | {vec_time:14.4f} | {loop_time / vec_time:6.1f}x |")
+        else:
+            print(f"| {n_groups:<9,} | append | {'-':>8} | {vec_time:14.4f} | {'-':>7} |")
+
+        # Trim
+        vec = TimeSeriesDataset.trim_dataset(dataset, left_trim=5, right_trim=10)
+        vec_time = timeit(lambda: TimeSeriesDataset.trim_dataset(dataset, left_trim=5, right_trim=10), args.repeats)
+        if run_loop:
+            loop_temporal, loop_indptr = loop_trim(dataset, left_trim=5, right_trim=10)
+            np.testing.assert_array_equal(vec.temporal.numpy(), loop_temporal.numpy())
+            np.testing.assert_array_equal(vec.indptr, loop_indptr)
+            loop_time = timeit(lambda: loop_trim(dataset, left_trim=5, right_trim=10), args.repeats)
+            print(f"| {n_groups:<9,} | trim   | {loop_time:8.3f} | {vec_time:14.4f} | {loop_time / vec_time:6.1f}x |")
+        else:
+            print(f"| {n_groups:<9,} | trim   | {'-':>8} | {vec_time:14.4f} | {'-':>7} |")
@@ -1,4 +1,13 @@
 __version__ = "1.6.4"
 __all__ = ['NeuralForecast']
 import neuralforecast.config  # noqa
-from .core import NeuralForecast
+
+
+def __getattr__(name):
+    # The training stack is imported on first use of `NeuralForecast`, so that
+    # runtime modules like `neuralforecast.export` load without Lightning
+    if name == "NeuralForecast":
+        from .core import NeuralForecast
+
+        return NeuralForecast
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -61,6 +61,12 @@ d = { 'settings': { 'branch': 'main',
             'neuralforecast.core': { 'neuralforecast.core.NeuralForecast': ('core.html#neuralforecast', 'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.__init__': ( 'core.html#neuralforecast.__init__',
                                                                                       'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._collect_units': ( 'core.html#neuralforecast._collect_units',
+                                                                                            'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._fit_models': ( 'core.html#neuralforecast._fit_models',
+                                                                                         'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast._predict_fused': ( 'core.html#neuralforecast._predict_fused',
+                                                                                            'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._prepare_fit': ( 'core.html#neuralforecast._prepare_fit',
                                                                                           'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast._scalers_fit_transform': ( 'core.html#neuralforecast._scalers_fit_transform',
@@ -81,9 +87,20 @@ d = { 'settings': { 'branch': 'main',
                                                                                      'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.predict_insample': ( 'core.html#neuralforecast.predict_insample',
                                                                                               'neuralforecast/core.py'),
+                                     'neuralforecast.core.NeuralForecast.quantize': ( 'core.html#neuralforecast.quantize',
+                                                                                      'neuralforecast/core.py'),
                                      'neuralforecast.core.NeuralForecast.save': ('core.html#neuralforecast.save', 'neuralforecast/core.py'),
+                                     'neuralforecast.core._fit_predict_models': ( 'core.html#_fit_predict_models',
+                                                                                  'neuralforecast/core.py'),
                                      'neuralforecast.core._insample_times': ('core.html#_insample_times', 'neuralforecast/core.py'),
                                      'neuralforecast.core._warn_id_as_idx': ('core.html#_warn_id_as_idx', 'neuralforecast/core.py')},
+            'neuralforecast.export': { 'neuralforecast.export.WindowsRuntime': ('export.html#windowsruntime', 'neuralforecast/export.py'),
+                                       'neuralforecast.export.WindowsRuntime.__init__': ('export.html#windowsruntime.__init__', 'neuralforecast/export.py'),
+                                       'neuralforecast.export.WindowsRuntime.predict': ('export.html#windowsruntime.predict', 'neuralforecast/export.py'),
+                                       'neuralforecast.export._WindowsGraph': ('export.html#_windowsgraph', 'neuralforecast/export.py'),
+                                       'neuralforecast.export._WindowsGraph.__init__': ('export.html#_windowsgraph.__init__', 'neuralforecast/export.py'),
+                                       'neuralforecast.export._WindowsGraph.forward': ('export.html#_windowsgraph.forward', 'neuralforecast/export.py'),
+                                       'neuralforecast.export.export_model': ('export.html#export_model', 'neuralforecast/export.py')},
             'neuralforecast.losses.numpy': { 'neuralforecast.losses.numpy._divide_no_nan': ( 'losses.numpy.html#_divide_no_nan',
                                                                                              'neuralforecast/losses/numpy.py'),
                                              'neuralforecast.losses.numpy._metric_protections': ( 'losses.numpy.html#_metric_protections',
@@ -424,12 +441,16 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                'neuralforecast/models/dilated_rnn.py'),
                                                    'neuralforecast.models.dilated_rnn.DRNN._split_outputs': ( 'models.dilated_rnn.html#drnn._split_outputs',
                                                                                                               'neuralforecast/models/dilated_rnn.py'),
+                                                   'neuralforecast.models.dilated_rnn.DRNN._stateful_drnn_layer': ( 'models.dilated_rnn.html#drnn._stateful_drnn_layer',
+                                                                                                                    'neuralforecast/models/dilated_rnn.py'),
                                                    'neuralforecast.models.dilated_rnn.DRNN._unpad_outputs': ( 'models.dilated_rnn.html#drnn._unpad_outputs',
                                                                                                               'neuralforecast/models/dilated_rnn.py'),
                                                    'neuralforecast.models.dilated_rnn.DRNN.drnn_layer': ( 'models.dilated_rnn.html#drnn.drnn_layer',
                                                                                                           'neuralforecast/models/dilated_rnn.py'),
                                                    'neuralforecast.models.dilated_rnn.DRNN.forward': ( 'models.dilated_rnn.html#drnn.forward',
                                                                                                        'neuralforecast/models/dilated_rnn.py'),
+                                                   'neuralforecast.models.dilated_rnn.DRNN.stateful_forward': ( 'models.dilated_rnn.html#drnn.stateful_forward',
+                                                                                                                'neuralforecast/models/dilated_rnn.py'),
                                                    'neuralforecast.models.dilated_rnn.DilatedRNN': ( 'models.dilated_rnn.html#dilatedrnn',
                                                                                                      'neuralforecast/models/dilated_rnn.py'),
                                                    'neuralforecast.models.dilated_rnn.DilatedRNN.__init__': ( 'models.dilated_rnn.html#dilatedrnn.__init__',
@@ -542,6 +563,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                                'neuralforecast/models/hint.py'),
                                             'neuralforecast.models.hint.HINT.predict': ( 'models.hint.html#hint.predict',
                                                                                          'neuralforecast/models/hint.py'),
+                                            'neuralforecast.models.hint.HINT.quantize': ( 'models.hint.html#hint.quantize',
+                                                                                          'neuralforecast/models/hint.py'),
                                             'neuralforecast.models.hint.HINT.save': ( 'models.hint.html#hint.save',
                                                                                       'neuralforecast/models/hint.py'),
                                             'neuralforecast.models.hint.HINT.set_test_size': ( 'models.hint.html#hint.set_test_size',
@@ -791,10 +814,18 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                    'neuralforecast/models/stemgnn.py'),
                                                'neuralforecast.models.stemgnn.StemGNN.self_graph_attention': ( 'models.stemgnn.html#stemgnn.self_graph_attention',
                                                                                                                'neuralforecast/models/stemgnn.py'),
+                                               'neuralforecast.models.stemgnn.StemGNN.sparse_graph_attention': ( 'models.stemgnn.html#stemgnn.sparse_graph_attention',
+                                                                                                                 'neuralforecast/models/stemgnn.py'),
+                                               'neuralforecast.models.stemgnn.StemGNN.sparse_laplacian': ( 'models.stemgnn.html#stemgnn.sparse_laplacian',
+                                                                                                           'neuralforecast/models/stemgnn.py'),
+                                               'neuralforecast.models.stemgnn.StemGNN.sparse_latent_correlation_layer': ( 'models.stemgnn.html#stemgnn.sparse_latent_correlation_layer',
+                                                                                                                          'neuralforecast/models/stemgnn.py'),
                                                'neuralforecast.models.stemgnn.StockBlockLayer': ( 'models.stemgnn.html#stockblocklayer',
                                                                                                   'neuralforecast/models/stemgnn.py'),
                                                'neuralforecast.models.stemgnn.StockBlockLayer.__init__': ( 'models.stemgnn.html#stockblocklayer.__init__',
                                                                                                            'neuralforecast/models/stemgnn.py'),
+                                               'neuralforecast.models.stemgnn.StockBlockLayer.cheb_graph_conv': ( 'models.stemgnn.html#stockblocklayer.cheb_graph_conv',
+                                                                                                                  'neuralforecast/models/stemgnn.py'),
                                                'neuralforecast.models.stemgnn.StockBlockLayer.forward': ( 'models.stemgnn.html#stockblocklayer.forward',
                                                                                                           'neuralforecast/models/stemgnn.py'),
                                                'neuralforecast.models.stemgnn.StockBlockLayer.spe_seq_cell': ( 'models.stemgnn.html#stockblocklayer.spe_seq_cell',
@@ -903,10 +934,42 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                                     'neuralforecast/models/vanillatransformer.py'),
                                                           'neuralforecast.models.vanillatransformer.VanillaTransformer.forward': ( 'models.vanillatransformer.html#vanillatransformer.forward',
                                                                                                                                    'neuralforecast/models/vanillatransformer.py')},
+            'neuralforecast.serving': { 'neuralforecast.serving.ForecastServer': ( 'serving.html#forecastserver',
+                                                                                   'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.__aenter__': ( 'serving.html#forecastserver.__aenter__',
+                                                                                              'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.__aexit__': ( 'serving.html#forecastserver.__aexit__',
+                                                                                             'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.__init__': ( 'serving.html#forecastserver.__init__',
+                                                                                            'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._batch_loop': ( 'serving.html#forecastserver._batch_loop',
+                                                                                               'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._handle': ( 'serving.html#forecastserver._handle',
+                                                                                           'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._parse_payload': ( 'serving.html#forecastserver._parse_payload',
+                                                                                                  'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._predict_batch': ( 'serving.html#forecastserver._predict_batch',
+                                                                                                  'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._predict_requests': ( 'serving.html#forecastserver._predict_requests',
+                                                                                                     'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer._route': ( 'serving.html#forecastserver._route',
+                                                                                          'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.forecast': ( 'serving.html#forecastserver.forecast',
+                                                                                            'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.latency_stats': ( 'serving.html#forecastserver.latency_stats',
+                                                                                                 'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.serve_forever': ( 'serving.html#forecastserver.serve_forever',
+                                                                                                 'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.start': ( 'serving.html#forecastserver.start',
+                                                                                         'neuralforecast/serving.py'),
+                                        'neuralforecast.serving.ForecastServer.stop': ( 'serving.html#forecastserver.stop',
+                                                                                        'neuralforecast/serving.py')},
             'neuralforecast.tsdataset': { 'neuralforecast.tsdataset.TimeSeriesDataModule': ( 'tsdataset.html#timeseriesdatamodule',
                                                                                              'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataModule.__init__': ( 'tsdataset.html#timeseriesdatamodule.__init__',
                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataModule._shard_loader': ( 'tsdataset.html#timeseriesdatamodule._shard_loader',
+                                                                                                           'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataModule.predict_dataloader': ( 'tsdataset.html#timeseriesdatamodule.predict_dataloader',
                                                                                                                 'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataModule.train_dataloader': ( 'tsdataset.html#timeseriesdatamodule.train_dataloader',
@@ -919,28 +982,70 @@ d = { 'settings': { 'branch': 'main',
                                                                                                  'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__getitem__': ( 'tsdataset.html#timeseriesdataset.__getitem__',
                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.__getitems__': ( 'tsdataset.html#timeseriesdataset.__getitems__',
+                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.__getstate__': ( 'tsdataset.html#timeseriesdataset.__getstate__',
+                                                                                                       'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__init__': ( 'tsdataset.html#timeseriesdataset.__init__',
                                                                                                    'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__len__': ( 'tsdataset.html#timeseriesdataset.__len__',
                                                                                                   'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.__repr__': ( 'tsdataset.html#timeseriesdataset.__repr__',
                                                                                                    'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.__setstate__': ( 'tsdataset.html#timeseriesdataset.__setstate__',
+                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._get_available_cumsum': ( 'tsdataset.html#timeseriesdataset._get_available_cumsum',
+                                                                                                                'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._get_ragged': ( 'tsdataset.html#timeseriesdataset._get_ragged',
+                                                                                                      'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset._load_arrays': ( 'tsdataset.html#timeseriesdataset._load_arrays',
+                                                                                                       'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.align': ( 'tsdataset.html#timeseriesdataset.align',
                                                                                                 'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.append': ( 'tsdataset.html#timeseriesdataset.append',
                                                                                                  'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.from_df': ( 'tsdataset.html#timeseriesdataset.from_df',
                                                                                                   'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.load': ( 'tsdataset.html#timeseriesdataset.load',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.save': ( 'tsdataset.html#timeseriesdataset.save',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.project_dataset': ( 'tsdataset.html#timeseriesdataset.project_dataset',
+                                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDataset.tail_dataset': ( 'tsdataset.html#timeseriesdataset.tail_dataset',
+                                                                                                       'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.trim_dataset': ( 'tsdataset.html#timeseriesdataset.trim_dataset',
                                                                                                        'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesDataset.update_dataset': ( 'tsdataset.html#timeseriesdataset.update_dataset',
                                                                                                          'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDeviceLoader': ( 'tsdataset.html#timeseriesdeviceloader',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDeviceLoader.__init__': ( 'tsdataset.html#timeseriesdeviceloader.__init__',
+                                                                                                        'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDeviceLoader.__iter__': ( 'tsdataset.html#timeseriesdeviceloader.__iter__',
+                                                                                                        'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDeviceLoader.__len__': ( 'tsdataset.html#timeseriesdeviceloader.__len__',
+                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesDeviceLoader._get_ragged': ( 'tsdataset.html#timeseriesdeviceloader._get_ragged',
+                                                                                                           'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesLoader': ( 'tsdataset.html#timeseriesloader',
                                                                                          'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesLoader.__init__': ( 'tsdataset.html#timeseriesloader.__init__',
                                                                                                   'neuralforecast/tsdataset.py'),
                                           'neuralforecast.tsdataset.TimeSeriesLoader._collate_fn': ( 'tsdataset.html#timeseriesloader._collate_fn',
-                                                                                                     'neuralforecast/tsdataset.py')},
+                                                                                                     'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesLoader._ragged_collate_fn': ( 'tsdataset.html#timeseriesloader._ragged_collate_fn',
+                                                                                                            'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesShardSampler': ( 'tsdataset.html#timeseriesshardsampler',
+                                                                                               'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesShardSampler.__init__': ( 'tsdataset.html#timeseriesshardsampler.__init__',
+                                                                                                        'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesShardSampler.__iter__': ( 'tsdataset.html#timeseriesshardsampler.__iter__',
+                                                                                                        'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset.TimeSeriesShardSampler.__len__': ( 'tsdataset.html#timeseriesshardsampler.__len__',
+                                                                                                       'neuralforecast/tsdataset.py'),
+                                          'neuralforecast.tsdataset._ragged_arange': ( 'tsdataset.html#_ragged_arange',
+                                                                                       'neuralforecast/tsdataset.py')},
             'neuralforecast.utils': { 'neuralforecast.utils.DayOfMonth': ('utils.html#dayofmonth', 'neuralforecast/utils.py'),
                                       'neuralforecast.utils.DayOfMonth.__call__': ( 'utils.html#dayofmonth.__call__',
                                                                                     'neuralforecast/utils.py'),
@@ -435,4 +435,15 @@ class BaseAuto(pl.LightningModule):
         **Parameters:**<br>
         `path`: str, path to save the model.<br>
         """
-        self.model.trainer.save_checkpoint(path)
+        self.model.save(path)
+
+    def quantize(self, dtype="int8"):
+        """BaseAuto.quantize
+
+        Post-training dynamic quantization of the best performing model for CPU inference.
+
+        **Parameters:**<br>
+        `dtype`: str='int8', dtype of the quantized weights, 'int8' or 'float16'.<br>
+        """
+        self.model.quantize(dtype=dtype)
+        return self
@@ -15,10 +15,11 @@ from pytorch_lightning.callbacks import TQDMProgressBar
 from pytorch_lightning.callbacks.early_stopping import EarlyStopping
 
 from ._scalers import TemporalNorm
-from ..tsdataset import TimeSeriesDataModule
+from ._inference import InferenceRunner, _QuantizationMixin, _save_checkpoint
+from ..tsdataset import TimeSeriesDataModule, TimeSeriesDataset, TimeSeriesShardSampler
 
 # %% ../../nbs/common.base_multivariate.ipynb 6
-class BaseMultivariate(pl.LightningModule):
+class BaseMultivariate(_QuantizationMixin, pl.LightningModule):
     """Base Multivariate
 
     Base class for all multivariate models. The forecasts for all time-series are produced simultaneously
@@ -41,6 +42,7 @@ class BaseMultivariate(pl.LightningModule):
         val_check_steps,
         n_series,
         batch_size,
+        inference_windows_batch_size=None,
         step_size=1,
         num_lr_decays=0,
         early_stop_patience_steps=-1,
@@ -50,6 +52,7 @@ class BaseMultivariate(pl.LightningModule):
         stat_exog_list=None,
         num_workers_loader=0,
         drop_last_loader=False,
+        shard_sampling="clustered",
         random_seed=1,
         alias=None,
         **trainer_kwargs,
@@ -77,6 +80,10 @@ class BaseMultivariate(pl.LightningModule):
         self.valid_trajectories = []
 
         self.batch_size = batch_size
+        if inference_windows_batch_size is None:
+            self.inference_windows_batch_size = batch_size
+        else:
+            self.inference_windows_batch_size = inference_windows_batch_size
 
         # Optimization
         self.learning_rate = learning_rate
@@ -143,13 +150,33 @@ class BaseMultivariate(pl.LightningModule):
         # DataModule arguments
         self.num_workers_loader = num_workers_loader
         self.drop_last_loader = drop_last_loader
+        # Panels with more series than n_series train on shards of n_series series,
+        # the default keeps every serie in the same position of its shard
+        self.shard_sampling = shard_sampling
         # used by on_validation_epoch_end hook
         self.validation_step_outputs = []
         self.alias = alias
+        # Post-training quantization of the layers, see `quantize`
+        self.quantization = None
+        # `torch.compile` options of the forward and normalization, see `enable_compile`
+        self.compile_kwargs = None
 
     def __repr__(self):
         return type(self).__name__ if self.alias is None else self.alias
 
+    def __call__(self, *args, **kwargs):
+        # After `enable_compile` the model's own bound forward is compiled on the first
+        # call and shadows the class forward, `nn.Module.__call__` still runs its hooks
+        if self.compile_kwargs is not None and "forward" not in self.__dict__:
+            self.forward = torch.compile(self.forward, **self.compile_kwargs)
+        return super().__call__(*args, **kwargs)
+
+    def __getstate__(self):
+        # The compiled forward can not be pickled, copies compile their own
+        state = super().__getstate__()
+        state.pop("forward", None)
+        return state
+
     def on_fit_start(self):
         torch.manual_seed(self.random_seed)
         np.random.seed(self.random_seed)
@@ -183,20 +210,28 @@ class BaseMultivariate(pl.LightningModule):
             )
             # [n_series, C, Ws, L+H] 0, 1, 2, 3
 
-            # Sample and Available conditions
-            available_idx = temporal_cols.get_loc("available_mask")
-            sample_condition = windows[:, available_idx, :, -self.h :]
-            sample_condition = torch.sum(sample_condition, axis=2)  # Sum over time
-            sample_condition = torch.sum(
-                sample_condition, axis=0
-            )  # Sum over time-series
-            available_condition = windows[:, available_idx, :, : -self.h]
-            available_condition = torch.sum(
-                available_condition, axis=2
-            )  # Sum over time
-            available_condition = torch.sum(
-                available_condition, axis=0
-            )  # Sum over time-series
+            # Sample and Available conditions from the cumulative available_mask
+            # summed over time-series, the loaders provide it precomputed by the dataset
+            available = batch.get("available_cumsum", None)
+            if available is None:
+                available_idx = temporal_cols.get_loc("available_mask")
+                available = torch.cumsum(
+                    batch["temporal"][:, available_idx] > 0, dim=-1
+                )
+                available = nn.functional.pad(available, (1, 0))
+            available = available.sum(dim=0)  # Sum over time-series
+            if self.val_size + self.test_size > 0:
+                available = available[:cutoff]
+            available = torch.cat([available, available[-1:].expand(self.h)])
+            starts = (
+                torch.arange(windows.shape[2], device=temporal.device) * self.step_size
+            )
+            available_condition = (
+                available[starts + self.input_size] - available[starts]
+            )
+            sample_condition = (
+                available[starts + window_size] - available[starts + self.input_size]
+            )
             final_condition = (sample_condition > 0) & (
                 available_condition > 0
             )  # Of shape [Ws]
@@ -488,50 +523,77 @@ class BaseMultivariate(pl.LightningModule):
         self.validation_step_outputs.clear()  # free memory (compute `avg_loss` per epoch)
 
     def predict_step(self, batch, batch_idx):
-        # Create and normalize windows [Ws, L+H, C]
-        windows = self._create_windows(batch, step="predict")
-        windows = self._normalization(windows=windows)
-
-        # Parse windows
-        (
-            insample_y,
-            insample_mask,
-            _,
-            _,
-            hist_exog,
-            futr_exog,
-            stat_exog,
-        ) = self._parse_windows(batch, windows)
+        # Windows view [Ws, C, L+H, n_series] built once, every inference batch copies from it
+        windows_view = self._create_windows(batch, step="predict")
+        n_windows = len(windows_view["temporal"])
+
+        # Number of windows in batch
+        windows_batch_size = self.inference_windows_batch_size
+        if windows_batch_size < 0:
+            windows_batch_size = n_windows
+        windows_batch_size = min(windows_batch_size, n_windows)
+
+        # Inference batches are normalized in place in a single buffer, the forecasts
+        # of every batch are written to an output preallocated after the first one
+        temporal = windows_view["temporal"]
+        windows_buffer = torch.empty(
+            (windows_batch_size, *temporal.shape[1:]),
+            dtype=temporal.dtype,
+            device=temporal.device,
+        )
+        y_hat = None
+        for start in range(0, n_windows, windows_batch_size):
+            end = min(start + windows_batch_size, n_windows)
+            windows_temporal = windows_buffer[: end - start]
+            windows_temporal.copy_(temporal[start:end])
+            windows = self._normalization(
+                windows={**windows_view, "temporal": windows_temporal}
+            )
 
-        windows_batch = dict(
-            insample_y=insample_y,  # [Ws, L]
-            insample_mask=insample_mask,  # [Ws, L]
-            futr_exog=futr_exog,  # [Ws, L+H]
-            hist_exog=hist_exog,  # [Ws, L]
-            stat_exog=stat_exog,
-        )  # [Ws, 1]
+            # Parse windows
+            (
+                insample_y,
+                insample_mask,
+                _,
+                _,
+                hist_exog,
+                futr_exog,
+                stat_exog,
+            ) = self._parse_windows(batch, windows)
 
-        # Model Predictions
-        output = self(windows_batch)
-        if self.loss.is_distribution_output:
-            _, y_loc, y_scale = self._inv_normalization(
-                y_hat=output[0], temporal_cols=batch["temporal_cols"]
-            )
-            distr_args = self.loss.scale_decouple(
-                output=output, loc=y_loc, scale=y_scale
-            )
-            _, y_hat = self.loss.sample(distr_args=distr_args)
+            windows_batch = dict(
+                insample_y=insample_y,  # [Ws, L]
+                insample_mask=insample_mask,  # [Ws, L]
+                futr_exog=futr_exog,  # [Ws, L+H]
+                hist_exog=hist_exog,  # [Ws, L]
+                stat_exog=stat_exog,
+            )  # [Ws, 1]
+
+            # Model Predictions
+            output = self(windows_batch)
+            if self.loss.is_distribution_output:
+                _, y_loc, y_scale = self._inv_normalization(
+                    y_hat=output[0], temporal_cols=batch["temporal_cols"]
+                )
+                distr_args = self.loss.scale_decouple(
+                    output=output, loc=y_loc, scale=y_scale
+                )
+                _, y_hat_batch = self.loss.sample(distr_args=distr_args)
 
-            if self.loss.return_params:
-                distr_args = torch.stack(distr_args, dim=-1)
-                distr_args = torch.reshape(
-                    distr_args, (len(windows["temporal"]), self.h, -1)
+                if self.loss.return_params:
+                    distr_args = torch.stack(distr_args, dim=-1)
+                    distr_args = torch.reshape(
+                        distr_args, (len(windows["temporal"]), self.h, -1)
+                    )
+                    y_hat_batch = torch.concat((y_hat_batch, distr_args), axis=2)
+            else:
+                y_hat_batch, _, _ = self._inv_normalization(
+                    y_hat=output, temporal_cols=batch["temporal_cols"]
                 )
-                y_hat = torch.concat((y_hat, distr_args), axis=2)
-        else:
-            y_hat, _, _ = self._inv_normalization(
-                y_hat=output, temporal_cols=batch["temporal_cols"]
-            )
+
+            if y_hat is None:
+                y_hat = y_hat_batch.new_empty((n_windows, *y_hat_batch.shape[1:]))
+            y_hat[start:end] = y_hat_batch
         return y_hat
 
     def fit(self, dataset, val_size=0, test_size=0, random_seed=None):
@@ -556,6 +618,9 @@ class BaseMultivariate(pl.LightningModule):
         `test_size`: int, test size for temporal cross-validation.<br>
         """
 
+        if self.quantization is not None:
+            raise Exception("Quantized models can not be fitted.")
+
         # Check exogenous variables are contained in dataset
         temporal_cols = set(dataset.temporal_cols.tolist())
         static_cols = set(
@@ -581,11 +646,21 @@ class BaseMultivariate(pl.LightningModule):
 
         self.val_size = val_size
         self.test_size = test_size
+        # Windows only carry y, the model's exogenous variables and the available_mask
+        dataset = TimeSeriesDataset.project_dataset(
+            dataset,
+            temporal_cols=["y"]
+            + self.hist_exog_list
+            + self.futr_exog_list
+            + ["available_mask"],
+        )
         datamodule = TimeSeriesDataModule(
             dataset=dataset,
             batch_size=self.n_series,
             num_workers=self.num_workers_loader,
             drop_last=self.drop_last_loader,
+            shard_size=self._shard_size(dataset),
+            shard_sampling=self.shard_sampling,
         )
 
         if self.val_check_steps > self.max_steps:
@@ -606,6 +681,7 @@ class BaseMultivariate(pl.LightningModule):
         test_size=None,
         step_size=1,
         random_seed=None,
+        engine="trainer",
         **data_module_kwargs,
     ):
         """Predict.
@@ -616,6 +692,7 @@ class BaseMultivariate(pl.LightningModule):
         `dataset`: NeuralForecast's `TimeSeriesDataset`, see [documentation](https://nixtla.github.io/neuralforecast/tsdataset.html).<br>
         `test_size`: int=None, test size for temporal cross-validation.<br>
         `step_size`: int=1, Step size between each window.<br>
+        `engine`: str='trainer', 'torch' predicts with an `InferenceRunner` plain loop instead of PL's `Trainer`.<br>
         `**data_module_kwargs`: PL's TimeSeriesDataModule args, see [documentation](https://pytorch-lightning.readthedocs.io/en/1.6.1/extensions/datamodules.html#using-a-datamodule).
         """
 
@@ -644,8 +721,24 @@ class BaseMultivariate(pl.LightningModule):
 
         self.predict_step_size = step_size
         self.decompose_forecast = False
+        # Windows only use the last input_size + test_size steps of each serie
+        dataset = TimeSeriesDataset.tail_dataset(
+            dataset, size=self.input_size + self.test_size
+        )
+        # Windows only carry y, the model's exogenous variables and the available_mask
+        dataset = TimeSeriesDataset.project_dataset(
+            dataset,
+            temporal_cols=["y"]
+            + self.hist_exog_list
+            + self.futr_exog_list
+            + ["available_mask"],
+        )
+        shard_size = self._shard_size(dataset)
         datamodule = TimeSeriesDataModule(
-            dataset=dataset, batch_size=self.n_series, **data_module_kwargs
+            dataset=dataset,
+            batch_size=self.n_series,
+            shard_size=shard_size,
+            **data_module_kwargs,
         )
 
         # Protect when case of multiple gpu. PL does not support return preds with multiple gpu.
@@ -655,15 +748,30 @@ class BaseMultivariate(pl.LightningModule):
         ):
             pred_trainer_kwargs["devices"] = [0]
 
-        trainer = pl.Trainer(**pred_trainer_kwargs)
-        fcsts = trainer.predict(self, datamodule=datamodule)
-        fcsts = torch.vstack(fcsts).numpy()
+        if engine == "torch":
+            fcsts = InferenceRunner(self).predict(datamodule)
+        else:
+            trainer = pl.Trainer(**pred_trainer_kwargs)
+            fcsts = trainer.predict(self, datamodule=datamodule)
+        if shard_size is None:
+            fcsts = torch.vstack(fcsts).numpy()
+        else:
+            # Shards are predicted in order, every serie keeps the forecasts of its first shard
+            shards = np.concatenate(
+                list(TimeSeriesShardSampler(len(dataset), shard_size=shard_size))
+            )
+            _, first = np.unique(shards, return_index=True)
+            fcsts = torch.cat(fcsts, dim=2)[:, :, first].numpy()
 
         fcsts = np.transpose(fcsts, (2, 0, 1))
         fcsts = fcsts.flatten()
         fcsts = fcsts.reshape(-1, len(self.loss.output_names))
         return fcsts
 
+    def _shard_size(self, dataset):
+        # The model's width is n_series, larger panels are split in shards of n_series series
+        return self.n_series if len(dataset) > self.n_series else None
+
     def decompose(self, dataset, step_size=1, random_seed=None, **data_module_kwargs):
         raise NotImplementedError("decompose")
 
@@ -684,4 +792,22 @@ class BaseMultivariate(pl.LightningModule):
         **Parameters:**<br>
         `path`: str, path to save the model.<br>
         """
-        self.trainer.save_checkpoint(path)
+        _save_checkpoint(self, path)
+
+    def enable_compile(self, mode="default", dynamic=None):
+        """BaseMultivariate.enable_compile
+
+        Opt-in `torch.compile` of the model's `forward` and of the `TemporalNorm` statistics
+        and scalers of its normalization and inverse normalization, for training and inference.
+        The forward is compiled for each model on its first call, the normalization functions are shared.
+
+        **Parameters:**<br>
+        `mode`: str='default', `torch.compile` mode, e.g. 'reduce-overhead' or 'max-autotune'.<br>
+        `dynamic`: bool=None, None compiles static shapes and recompiles once with dynamic shapes
+        when the windows batch size changes (e.g. the last partial batch), True compiles dynamic shapes from the start.<br>
+        """
+        self.compile_kwargs = dict(mode=mode, dynamic=dynamic)
+        self.__dict__.pop("forward", None)
+        self.scaler.compile_kwargs = self.compile_kwargs
+        return self
+
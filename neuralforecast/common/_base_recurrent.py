@@ -15,10 +15,11 @@ from pytorch_lightning.callbacks import TQDMProgressBar
 from pytorch_lightning.callbacks.early_stopping import EarlyStopping
 
 from ._scalers import TemporalNorm
-from ..tsdataset import TimeSeriesDataModule
+from ._inference import InferenceRunner, _QuantizationMixin, _save_checkpoint
+from ..tsdataset import TimeSeriesDataModule, TimeSeriesDataset
 
 # %% ../../nbs/common.base_recurrent.ipynb 7
-class BaseRecurrent(pl.LightningModule):
+class BaseRecurrent(_QuantizationMixin, pl.LightningModule):
     """Base Recurrent
 
     Base class for all recurrent-based models. The forecasts are produced sequentially between
@@ -50,6 +51,8 @@ class BaseRecurrent(pl.LightningModule):
         stat_exog_list=None,
         num_workers_loader=0,
         drop_last_loader=False,
+        packed_sequences=False,
+        carry_state=False,
         random_seed=1,
         alias=None,
         **trainer_kwargs,
@@ -67,6 +70,14 @@ class BaseRecurrent(pl.LightningModule):
         self.inference_input_size = inference_input_size
         self.padder = nn.ConstantPad1d(padding=(0, self.h), value=0)
 
+        # Unroll every serie only from its first available observation
+        self.packed_sequences = packed_sequences
+
+        # Truncated backpropagation through time over consecutive `input_size` chunks,
+        # it takes an optimizer step per chunk (validation still runs every `val_check_steps` batches)
+        self.carry_state = carry_state
+        self.automatic_optimization = not carry_state
+
         # Loss
         self.loss = loss
         if valid_loss is None:
@@ -150,6 +161,16 @@ class BaseRecurrent(pl.LightningModule):
         if trainer_kwargs.get("enable_checkpointing", None) is None:
             trainer_kwargs["enable_checkpointing"] = False
 
+        # Lightning only clips automatically optimized gradients,
+        # with `carry_state` every chunk's gradients are clipped in `_truncated_bptt_step`
+        self.gradient_clip_val = None
+        self.gradient_clip_algorithm = None
+        if self.carry_state:
+            self.gradient_clip_val = trainer_kwargs.pop("gradient_clip_val", None)
+            self.gradient_clip_algorithm = trainer_kwargs.pop(
+                "gradient_clip_algorithm", None
+            )
+
         self.trainer_kwargs = trainer_kwargs
 
         # DataModule arguments
@@ -158,10 +179,27 @@ class BaseRecurrent(pl.LightningModule):
         # used by on_validation_epoch_end hook
         self.validation_step_outputs = []
         self.alias = alias
+        # Post-training quantization of the layers, see `quantize`
+        self.quantization = None
+        # `torch.compile` options of the forward and normalization, see `enable_compile`
+        self.compile_kwargs = None
 
     def __repr__(self):
         return type(self).__name__ if self.alias is None else self.alias
 
+    def __call__(self, *args, **kwargs):
+        # After `enable_compile` the model's own bound forward is compiled on the first
+        # call and shadows the class forward, `nn.Module.__call__` still runs its hooks
+        if self.compile_kwargs is not None and "forward" not in self.__dict__:
+            self.forward = torch.compile(self.forward, **self.compile_kwargs)
+        return super().__call__(*args, **kwargs)
+
+    def __getstate__(self):
+        # The compiled forward can not be pickled, copies compile their own
+        state = super().__getstate__()
+        state.pop("forward", None)
+        return state
+
     def on_fit_start(self):
         torch.manual_seed(self.random_seed)
         np.random.seed(self.random_seed)
@@ -210,6 +248,82 @@ class BaseRecurrent(pl.LightningModule):
 
         return batch
 
+    def _state_normalization(self, batch, x_shift=None, x_scale=None):
+        # `_normalization` with the statistics frozen in a `predict_state` state,
+        # computed on the observed steps when not given (the last h rows are future)
+        temporal = batch["temporal"]  # B, C, T
+        temporal_cols = batch["temporal_cols"]
+        temporal_data_idxs = temporal_cols.get_indexer(
+            self._get_temporal_data_cols(temporal_cols=temporal_cols)
+        )
+        temporal_data = temporal[:, temporal_data_idxs, :]
+        if x_shift is None:
+            temporal_mask = temporal[
+                :, temporal_cols.get_loc("available_mask"), :
+            ].clone()
+            temporal_mask[:, -self.h :] = 0
+            x_shift, x_scale = self.scaler.compute_statistics(
+                x=temporal_data,
+                mask=temporal_mask.unsqueeze(1),
+                dim=self.scaler.dim,
+                eps=self.scaler.eps,
+            )
+
+        # Same shift and scale that TemporalNorm.transform stores for the inverse transform
+        self.scaler.x_shift = x_shift
+        self.scaler.x_scale = x_scale
+        if self.scaler.scaler_type == "revin":
+            self.scaler.x_shift = x_shift + self.scaler.revin_bias
+            self.scaler.x_scale = x_scale * (
+                torch.relu(self.scaler.revin_weight) + self.scaler.eps
+            )
+        temporal[:, temporal_data_idxs, :] = self.scaler.scaler(
+            temporal_data, x_shift, x_scale
+        )
+        batch["temporal"] = temporal
+
+        return batch, x_shift, x_scale
+
+    @staticmethod
+    def _apply_state(fn, *states):
+        # Encoder states are tensors, or nested tuples of tensors, with the series in dim 0
+        if torch.is_tensor(states[0]):
+            return fn(*states)
+        return tuple(BaseRecurrent._apply_state(fn, *state) for state in zip(*states))
+
+    def _padding_steps(self, insample_mask):
+        # Steps before the first available observation of every serie [B],
+        # the last step is always unrolled so that no sequence is empty
+        n_pad = (insample_mask.squeeze(-1).cumsum(dim=1) == 0).sum(dim=1)
+        return n_pad.clamp(max=insample_mask.shape[1] - 1)
+
+    @staticmethod
+    def _roll_steps(x, shifts):
+        # Rolls every serie of x [B, seq_len, C] `shifts` [B] steps to the left
+        seq_len = x.shape[1]
+        idxs = (torch.arange(seq_len, device=x.device) + shifts[:, None]) % seq_len
+        return x.gather(1, idxs.unsqueeze(-1).expand_as(x))
+
+    def _encoder_forward(self, encoder, encoder_input, insample_mask, hx=None):
+        # `nn.RNN`, `nn.LSTM` or `nn.GRU` forward [B, seq_len, C] -> [B, seq_len, hidden_size].
+        # Packed sequences skip the padding steps, the series are moved to the front of the
+        # sequence and the hidden states back to their position (zero on padding steps)
+        if (not self.packed_sequences) or (hx is not None):
+            return encoder(encoder_input, hx)
+        seq_len = encoder_input.shape[1]
+        n_pad = self._padding_steps(insample_mask)
+        packed_input = nn.utils.rnn.pack_padded_sequence(
+            self._roll_steps(encoder_input, n_pad),
+            lengths=(seq_len - n_pad).cpu(),
+            batch_first=True,
+            enforce_sorted=False,
+        )
+        hidden_state, hx = encoder(packed_input)
+        hidden_state, _ = nn.utils.rnn.pad_packed_sequence(
+            hidden_state, batch_first=True, total_length=seq_len
+        )
+        return self._roll_steps(hidden_state, -n_pad), hx
+
     def _inv_normalization(self, y_hat, temporal_cols):
         # Receives window predictions [B, seq_len, H, output]
         # Broadcasts outputs and inverts normalization
@@ -243,9 +357,11 @@ class BaseRecurrent(pl.LightningModule):
                 temporal = temporal[:, :, :cutoff]
             temporal = self.padder(temporal)
 
-            # Truncate batch to shorter time-series
+            # Truncate batch to shorter time-series, packed sequences only
+            # drop the timestamps before the first observation of every serie
+            reduce = torch.max if self.packed_sequences else torch.min
             av_condition = torch.nonzero(
-                torch.min(
+                reduce(
                     temporal[:, temporal_cols.get_loc("available_mask")], axis=0
                 ).values
             )
@@ -260,6 +376,16 @@ class BaseRecurrent(pl.LightningModule):
 
             temporal = temporal[:, :, min_time_stamp:]
 
+            # Chunks carry the encoder state, packed series are moved to the front
+            # so that all of them start on the first chunk
+            if self.carry_state and self.packed_sequences:
+                n_pad = self._padding_steps(
+                    temporal[:, temporal_cols.get_loc("available_mask"), :, None]
+                )
+                temporal = self._roll_steps(temporal.transpose(1, 2), n_pad).transpose(
+                    1, 2
+                )
+
         if step == "val":
             if self.test_size > 0:
                 temporal = temporal[:, :, : -self.test_size]
@@ -281,7 +407,7 @@ class BaseRecurrent(pl.LightningModule):
         # Truncated backprogatation/inference (shorten sequence where RNNs unroll)
         n_windows = windows.shape[2]
         input_size = -1
-        if (step == "train") and (self.input_size > 0):
+        if (step == "train") and (self.input_size > 0) and (not self.carry_state):
             input_size = self.input_size
             if (input_size > 0) and (n_windows > input_size):
                 max_sampleable_time = n_windows - self.input_size + 1
@@ -364,6 +490,22 @@ class BaseRecurrent(pl.LightningModule):
             stat_exog,
         ) = self._parse_windows(batch, windows)
 
+        # Positions before the first observation of a packed serie are padding
+        if self.packed_sequences:
+            outsample_mask = outsample_mask * (insample_mask.cumsum(dim=1) > 0)
+
+        if self.carry_state:
+            return self._truncated_bptt_step(
+                batch,
+                insample_y,
+                insample_mask,
+                outsample_y,
+                outsample_mask,
+                hist_exog,
+                futr_exog,
+                stat_exog,
+            )
+
         windows_batch = dict(
             insample_y=insample_y,  # [B, seq_len, 1]
             insample_mask=insample_mask,  # [B, seq_len, 1]
@@ -374,32 +516,100 @@ class BaseRecurrent(pl.LightningModule):
 
         # Model predictions
         output = self(windows_batch)  # tuple([B, seq_len, H, output])
+        loss = self._train_loss(
+            output, outsample_y, outsample_mask, temporal_cols=batch["temporal_cols"]
+        )
+
+        if torch.isnan(loss):
+            print("Model Parameters", self.hparams)
+            print("insample_y", torch.isnan(insample_y).sum())
+            print("outsample_y", torch.isnan(outsample_y).sum())
+            print("output", torch.isnan(output).sum())
+            raise Exception("Loss is NaN, training stopped.")
+
+        self.log(
+            "train_loss", loss, batch_size=self.batch_size, prog_bar=True, on_epoch=True
+        )
+        self.train_trajectories.append((self.global_step, float(loss)))
+        return loss
+
+    def _train_loss(self, output, outsample_y, outsample_mask, temporal_cols):
         if self.loss.is_distribution_output:
             outsample_y, y_loc, y_scale = self._inv_normalization(
-                y_hat=outsample_y, temporal_cols=batch["temporal_cols"]
+                y_hat=outsample_y, temporal_cols=temporal_cols
             )
             B = output[0].size()[0]
             T = output[0].size()[1]
             H = output[0].size()[2]
-            output = [arg.view(-1, *(arg.size()[2:])) for arg in output]
-            outsample_y = outsample_y.view(B * T, H)
-            outsample_mask = outsample_mask.view(B * T, H)
+            output = [arg.reshape(-1, *(arg.size()[2:])) for arg in output]
+            outsample_y = outsample_y.reshape(B * T, H)
+            outsample_mask = outsample_mask.reshape(B * T, H)
             y_loc = y_loc.repeat_interleave(repeats=T, dim=0).squeeze(-1)
             y_scale = y_scale.repeat_interleave(repeats=T, dim=0).squeeze(-1)
             distr_args = self.loss.scale_decouple(
                 output=output, loc=y_loc, scale=y_scale
             )
-            loss = self.loss(y=outsample_y, distr_args=distr_args, mask=outsample_mask)
-        else:
-            loss = self.loss(y=outsample_y, y_hat=output, mask=outsample_mask)
+            return self.loss(y=outsample_y, distr_args=distr_args, mask=outsample_mask)
+        return self.loss(y=outsample_y, y_hat=output, mask=outsample_mask)
 
-        if torch.isnan(loss):
-            print("Model Parameters", self.hparams)
-            print("insample_y", torch.isnan(insample_y).sum())
-            print("outsample_y", torch.isnan(outsample_y).sum())
-            print("output", torch.isnan(output).sum())
-            raise Exception("Loss is NaN, training stopped.")
+    def _truncated_bptt_step(
+        self,
+        batch,
+        insample_y,
+        insample_mask,
+        outsample_y,
+        outsample_mask,
+        hist_exog,
+        futr_exog,
+        stat_exog,
+    ):
+        # Truncated backpropagation through time, the series are walked in consecutive chunks
+        # of `input_size` steps with an optimizer step per chunk, the encoder state is carried
+        # between chunks and detached so that the graph, and memory, spans a single chunk
+        optimizer = self.optimizers()
+        scheduler = self.lr_schedulers()
+        seq_len = insample_y.shape[1]
+        chunk_size = self.input_size if self.input_size > 0 else seq_len
+        encoder_state = None
+        losses = []
+        for start in range(0, seq_len, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            windows_batch = dict(
+                insample_y=insample_y[:, chunk],  # [B, chunk_size, 1]
+                insample_mask=insample_mask[:, chunk],  # [B, chunk_size, 1]
+                futr_exog=futr_exog[:, :, chunk] if futr_exog is not None else None,
+                hist_exog=hist_exog[:, :, chunk] if hist_exog is not None else None,
+                stat_exog=stat_exog,
+                encoder_state=encoder_state,
+            )
+            output = self(windows_batch)
+            loss = self._train_loss(
+                output,
+                outsample_y[:, chunk],
+                outsample_mask[:, chunk],
+                temporal_cols=batch["temporal_cols"],
+            )
+            if torch.isnan(loss):
+                raise Exception("Loss is NaN, training stopped.")
+
+            optimizer.zero_grad()
+            self.manual_backward(loss)
+            if self.gradient_clip_val is not None:
+                self.clip_gradients(
+                    optimizer,
+                    gradient_clip_val=self.gradient_clip_val,
+                    gradient_clip_algorithm=self.gradient_clip_algorithm,
+                )
+            optimizer.step()
+            scheduler.step()
+            encoder_state = self._apply_state(
+                torch.detach, windows_batch["encoder_state"]
+            )
+            losses.append(loss.detach())
+            if self.trainer.global_step >= self.max_steps:
+                break
 
+        loss = torch.stack(losses).mean()
         self.log(
             "train_loss", loss, batch_size=self.batch_size, prog_bar=True, on_epoch=True
         )
@@ -527,19 +737,34 @@ class BaseRecurrent(pl.LightningModule):
             stat_exog,
         ) = self._parse_windows(batch, windows)
 
+        # `predict` only returns the last position, or the windows of the test set,
+        # the model decodes and the loss samples just these positions
+        n_decode = 1 if self.test_size == 0 else 1 + self.test_size - self.h
         windows_batch = dict(
             insample_y=insample_y,  # [B, seq_len, 1]
             insample_mask=insample_mask,  # [B, seq_len, 1]
             futr_exog=futr_exog,  # [B, F, seq_len, 1+H]
             hist_exog=hist_exog,  # [B, C, seq_len]
-            stat_exog=stat_exog,
-        )  # [B, S]
+            stat_exog=stat_exog,  # [B, S]
+            n_decode=n_decode,
+        )
 
         # Model Predictions
-        output = self(windows_batch)  # tuple([B, seq_len, H], ...)
+        output = self(windows_batch)  # tuple([B, n_decode, H], ...)
+        output = self._decoded_positions(output, n_decode=n_decode)
+        return self._denormalize_output(output, temporal_cols=batch["temporal_cols"])
+
+    def _decoded_positions(self, output, n_decode):
+        # Last `n_decode` positions of the output, for models that decode all of them
+        if self.loss.is_distribution_output:
+            return [arg[:, -n_decode:] for arg in output]
+        return output[:, -n_decode:]
+
+    def _denormalize_output(self, output, temporal_cols):
+        # Point forecasts [B, seq_len, H] or samples and quantiles [B, seq_len, H, output]
         if self.loss.is_distribution_output:
             _, y_loc, y_scale = self._inv_normalization(
-                y_hat=output[0], temporal_cols=batch["temporal_cols"]
+                y_hat=output[0], temporal_cols=temporal_cols
             )
             B = output[0].size()[0]
             T = output[0].size()[1]
@@ -560,7 +785,7 @@ class BaseRecurrent(pl.LightningModule):
                 y_hat = torch.concat((y_hat, distr_args), axis=3)
         else:
             y_hat, _, _ = self._inv_normalization(
-                y_hat=output, temporal_cols=batch["temporal_cols"]
+                y_hat=output, temporal_cols=temporal_cols
             )
         return y_hat
 
@@ -587,6 +812,9 @@ class BaseRecurrent(pl.LightningModule):
         `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
         """
 
+        if self.quantization is not None:
+            raise Exception("Quantized models can not be fitted.")
+
         # Check exogenous variables are contained in dataset
         temporal_cols = set(dataset.temporal_cols.tolist())
         static_cols = set(
@@ -612,6 +840,14 @@ class BaseRecurrent(pl.LightningModule):
 
         self.val_size = val_size
         self.test_size = test_size
+        # Windows only carry y, the model's exogenous variables and the available_mask
+        dataset = TimeSeriesDataset.project_dataset(
+            dataset,
+            temporal_cols=["y"]
+            + self.hist_exog_list
+            + self.futr_exog_list
+            + ["available_mask"],
+        )
         datamodule = TimeSeriesDataModule(
             dataset=dataset,
             batch_size=self.batch_size,
@@ -632,7 +868,14 @@ class BaseRecurrent(pl.LightningModule):
         trainer = pl.Trainer(**self.trainer_kwargs)
         trainer.fit(self, datamodule=datamodule)
 
-    def predict(self, dataset, step_size=1, random_seed=None, **data_module_kwargs):
+    def predict(
+        self,
+        dataset,
+        step_size=1,
+        random_seed=None,
+        engine="trainer",
+        **data_module_kwargs,
+    ):
         """Predict.
 
         Neural network prediction with PL's `Trainer` execution of `predict_step`.
@@ -641,6 +884,7 @@ class BaseRecurrent(pl.LightningModule):
         `dataset`: NeuralForecast's `TimeSeriesDataset`, see [documentation](https://nixtla.github.io/neuralforecast/tsdataset.html).<br>
         `step_size`: int=1, Step size between each window.<br>
         `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
+        `engine`: str='trainer', 'torch' predicts with an `InferenceRunner` plain loop instead of PL's `Trainer`.<br>
         `**data_module_kwargs`: PL's TimeSeriesDataModule args, see [documentation](https://pytorch-lightning.readthedocs.io/en/1.6.1/extensions/datamodules.html#using-a-datamodule).
         """
 
@@ -678,15 +922,25 @@ class BaseRecurrent(pl.LightningModule):
         ):
             pred_trainer_kwargs["devices"] = [0]
 
-        trainer = pl.Trainer(**pred_trainer_kwargs)
-
+        # Windows only carry y, the model's exogenous variables and the available_mask
+        dataset = TimeSeriesDataset.project_dataset(
+            dataset,
+            temporal_cols=["y"]
+            + self.hist_exog_list
+            + self.futr_exog_list
+            + ["available_mask"],
+        )
         datamodule = TimeSeriesDataModule(
             dataset=dataset,
             valid_batch_size=self.valid_batch_size,
             num_workers=self.num_workers_loader,
             **data_module_kwargs,
         )
-        fcsts = trainer.predict(self, datamodule=datamodule)
+        if engine == "torch":
+            fcsts = InferenceRunner(self).predict(datamodule)
+        else:
+            trainer = pl.Trainer(**pred_trainer_kwargs)
+            fcsts = trainer.predict(self, datamodule=datamodule)
         if self.test_size > 0:
             # Remove warmup windows (from train and validation)
             # [N,T,H,output], avoid indexing last dim for univariate output compatibility
@@ -700,6 +954,148 @@ class BaseRecurrent(pl.LightningModule):
             fcsts = fcsts.reshape(-1, len(self.loss.output_names))
         return fcsts
 
+    def predict_state(self, dataset, state=None, random_seed=None):
+        """Predict State.
+
+        Stateful inference to serve forecasts as new observations arrive. Instead of unrolling
+        the encoder over the whole history of every serie, as `predict` does, it advances the
+        encoder `state` only over the new observations of `dataset`, so that refreshing the
+        forecasts costs O(new steps) per serie.
+
+        The state keeps, for every serie, the encoder state after its last observation
+        (the hidden states of RNN, LSTM, GRU and DilatedRNN, the receptive field buffers of TCN)
+        and the scaler statistics of the observations it was initialized with. The forecasts
+        match `predict` on the whole history when the new observations do not change these
+        statistics (e.g. `scaler_type='identity'`) and `inference_input_size=-1`.
+
+        **Parameters:**<br>
+        `dataset`: NeuralForecast's `TimeSeriesDataset`, for every serie its new observations followed by `h` future rows, as `NeuralForecast.predict` builds it.
+        The series are in the same order as in the dataset that initialized `state`, and all of them have the same number of new observations.<br>
+        `state`: dict=None, state returned by a previous call. If None, the encoder starts from the first observation of every serie.<br>
+        `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
+
+        **Returns:**<br>
+        `fcsts`: np.ndarray, forecasts of the `h` future rows of every serie, [n_series * h, len(loss.output_names)].<br>
+        `state`: dict, state after the last observation of every serie.<br>
+        """
+
+        # Check exogenous variables are contained in dataset
+        temporal_cols = set(dataset.temporal_cols.tolist())
+        static_cols = set(
+            dataset.static_cols.tolist() if dataset.static_cols is not None else []
+        )
+        if len(set(self.hist_exog_list) - temporal_cols) > 0:
+            raise Exception(
+                f"{set(self.hist_exog_list) - temporal_cols} historical exogenous variables not found in input dataset"
+            )
+        if len(set(self.futr_exog_list) - temporal_cols) > 0:
+            raise Exception(
+                f"{set(self.futr_exog_list) - temporal_cols} future exogenous variables not found in input dataset"
+            )
+        if len(set(self.stat_exog_list) - static_cols) > 0:
+            raise Exception(
+                f"{set(self.stat_exog_list) - static_cols} static exogenous variables not found in input dataset"
+            )
+
+        sizes = np.diff(dataset.indptr)
+        if sizes.min() <= self.h:
+            raise ValueError(
+                f"Every serie needs at least one observation before its {self.h} future rows."
+            )
+        if state is not None:
+            if len(dataset) != len(state["x_shift"]):
+                raise ValueError(
+                    f"The state has {len(state['x_shift'])} series, the dataset {len(dataset)}."
+                )
+            if np.any(sizes != sizes[0]):
+                raise ValueError(
+                    "All series must have the same number of new observations."
+                )
+
+        # Restart random seed
+        if random_seed is None:
+            random_seed = self.random_seed
+        torch.manual_seed(random_seed)
+
+        dataset = TimeSeriesDataset.project_dataset(
+            dataset,
+            temporal_cols=["y"]
+            + self.hist_exog_list
+            + self.futr_exog_list
+            + ["available_mask"],
+        )
+        self.eval()
+        fcsts, x_shifts, x_scales, encoder_states = [], [], [], []
+        with torch.no_grad():
+            for start in range(0, len(dataset), self.valid_batch_size):
+                end = min(start + self.valid_batch_size, len(dataset))
+                batch = dataset.__getitems__(np.arange(start, end))
+                batch = {
+                    k: v.to(self.device) if torch.is_tensor(v) else v
+                    for k, v in batch.items()
+                }
+                if state is None:
+                    batch, x_shift, x_scale = self._state_normalization(batch)
+                    encoder_state = None
+                else:
+                    batch, x_shift, x_scale = self._state_normalization(
+                        batch,
+                        x_shift=state["x_shift"][start:end],
+                        x_scale=state["x_scale"][start:end],
+                    )
+                    encoder_state = self._apply_state(
+                        lambda s: s[start:end], state["encoder_state"]
+                    )
+
+                # A window for each new observation [B, C, seq_len, 1+H],
+                # the last one forecasts the future rows
+                windows = dict(
+                    temporal=batch["temporal"].unfold(
+                        dimension=-1, size=1 + self.h, step=1
+                    ),
+                    temporal_cols=batch["temporal_cols"],
+                    static=batch.get("static", None),
+                    static_cols=batch.get("static_cols", None),
+                )
+                (
+                    insample_y,
+                    insample_mask,
+                    _,
+                    _,
+                    hist_exog,
+                    futr_exog,
+                    stat_exog,
+                ) = self._parse_windows(batch, windows)
+
+                # The models continue from `encoder_state` and write back the advanced state
+                windows_batch = dict(
+                    insample_y=insample_y,  # [B, seq_len, 1]
+                    insample_mask=insample_mask,  # [B, seq_len, 1]
+                    futr_exog=futr_exog,  # [B, F, seq_len, 1+H]
+                    hist_exog=hist_exog,  # [B, C, seq_len]
+                    stat_exog=stat_exog,  # [B, S]
+                    encoder_state=encoder_state,
+                    n_decode=1,
+                )
+                output = self._decoded_positions(self(windows_batch), n_decode=1)
+                fcsts.append(
+                    self._denormalize_output(
+                        output, temporal_cols=batch["temporal_cols"]
+                    )
+                )
+                x_shifts.append(x_shift)
+                x_scales.append(x_scale)
+                encoder_states.append(windows_batch["encoder_state"])
+
+        fcsts = torch.vstack(fcsts).cpu().numpy().flatten()
+        fcsts = fcsts.reshape(-1, len(self.loss.output_names))
+        state = dict(
+            encoder_state=self._apply_state(lambda *s: torch.cat(s), *encoder_states),
+            x_shift=torch.cat(x_shifts),
+            x_scale=torch.cat(x_scales),
+        )
+        return fcsts, state
+
     def set_test_size(self, test_size):
         self.test_size = test_size
 
@@ -714,4 +1110,22 @@ class BaseRecurrent(pl.LightningModule):
         **Parameters:**<br>
         `path`: str, path to save the model.<br>
         """
-        self.trainer.save_checkpoint(path)
+        _save_checkpoint(self, path)
+
+    def enable_compile(self, mode="default", dynamic=None):
+        """BaseRecurrent.enable_compile
+
+        Opt-in `torch.compile` of the model's `forward` and of the `TemporalNorm` statistics
+        and scalers of its normalization and inverse normalization, for training and inference.
+        The forward is compiled for each model on its first call, the normalization functions are shared.
+
+        **Parameters:**<br>
+        `mode`: str='default', `torch.compile` mode, e.g. 'reduce-overhead' or 'max-autotune'.<br>
+        `dynamic`: bool=None, None compiles static shapes and recompiles once with dynamic shapes
+        when the windows batch size changes (e.g. the last partial batch), True compiles dynamic shapes from the start.<br>
+        """
+        self.compile_kwargs = dict(mode=mode, dynamic=dynamic)
+        self.__dict__.pop("forward", None)
+        self.scaler.compile_kwargs = self.compile_kwargs
+        return self
+
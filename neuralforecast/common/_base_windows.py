@@ -15,10 +15,11 @@ from pytorch_lightning.callbacks import TQDMProgressBar
 from pytorch_lightning.callbacks.early_stopping import EarlyStopping
 
 from ._scalers import TemporalNorm
-from ..tsdataset import TimeSeriesDataModule
+from ._inference import InferenceRunner, _QuantizationMixin, _save_checkpoint
+from ..tsdataset import TimeSeriesDataModule, TimeSeriesDataset
 
 # %% ../../nbs/common.base_windows.ipynb 6
-class BaseWindows(pl.LightningModule):
+class BaseWindows(_QuantizationMixin, pl.LightningModule):
     """Base Windows
 
     Base class for all windows-based models. The forecasts are produced separately
@@ -28,6 +29,9 @@ class BaseWindows(pl.LightningModule):
     - PyTorch Lightning's methods training_step, validation_step, predict_step.<br>
     - fit and predict methods used by NeuralForecast.core class.<br>
     - sampling and wrangling methods to generate windows.
+
+    With `ragged_sampling=True` the train windows are sampled directly from
+    unpadded CSR batches of the series instead of padded batches.
     """
 
     def __init__(
@@ -54,6 +58,7 @@ class BaseWindows(pl.LightningModule):
         exclude_insample_y=False,
         num_workers_loader=0,
         drop_last_loader=False,
+        ragged_sampling=False,
         random_seed=1,
         alias=None,
         **trainer_kwargs,
@@ -165,13 +170,31 @@ class BaseWindows(pl.LightningModule):
         # DataModule arguments
         self.num_workers_loader = num_workers_loader
         self.drop_last_loader = drop_last_loader
+        self.ragged_sampling = ragged_sampling
         # used by on_validation_epoch_end hook
         self.validation_step_outputs = []
         self.alias = alias
+        # Post-training quantization of the layers, see `quantize`
+        self.quantization = None
+        # `torch.compile` options of the forward and normalization, see `enable_compile`
+        self.compile_kwargs = None
 
     def __repr__(self):
         return type(self).__name__ if self.alias is None else self.alias
 
+    def __call__(self, *args, **kwargs):
+        # After `enable_compile` the model's own bound forward is compiled on the first
+        # call and shadows the class forward, `nn.Module.__call__` still runs its hooks
+        if self.compile_kwargs is not None and "forward" not in self.__dict__:
+            self.forward = torch.compile(self.forward, **self.compile_kwargs)
+        return super().__call__(*args, **kwargs)
+
+    def __getstate__(self):
+        # The compiled forward can not be pickled, copies compile their own
+        state = super().__getstate__()
+        state.pop("forward", None)
+        return state
+
     def on_fit_start(self):
         torch.manual_seed(self.random_seed)
         np.random.seed(self.random_seed)
@@ -195,6 +218,9 @@ class BaseWindows(pl.LightningModule):
         temporal = batch["temporal"]
 
         if step == "train":
+            if "indptr" in batch:
+                return self._create_ragged_windows(batch)
+
             if self.val_size + self.test_size > 0:
                 cutoff = -self.val_size - self.test_size
                 temporal = temporal[:, :, :cutoff]
@@ -209,48 +235,69 @@ class BaseWindows(pl.LightningModule):
             )
 
             # [B, C, Ws, L+H] 0, 1, 2, 3
-            # -> [B * Ws, L+H, C] 0, 2, 3, 1
+            # -> [B, Ws, L+H, C] 0, 2, 3, 1 strided view, only sampled windows are copied
             windows_per_serie = windows.shape[2]
-            windows = windows.permute(0, 2, 3, 1).contiguous()
-            windows = windows.reshape(-1, window_size, len(temporal_cols))
-
-            # Sample and Available conditions
-            available_idx = temporal_cols.get_loc("available_mask")
-            available_condition = windows[:, : self.input_size, available_idx]
-            available_condition = torch.sum(available_condition, axis=1)
+            windows = windows.permute(0, 2, 3, 1)
+
+            # Sample and Available conditions from the cumulative available_mask,
+            # the loaders provide it precomputed by the dataset [B, max_size + 1]
+            available = batch.get("available_cumsum", None)
+            if available is None:
+                available_idx = temporal_cols.get_loc("available_mask")
+                available = torch.cumsum(
+                    batch["temporal"][:, available_idx] > 0, dim=-1
+                )
+                available = nn.functional.pad(available, (1, 0))
+            if self.val_size + self.test_size > 0:
+                available = available[:, :cutoff]
+            pad_left, pad_right = self.padder_train.padding
+            available = torch.cat(
+                [
+                    available.new_zeros(len(available), pad_left),
+                    available,
+                    available[:, -1:].expand(-1, pad_right),
+                ],
+                dim=-1,
+            )
+            starts = (
+                torch.arange(windows_per_serie, device=temporal.device) * self.step_size
+            )
+            available_condition = (
+                available[:, starts + self.input_size] - available[:, starts]
+            )
             final_condition = available_condition > 0
             if self.h > 0:
-                sample_condition = windows[:, self.input_size :, available_idx]
-                sample_condition = torch.sum(sample_condition, axis=1)
-                final_condition = (sample_condition > 0) & (available_condition > 0)
-            windows = windows[final_condition]
-
-            # Parse Static data to match windows
-            # [B, S_in] -> [B, Ws, S_in] -> [B*Ws, S_in]
-            static = batch.get("static", None)
-            static_cols = batch.get("static_cols", None)
-            if static is not None:
-                static = torch.repeat_interleave(
-                    static, repeats=windows_per_serie, dim=0
+                sample_condition = (
+                    available[:, starts + window_size]
+                    - available[:, starts + self.input_size]
                 )
-                static = static[final_condition]
+                final_condition = (sample_condition > 0) & (available_condition > 0)
+            # Valid windows in [B * Ws] order
+            serie_idxs, window_idxs = torch.nonzero(final_condition, as_tuple=True)
 
             # Protection of empty windows
-            if final_condition.sum() == 0:
+            if len(serie_idxs) == 0:
                 raise Exception("No windows available for training")
 
             # Sample windows
-            n_windows = len(windows)
+            n_windows = len(serie_idxs)
             if self.windows_batch_size is not None:
                 w_idxs = np.random.choice(
                     n_windows,
                     size=self.windows_batch_size,
                     replace=(n_windows < self.windows_batch_size),
                 )
-                windows = windows[w_idxs]
+                w_idxs = torch.as_tensor(w_idxs, device=temporal.device)
+                serie_idxs = serie_idxs[w_idxs]
+                window_idxs = window_idxs[w_idxs]
+            windows = windows[serie_idxs, window_idxs]
 
-                if static is not None:
-                    static = static[w_idxs]
+            # Parse Static data to match windows
+            # [B, S_in] -> [Ws, S_in]
+            static = batch.get("static", None)
+            static_cols = batch.get("static_cols", None)
+            if static is not None:
+                static = static[serie_idxs]
 
             # think about interaction available * sample mask
             # [B, C, Ws, L+H]
@@ -263,73 +310,206 @@ class BaseWindows(pl.LightningModule):
             return windows_batch
 
         elif step in ["predict", "val"]:
-            if step == "predict":
-                initial_input = temporal.shape[-1] - self.test_size
-                if (
-                    initial_input <= self.input_size
-                ):  # There is not enough data to predict first timestamp
-                    padder_left = nn.ConstantPad1d(
-                        padding=(self.input_size - initial_input, 0), value=0
-                    )
-                    temporal = padder_left(temporal)
-                predict_step_size = self.predict_step_size
-                cutoff = -self.input_size - self.test_size
-                temporal = temporal[:, :, cutoff:]
-
-            elif step == "val":
-                predict_step_size = self.step_size
-                cutoff = -self.input_size - self.val_size - self.test_size
-                if self.test_size > 0:
-                    temporal = batch["temporal"][:, :, cutoff : -self.test_size]
-                else:
-                    temporal = batch["temporal"][:, :, cutoff:]
-                if temporal.shape[-1] < window_size:
-                    initial_input = temporal.shape[-1] - self.val_size
-                    padder_left = nn.ConstantPad1d(
-                        padding=(self.input_size - initial_input, 0), value=0
-                    )
-                    temporal = padder_left(temporal)
+            windows_view = self._create_windows_view(batch, step=step)
+            return self._gather_windows(windows_view, w_idxs=w_idxs)
+        else:
+            raise ValueError(f"Unknown step {step}")
+
+    def _create_windows_view(self, batch, step):
+        # Strided predict/val windows [B, Ws, L+H, C] over the batch, no data is copied.
+        # Inference batches are then copied from it with `_gather_windows`.
+        window_size = self.input_size + self.h
+        temporal = batch["temporal"]
 
+        if step == "predict":
+            initial_input = temporal.shape[-1] - self.test_size
             if (
-                (step == "predict")
-                and (self.test_size == 0)
-                and (len(self.futr_exog_list) == 0)
-            ):
-                padder_right = nn.ConstantPad1d(padding=(0, self.h), value=0)
-                temporal = padder_right(temporal)
+                initial_input <= self.input_size
+            ):  # There is not enough data to predict first timestamp
+                padder_left = nn.ConstantPad1d(
+                    padding=(self.input_size - initial_input, 0), value=0
+                )
+                temporal = padder_left(temporal)
+            predict_step_size = self.predict_step_size
+            cutoff = -self.input_size - self.test_size
+            temporal = temporal[:, :, cutoff:]
+
+        elif step == "val":
+            predict_step_size = self.step_size
+            cutoff = -self.input_size - self.val_size - self.test_size
+            if self.test_size > 0:
+                temporal = batch["temporal"][:, :, cutoff : -self.test_size]
+            else:
+                temporal = batch["temporal"][:, :, cutoff:]
+            if temporal.shape[-1] < window_size:
+                initial_input = temporal.shape[-1] - self.val_size
+                padder_left = nn.ConstantPad1d(
+                    padding=(self.input_size - initial_input, 0), value=0
+                )
+                temporal = padder_left(temporal)
+        else:
+            raise ValueError(f"Unknown step {step}")
 
-            windows = temporal.unfold(
-                dimension=-1, size=window_size, step=predict_step_size
+        if (
+            (step == "predict")
+            and (self.test_size == 0)
+            and (len(self.futr_exog_list) == 0)
+        ):
+            padder_right = nn.ConstantPad1d(padding=(0, self.h), value=0)
+            temporal = padder_right(temporal)
+
+        windows = temporal.unfold(
+            dimension=-1, size=window_size, step=predict_step_size
+        )
+
+        # [batch, channels, windows, window_size] 0, 1, 2, 3
+        # -> [batch, windows, window_size, channels] 0, 2, 3, 1
+        windows = windows.permute(0, 2, 3, 1)
+
+        windows_view = dict(
+            temporal=windows,
+            temporal_cols=batch["temporal_cols"],
+            static=batch.get("static", None),
+            static_cols=batch.get("static_cols", None),
+        )
+        return windows_view
+
+    def _gather_windows(self, windows_view, w_idxs=None):
+        # Copies the windows `w_idxs` (flat serie-major indices, all windows if None)
+        # of a `_create_windows_view` view into a [Ws, L+H, C] windows batch
+        windows = windows_view["temporal"]
+        static = windows_view["static"]
+        windows_per_serie = windows.shape[1]
+
+        if w_idxs is None:
+            # All the windows, gathered by index so that the batch never aliases the
+            # view, the normalization of the windows is in place
+            w_idxs = torch.arange(
+                windows.shape[0] * windows_per_serie, device=windows.device
             )
+        w_idxs = torch.as_tensor(w_idxs, device=windows.device)
+        serie_idxs = torch.div(w_idxs, windows_per_serie, rounding_mode="floor")
+        windows = windows[serie_idxs, w_idxs % windows_per_serie]
+        if static is not None:
+            static = static[serie_idxs]
 
-            # [batch, channels, windows, window_size] 0, 1, 2, 3
-            # -> [batch * windows, window_size, channels] 0, 2, 3, 1
-            windows_per_serie = windows.shape[2]
-            windows = windows.permute(0, 2, 3, 1).contiguous()
-            windows = windows.reshape(-1, window_size, len(temporal_cols))
+        windows_batch = dict(
+            temporal=windows,
+            temporal_cols=windows_view["temporal_cols"],
+            static=static,
+            static_cols=windows_view["static_cols"],
+        )
+        return windows_batch
 
-            static = batch.get("static", None)
-            static_cols = batch.get("static_cols", None)
-            if static is not None:
-                static = torch.repeat_interleave(
-                    static, repeats=windows_per_serie, dim=0
-                )
+    def _create_ragged_windows(self, batch):
+        # Samples train windows directly from a CSR batch, `temporal` [sum(n_i), C] and `indptr` [B+1].
+        # Valid (serie, start) pairs are enumerated in the same order as the padded
+        # windows of `_create_windows`, but only the sampled L+H steps are gathered.
+        window_size = self.input_size + self.h
+        temporal_cols = batch["temporal_cols"]
+        temporal = batch["temporal"]
+        indptr = batch["indptr"]
+        device = temporal.device
+
+        # Series lengths without the validation and test sets
+        cutoff = self.val_size + self.test_size
+        max_size = int(batch["max_size"]) - cutoff
+        sizes = torch.clamp(indptr[1:] - indptr[:-1] - cutoff, min=0)
+        pad_left, pad_right = self.padder_train.padding
+        padded_size = pad_left + max_size + pad_right
+        if padded_size < window_size:
+            raise Exception(
+                "Time series is too short for training, consider setting a smaller input size or set start_padding_enabled=True"
+            )
+        # Position of each serie's first observation within the padded series
+        offsets = pad_left + max_size - sizes
+
+        # Candidate window starts on the unfold grid that overlap the serie
+        last_start = padded_size - window_size
+        first = torch.clamp(offsets - self.input_size + 1, min=0)
+        first = -(-first // self.step_size) * self.step_size
+        last = offsets + sizes - 1
+        if self.h > 0:
+            last = last - self.input_size
+        last = torch.clamp(last, max=last_start)
+        counts = torch.clamp((last - first) // self.step_size + 1, min=0)
+        serie_idx = torch.repeat_interleave(
+            torch.arange(len(counts), device=device), counts
+        )
+        rank = torch.arange(len(serie_idx), device=device) - torch.repeat_interleave(
+            counts.cumsum(0) - counts, counts
+        )
+        starts = first[serie_idx] + rank * self.step_size - offsets[serie_idx]
 
-            # Sample windows for batched prediction
-            if w_idxs is not None:
-                windows = windows[w_idxs]
-                if static is not None:
-                    static = static[w_idxs]
+        # Sample and Available conditions from the cumulative available_mask,
+        # the ragged loaders provide it precomputed by the dataset [sum(n_i) + 1]
+        available = batch.get("available_cumsum", None)
+        if available is None:
+            available_idx = temporal_cols.get_loc("available_mask")
+            available = torch.cumsum(temporal[:, available_idx] > 0, dim=0)
+            available = torch.cat([available.new_zeros(1), available])
 
-            windows_batch = dict(
-                temporal=windows,
-                temporal_cols=temporal_cols,
-                static=static,
-                static_cols=static_cols,
+        def _available(start, end):
+            serie_start, serie_size = indptr[serie_idx], sizes[serie_idx]
+            end = serie_start + torch.minimum(torch.clamp(end, min=0), serie_size)
+            start = serie_start + torch.minimum(torch.clamp(start, min=0), serie_size)
+            return available[end] - available[start]
+
+        final_condition = _available(starts, starts + self.input_size) > 0
+        if self.h > 0:
+            final_condition &= (
+                _available(starts + self.input_size, starts + window_size) > 0
             )
-            return windows_batch
-        else:
-            raise ValueError(f"Unknown step {step}")
+        serie_idx = serie_idx[final_condition]
+        starts = starts[final_condition]
+
+        # Protection of empty windows
+        if len(serie_idx) == 0:
+            raise Exception("No windows available for training")
+
+        # Sample windows, with the generator of device-resident batches when available
+        n_windows = len(serie_idx)
+        generator = batch.get("generator", None)
+        if self.windows_batch_size is not None:
+            if generator is not None and n_windows < self.windows_batch_size:
+                w_idxs = torch.randint(
+                    n_windows,
+                    size=(self.windows_batch_size,),
+                    generator=generator,
+                    device=device,
+                )
+            elif generator is not None:
+                w_idxs = torch.randperm(n_windows, generator=generator, device=device)[
+                    : self.windows_batch_size
+                ]
+            else:
+                w_idxs = np.random.choice(
+                    n_windows,
+                    size=self.windows_batch_size,
+                    replace=(n_windows < self.windows_batch_size),
+                )
+                w_idxs = torch.as_tensor(w_idxs, device=device)
+            serie_idx = serie_idx[w_idxs]
+            starts = starts[w_idxs]
+
+        # Gather [Ws, L+H, C] windows, steps outside the serie are zero padded
+        steps = starts[:, None] + torch.arange(window_size, device=device)
+        observed = (steps >= 0) & (steps < sizes[serie_idx][:, None])
+        rows = indptr[serie_idx][:, None] + steps
+        windows = temporal.new_zeros((len(serie_idx), window_size, len(temporal_cols)))
+        windows[observed] = temporal[rows[observed]]
+
+        static = batch.get("static", None)
+        if static is not None:
+            static = static[serie_idx]
+
+        windows_batch = dict(
+            temporal=windows,
+            temporal_cols=temporal_cols,
+            static=static,
+            static_cols=batch.get("static_cols", None),
+        )
+        return windows_batch
 
     def _get_temporal_data_cols(self, temporal_cols):
         temporal_data_cols = ["y"] + list(
@@ -441,9 +621,8 @@ class BaseWindows(pl.LightningModule):
             stat_exog,
         )
 
-    def training_step(self, batch, batch_idx):
-        # Create and normalize windows [Ws, L+H, C]
-        windows = self._create_windows(batch, step="train")
+    def _train_loss(self, batch, windows):
+        # Normalizes the sampled train windows [Ws, L+H, C] in place and returns the loss
         y_idx = batch["temporal_cols"].get_loc("y")
         original_outsample_y = torch.clone(windows["temporal"][:, -self.h :, y_idx])
         windows = self._normalization(windows=windows)
@@ -487,6 +666,12 @@ class BaseWindows(pl.LightningModule):
             print("outsample_y", torch.isnan(outsample_y).sum())
             print("output", torch.isnan(output).sum())
             raise Exception("Loss is NaN, training stopped.")
+        return loss
+
+    def training_step(self, batch, batch_idx):
+        # Create and normalize windows [Ws, L+H, C]
+        windows = self._create_windows(batch, step="train")
+        loss = self._train_loss(batch, windows)
 
         self.log("train_loss", loss, prog_bar=True, on_epoch=True)
         self.train_trajectories.append((self.global_step, float(loss)))
@@ -526,13 +711,10 @@ class BaseWindows(pl.LightningModule):
             )
         return valid_loss
 
-    def validation_step(self, batch, batch_idx):
-        if self.val_size == 0:
-            return np.nan
-
-        # TODO: Hack to compute number of windows
-        windows = self._create_windows(batch, step="val")
-        n_windows = len(windows["temporal"])
+    def _valid_loss(self, batch):
+        # Windows view built once, every inference batch gathers from it
+        windows_view = self._create_windows_view(batch, step="val")
+        n_windows = windows_view["temporal"].shape[:2].numel()
 
         # Number of windows in batch
         windows_batch_size = self.inference_windows_batch_size
@@ -547,7 +729,7 @@ class BaseWindows(pl.LightningModule):
             w_idxs = np.arange(
                 i * windows_batch_size, min((i + 1) * windows_batch_size, n_windows)
             )
-            windows = self._create_windows(batch, step="val", w_idxs=w_idxs)
+            windows = self._gather_windows(windows_view, w_idxs=w_idxs)
             y_idx = batch["temporal_cols"].get_loc("y")
             original_outsample_y = torch.clone(windows["temporal"][:, -self.h :, y_idx])
             windows = self._normalization(windows=windows)
@@ -587,6 +769,13 @@ class BaseWindows(pl.LightningModule):
 
         if torch.isnan(valid_loss):
             raise Exception("Loss is NaN, training stopped.")
+        return valid_loss
+
+    def validation_step(self, batch, batch_idx):
+        if self.val_size == 0:
+            return np.nan
+
+        valid_loss = self._valid_loss(batch)
 
         self.log("valid_loss", valid_loss, prog_bar=True, on_epoch=True)
         self.validation_step_outputs.append(valid_loss)
@@ -601,9 +790,13 @@ class BaseWindows(pl.LightningModule):
         self.validation_step_outputs.clear()  # free memory (compute `avg_loss` per epoch)
 
     def predict_step(self, batch, batch_idx):
-        # TODO: Hack to compute number of windows
-        windows = self._create_windows(batch, step="predict")
-        n_windows = len(windows["temporal"])
+        # Windows view built once, every inference batch gathers from it
+        windows_view = self._create_windows_view(batch, step="predict")
+        return self._predict_windows_view(batch, windows_view)
+
+    def _predict_windows_view(self, batch, windows_view):
+        # Forecasts of all the windows of a `_create_windows_view` view
+        n_windows = windows_view["temporal"].shape[:2].numel()
 
         # Number of windows in batch
         windows_batch_size = self.inference_windows_batch_size
@@ -617,7 +810,7 @@ class BaseWindows(pl.LightningModule):
             w_idxs = np.arange(
                 i * windows_batch_size, min((i + 1) * windows_batch_size, n_windows)
             )
-            windows = self._create_windows(batch, step="predict", w_idxs=w_idxs)
+            windows = self._gather_windows(windows_view, w_idxs=w_idxs)
             windows = self._normalization(windows=windows)
 
             # Parse windows
@@ -665,7 +858,9 @@ class BaseWindows(pl.LightningModule):
         y_hat = torch.cat(y_hats, dim=0)
         return y_hat
 
-    def fit(self, dataset, val_size=0, test_size=0, random_seed=None):
+    def fit(
+        self, dataset, val_size=0, test_size=0, random_seed=None, device_resident=False
+    ):
         """Fit.
 
         The `fit` method, optimizes the neural network's weights using the
@@ -686,8 +881,13 @@ class BaseWindows(pl.LightningModule):
         `val_size`: int, validation size for temporal cross-validation.<br>
         `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
         `test_size`: int, test size for temporal cross-validation.<br>
+        `device_resident`: bool=False, keep the training data on the training device and form the batches there,
+        instead of collating them with a `DataLoader`. Series and windows are then sampled with a generator on the device.<br>
         """
 
+        if self.quantization is not None:
+            raise Exception("Quantized models can not be fitted.")
+
         # Check exogenous variables are contained in dataset
         temporal_cols = set(dataset.temporal_cols.tolist())
         static_cols = set(
@@ -713,12 +913,22 @@ class BaseWindows(pl.LightningModule):
 
         self.val_size = val_size
         self.test_size = test_size
+        # Windows only carry y, the model's exogenous variables and the available_mask
+        dataset = TimeSeriesDataset.project_dataset(
+            dataset,
+            temporal_cols=["y"]
+            + self.hist_exog_list
+            + self.futr_exog_list
+            + ["available_mask"],
+        )
         datamodule = TimeSeriesDataModule(
             dataset=dataset,
             batch_size=self.batch_size,
             valid_batch_size=self.valid_batch_size,
             num_workers=self.num_workers_loader,
             drop_last=self.drop_last_loader,
+            ragged=self.ragged_sampling,
+            device_resident=device_resident,
         )
 
         if self.val_check_steps > self.max_steps:
@@ -739,6 +949,7 @@ class BaseWindows(pl.LightningModule):
         test_size=None,
         step_size=1,
         random_seed=None,
+        engine="trainer",
         **data_module_kwargs,
     ):
         """Predict.
@@ -750,6 +961,7 @@ class BaseWindows(pl.LightningModule):
         `test_size`: int=None, test size for temporal cross-validation.<br>
         `step_size`: int=1, Step size between each window.<br>
         `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites model.__init__'s.<br>
+        `engine`: str='trainer', 'torch' predicts with an `InferenceRunner` plain loop instead of PL's `Trainer`.<br>
         `**data_module_kwargs`: PL's TimeSeriesDataModule args, see [documentation](https://pytorch-lightning.readthedocs.io/en/1.6.1/extensions/datamodules.html#using-a-datamodule).
         """
 
@@ -778,6 +990,18 @@ class BaseWindows(pl.LightningModule):
 
         self.predict_step_size = step_size
         self.decompose_forecast = False
+        # Windows only use the last input_size + test_size steps of each serie
+        dataset = TimeSeriesDataset.tail_dataset(
+            dataset, size=self.input_size + self.test_size
+        )
+        # Windows only carry y, the model's exogenous variables and the available_mask
+        dataset = TimeSeriesDataset.project_dataset(
+            dataset,
+            temporal_cols=["y"]
+            + self.hist_exog_list
+            + self.futr_exog_list
+            + ["available_mask"],
+        )
         datamodule = TimeSeriesDataModule(
             dataset=dataset,
             valid_batch_size=self.valid_batch_size,
@@ -791,8 +1015,11 @@ class BaseWindows(pl.LightningModule):
         ):
             pred_trainer_kwargs["devices"] = [0]
 
-        trainer = pl.Trainer(**pred_trainer_kwargs)
-        fcsts = trainer.predict(self, datamodule=datamodule)
+        if engine == "torch":
+            fcsts = InferenceRunner(self).predict(datamodule)
+        else:
+            trainer = pl.Trainer(**pred_trainer_kwargs)
+            fcsts = trainer.predict(self, datamodule=datamodule)
         fcsts = torch.vstack(fcsts).numpy().flatten()
         fcsts = fcsts.reshape(-1, len(self.loss.output_names))
         return fcsts
@@ -815,6 +1042,17 @@ class BaseWindows(pl.LightningModule):
 
         self.predict_step_size = step_size
         self.decompose_forecast = True
+        dataset = TimeSeriesDataset.tail_dataset(
+            dataset, size=self.input_size + self.test_size
+        )
+        # Windows only carry y, the model's exogenous variables and the available_mask
+        dataset = TimeSeriesDataset.project_dataset(
+            dataset,
+            temporal_cols=["y"]
+            + self.hist_exog_list
+            + self.futr_exog_list
+            + ["available_mask"],
+        )
         datamodule = TimeSeriesDataModule(
             dataset=dataset,
             valid_batch_size=self.valid_batch_size,
@@ -842,4 +1080,198 @@ class BaseWindows(pl.LightningModule):
         **Parameters:**<br>
         `path`: str, path to save the model.<br>
         """
-        self.trainer.save_checkpoint(path)
+        _save_checkpoint(self, path)
+
+    def enable_compile(self, mode="default", dynamic=None):
+        """BaseWindows.enable_compile
+
+        Opt-in `torch.compile` of the model's `forward` and of the `TemporalNorm` statistics
+        and scalers of its normalization and inverse normalization, for training and inference.
+        The forward is compiled for each model on its first call, the normalization functions are shared.
+
+        **Parameters:**<br>
+        `mode`: str='default', `torch.compile` mode, e.g. 'reduce-overhead' or 'max-autotune'.<br>
+        `dynamic`: bool=None, None compiles static shapes and recompiles once with dynamic shapes
+        when the windows batch size changes (e.g. the last partial batch), True compiles dynamic shapes from the start.<br>
+        """
+        self.compile_kwargs = dict(mode=mode, dynamic=dynamic)
+        self.__dict__.pop("forward", None)
+        self.scaler.compile_kwargs = self.compile_kwargs
+        return self
+
+
+# %% ../../nbs/common.base_windows.ipynb 7
+class _WindowsGroup(pl.LightningModule):
+    """Windows Group
+
+    Trains `BaseWindows` models that sample the same train windows in lockstep.
+    At every training step the batch is loaded and its windows are sampled once,
+    then each model runs its own forward, backward and optimizer step on them.
+    """
+
+    def __init__(self, models):
+        super(_WindowsGroup, self).__init__()
+        self.models = nn.ModuleList(models)
+        # Each model steps its own optimizer and learning rate scheduler
+        self.automatic_optimization = False
+
+    @staticmethod
+    def group_key(model):
+        # Models with the same key sample the same train windows,
+        # None for the models that can only be fitted on their own
+        if not isinstance(model, BaseWindows):
+            return None
+        if (type(model).training_step is not BaseWindows.training_step) or (
+            type(model).validation_step is not BaseWindows.validation_step
+        ):
+            return None
+        if (model.early_stop_patience_steps > 0) or (
+            model.trainer_kwargs.get("gradient_clip_val", None) is not None
+        ):
+            return None
+        return (
+            model.input_size,
+            model.h,
+            model.step_size,
+            model.start_padding_enabled,
+            model.batch_size,
+            model.valid_batch_size,
+            model.windows_batch_size,
+            model.max_steps,
+            model.val_check_steps,
+            model.num_workers_loader,
+            model.drop_last_loader,
+            model.ragged_sampling,
+        )
+
+    def on_fit_start(self):
+        self.models[0].on_fit_start()
+
+    def configure_optimizers(self):
+        configs = [model.configure_optimizers() for model in self.models]
+        optimizers = [config["optimizer"] for config in configs]
+        schedulers = [config["lr_scheduler"] for config in configs]
+        return optimizers, schedulers
+
+    def training_step(self, batch, batch_idx):
+        # Every optimizer step counts as a trainer step
+        step = self.global_step // len(self.models)
+
+        # Windows sampled once for the group [Ws, L+H, C]
+        windows = self.models[0]._create_windows(batch, step="train")
+        losses = []
+        for model, optimizer, scheduler in zip(
+            self.models, self.optimizers(), self.lr_schedulers()
+        ):
+            # The normalization is in place, each model gets its own copy of the windows
+            model_windows = {**windows, "temporal": windows["temporal"].clone()}
+            loss = model._train_loss(batch, model_windows)
+            optimizer.zero_grad()
+            self.manual_backward(loss)
+            optimizer.step()
+            scheduler.step()
+            model.train_trajectories.append((step, float(loss)))
+            losses.append(loss.detach())
+
+        loss = torch.stack(losses).mean()
+        self.log("train_loss", loss, prog_bar=True, on_epoch=True)
+        return loss
+
+    def validation_step(self, batch, batch_idx):
+        if self.models[0].val_size == 0:
+            return np.nan
+
+        valid_losses = []
+        for model in self.models:
+            valid_loss = model._valid_loss(batch)
+            model.validation_step_outputs.append(valid_loss)
+            valid_losses.append(valid_loss)
+
+        valid_loss = torch.stack(valid_losses).mean()
+        self.log("valid_loss", valid_loss, prog_bar=True, on_epoch=True)
+        return valid_loss
+
+    def on_validation_epoch_end(self):
+        if self.models[0].val_size == 0:
+            return
+        step = self.global_step // len(self.models)
+        avg_losses = []
+        for model in self.models:
+            avg_loss = torch.stack(model.validation_step_outputs).mean()
+            model.valid_trajectories.append((step, float(avg_loss)))
+            model.validation_step_outputs.clear()
+            avg_losses.append(avg_loss)
+        self.log("ptl/val_loss", torch.stack(avg_losses).mean())
+
+    def fit(self, dataset, val_size=0, test_size=0, random_seed=None):
+        """Fit.
+
+        Fits the models of the group in lockstep, see `BaseWindows.fit`.
+        The `Trainer` is built from the first model's `trainer_kwargs`.
+
+        **Parameters:**<br>
+        `dataset`: NeuralForecast's `TimeSeriesDataset`, see [documentation](https://nixtla.github.io/neuralforecast/tsdataset.html).<br>
+        `val_size`: int, validation size for temporal cross-validation.<br>
+        `test_size`: int, test size for temporal cross-validation.<br>
+        `random_seed`: int=None, random_seed for pytorch initializer and numpy generators, overwrites the first model's.<br>
+        """
+        model = self.models[0]
+
+        # Check exogenous variables are contained in dataset
+        temporal_cols = set(dataset.temporal_cols.tolist())
+        static_cols = set(
+            dataset.static_cols.tolist() if dataset.static_cols is not None else []
+        )
+        hist_exog_list = [col for m in self.models for col in m.hist_exog_list]
+        futr_exog_list = [col for m in self.models for col in m.futr_exog_list]
+        stat_exog_list = [col for m in self.models for col in m.stat_exog_list]
+        if len(set(hist_exog_list) - temporal_cols) > 0:
+            raise Exception(
+                f"{set(hist_exog_list) - temporal_cols} historical exogenous variables not found in input dataset"
+            )
+        if len(set(futr_exog_list) - temporal_cols) > 0:
+            raise Exception(
+                f"{set(futr_exog_list) - temporal_cols} future exogenous variables not found in input dataset"
+            )
+        if len(set(stat_exog_list) - static_cols) > 0:
+            raise Exception(
+                f"{set(stat_exog_list) - static_cols} static exogenous variables not found in input dataset"
+            )
+
+        # Restart random seed
+        if random_seed is None:
+            random_seed = model.random_seed
+        torch.manual_seed(random_seed)
+
+        for m in self.models:
+            m.val_size = val_size
+            m.test_size = test_size
+        # Windows carry y, the exogenous variables of every model and the available_mask
+        dataset = TimeSeriesDataset.project_dataset(
+            dataset,
+            temporal_cols=["y"] + hist_exog_list + futr_exog_list + ["available_mask"],
+        )
+        datamodule = TimeSeriesDataModule(
+            dataset=dataset,
+            batch_size=model.batch_size,
+            valid_batch_size=model.valid_batch_size,
+            num_workers=model.num_workers_loader,
+            drop_last=model.drop_last_loader,
+            ragged=model.ragged_sampling,
+        )
+
+        if model.val_check_steps > model.max_steps:
+            warnings.warn(
+                "val_check_steps is greater than max_steps, \
+                    setting val_check_steps to max_steps"
+            )
+        val_check_interval = min(model.val_check_steps, model.max_steps)
+        trainer_kwargs = {
+            **model.trainer_kwargs,
+            "max_steps": model.max_steps * len(self.models),
+            "val_check_interval": int(val_check_interval),
+            "check_val_every_n_epoch": None,
+        }
+
+        trainer = pl.Trainer(**trainer_kwargs)
+        trainer.fit(self, datamodule=datamodule)
@@ -0,0 +1,162 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/common.inference.ipynb.
+
+# %% auto 0
+__all__ = ['InferenceRunner', 'quantize_dynamic']
+
+# %% ../../nbs/common.inference.ipynb 4
+import pytorch_lightning as pl
+import torch
+import torch.nn as nn
+
+# %% ../../nbs/common.inference.ipynb 5
+class InferenceRunner:
+    """Inference Runner
+
+    Runs a model's `predict_step` over the prediction batches of a `TimeSeriesDataModule`
+    in a plain loop under `torch.inference_mode()`, without the setup of a Lightning `Trainer`,
+    its callbacks and progress bar. The outputs match `Trainer.predict`'s.
+
+    **Parameters:**<br>
+    `model`: `BaseWindows`, `BaseRecurrent` or `BaseMultivariate` model.<br>
+    `device`: str or torch.device=None, device where the batches are predicted.
+    If None, it is inferred from the model's `trainer_kwargs` accelerator and devices.<br>
+    """
+
+    def __init__(self, model, device=None):
+        self.model = model
+        if device is None:
+            device = self._trainer_device(model.trainer_kwargs)
+        self.device = torch.device(device)
+
+        # Mixed precision of the Trainer, applied with the same autocast
+        precision = str(model.trainer_kwargs.get("precision", "32"))
+        self.autocast_dtype = {
+            "16-mixed": torch.float16,
+            "bf16-mixed": torch.bfloat16,
+        }.get(precision, None)
+
+    @staticmethod
+    def _trainer_device(trainer_kwargs):
+        accelerator = trainer_kwargs.get("accelerator", None)
+        if accelerator in ["gpu", "cuda"] and torch.cuda.is_available():
+            # As the models' predict, multiple gpus predict on the first one
+            devices = trainer_kwargs.get("devices", None)
+            index = devices[0] if isinstance(devices, (list, tuple)) else 0
+            return torch.device("cuda", index)
+        if accelerator == "mps" and torch.backends.mps.is_available():
+            return torch.device("mps")
+        return torch.device("cpu")
+
+    def _to_device(self, batch):
+        return {
+            key: value.to(self.device) if torch.is_tensor(value) else value
+            for key, value in batch.items()
+        }
+
+    def predict(self, datamodule):
+        """Predict.
+
+        **Parameters:**<br>
+        `datamodule`: `TimeSeriesDataModule` with the prediction dataset.<br>
+
+        **Returns:**<br>
+        `outputs`: list with the CPU outputs of `predict_step` for every batch.<br>
+        """
+        model = self.model
+        training = model.training
+        model.to(self.device)
+        model.eval()
+
+        outputs = []
+        with torch.inference_mode():
+            for batch_idx, batch in enumerate(datamodule.predict_dataloader()):
+                batch = self._to_device(batch)
+                if self.autocast_dtype is None:
+                    output = model.predict_step(batch, batch_idx)
+                else:
+                    with torch.autocast(
+                        device_type=self.device.type, dtype=self.autocast_dtype
+                    ):
+                        output = model.predict_step(batch, batch_idx)
+                outputs.append(output.cpu())
+
+        # As after `Trainer.predict`, the model is left on the CPU
+        model.cpu()
+        model.train(training)
+        return outputs
+
+# %% ../../nbs/common.inference.ipynb 8
+def _save_checkpoint(model, path):
+    # Saves the checkpoint of a fitted model. Models fitted in a worker process
+    # come back detached from their Trainer, their checkpoint is built here
+    if model._trainer is not None:
+        model.trainer.save_checkpoint(path)
+        return
+    checkpoint = {
+        "state_dict": model.state_dict(),
+        "hyper_parameters": model.hparams,
+        "pytorch-lightning_version": pl.__version__,
+    }
+    model.on_save_checkpoint(checkpoint)
+    torch.save(checkpoint, path)
+
+# %% ../../nbs/common.inference.ipynb 9
+_QUANTIZATION_DTYPES = {"int8": torch.qint8, "float16": torch.float16}
+
+
+def quantize_dynamic(model, dtype="int8"):
+    """Dynamic Quantization
+
+    Post-training dynamic quantization of the `nn.Linear`, `nn.LSTM` and `nn.GRU`
+    layers of a fitted model, in place. Their weights are stored in `dtype`, and with
+    'int8' their activations are quantized on the fly for every batch. Quantized layers
+    only run on the CPU, the model's `trainer_kwargs` are set to predict on it.
+
+    **Parameters:**<br>
+    `model`: fitted `BaseWindows`, `BaseRecurrent` or `BaseMultivariate` model.<br>
+    `dtype`: str='int8', dtype of the quantized weights, 'int8' or 'float16'.<br>
+
+    **Returns:**<br>
+    `model`: the quantized model.<br>
+    """
+    if dtype not in _QUANTIZATION_DTYPES:
+        raise ValueError(
+            f"dtype must be one of {list(_QUANTIZATION_DTYPES)}, got {dtype}"
+        )
+    if model.quantization is not None:
+        raise Exception(f"The model is already quantized to {model.quantization}.")
+
+    model.cpu()
+    torch.ao.quantization.quantize_dynamic(
+        model,
+        qconfig_spec={nn.Linear, nn.LSTM, nn.GRU},
+        dtype=_QUANTIZATION_DTYPES[dtype],
+        inplace=True,
+    )
+    model.quantization = dtype
+    model.trainer_kwargs["accelerator"] = "cpu"
+    model.trainer_kwargs["devices"] = 1
+    return model
+
+
+class _QuantizationMixin:
+    # Quantization methods and checkpoint hooks shared by
+    # `BaseWindows`, `BaseRecurrent` and `BaseMultivariate`
+    def quantize(self, dtype="int8"):
+        """quantize
+
+        Post-training dynamic quantization of the fitted model's linear and recurrent
+        layers for CPU inference, see `quantize_dynamic`. `save` stores the quantized weights.
+
+        **Parameters:**<br>
+        `dtype`: str='int8', dtype of the quantized weights, 'int8' or 'float16'.<br>
+        """
+        return quantize_dynamic(self, dtype=dtype)
+
+    def on_save_checkpoint(self, checkpoint):
+        checkpoint["quantization"] = self.quantization
+
+    def on_load_checkpoint(self, checkpoint):
+        # The layers are quantized before the checkpoint's weights are loaded into them
+        if checkpoint.get("quantization", None) is not None:
+            quantize_dynamic(self, dtype=checkpoint["quantization"])
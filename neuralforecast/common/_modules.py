@@ -189,7 +189,31 @@ class TemporalConvolutionEncoder(nn.Module):
         x = x.permute(0, 2, 1).contiguous()
         return x
 
-# %% ../../nbs/common.modules.ipynb 15
+    def stateful_forward(self, x, buffers=None):
+        """`forward` over the new steps `x` [N,T,C_in] of series whose previous steps left
+        `buffers`, the last `(kernel_size-1)*dilation` inputs of every causal convolution
+        (None for zero padding). Returns the outputs [N,T,C_out] and the new buffers.
+        """
+        x = x.permute(0, 2, 1)
+        new_buffers = []
+        for i, layer in enumerate(self.tcn):
+            padding = layer.chomp.horizon
+            if buffers is None:
+                buffer = x.new_zeros(x.size(0), x.size(1), padding)
+            else:
+                buffer = buffers[i]
+            # Unpadded convolution over the buffered and new inputs [N,C,padding+T] -> [N,C,T]
+            x = torch.cat((buffer, x), dim=2)
+            # The last `padding` inputs, none for convolutions without padding
+            new_buffers.append(x[:, :, x.size(2) - padding :])
+            x = F.conv1d(
+                x, layer.conv.weight, layer.conv.bias, dilation=layer.conv.dilation
+            )
+            x = layer.activation(x)
+        x = x.permute(0, 2, 1).contiguous()
+        return x, tuple(new_buffers)
+
+# %% ../../nbs/common.modules.ipynb 16
 class TransEncoderLayer(nn.Module):
     def __init__(
         self,
@@ -254,7 +278,7 @@ class TransEncoder(nn.Module):
 
         return x, attns
 
-# %% ../../nbs/common.modules.ipynb 16
+# %% ../../nbs/common.modules.ipynb 17
 class TransDecoderLayer(nn.Module):
     def __init__(
         self,
@@ -314,7 +338,7 @@ class TransDecoder(nn.Module):
             x = self.projection(x)
         return x
 
-# %% ../../nbs/common.modules.ipynb 17
+# %% ../../nbs/common.modules.ipynb 18
 class AttentionLayer(nn.Module):
     def __init__(self, attention, hidden_size, n_head, d_keys=None, d_values=None):
         super(AttentionLayer, self).__init__()
@@ -343,7 +367,7 @@ class AttentionLayer(nn.Module):
 
         return self.out_projection(out), attn
 
-# %% ../../nbs/common.modules.ipynb 18
+# %% ../../nbs/common.modules.ipynb 19
 class PositionalEmbedding(nn.Module):
     def __init__(self, hidden_size, max_len=5000):
         super(PositionalEmbedding, self).__init__()
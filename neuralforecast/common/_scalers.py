@@ -327,6 +327,18 @@ def inv_identity_scaler(z, x_shift, x_scale):
     return z
 
 # %% ../../nbs/common.scalers.ipynb 33
+_compiled_fns = {}
+
+
+def _compiled(fn, compile_kwargs):
+    # `torch.compile` of plain functions, cached for the process. Models only store
+    # their compile options, so that they can still be copied and pickled
+    key = (fn, tuple(sorted(compile_kwargs.items())))
+    if key not in _compiled_fns:
+        _compiled_fns[key] = torch.compile(fn, **compile_kwargs)
+    return _compiled_fns[key]
+
+# %% ../../nbs/common.scalers.ipynb 34
 class TemporalNorm(nn.Module):
     """Temporal Normalization
 
@@ -395,10 +407,18 @@ class TemporalNorm(nn.Module):
         self.scaler_type = scaler_type
         self.dim = dim
         self.eps = eps
+        # Opt-in `torch.compile` options of the statistics and scalers
+        self.compile_kwargs = None
 
         if scaler_type == "revin":
             self._init_params(num_features=num_features)
 
+    def _fn(self, fn):
+        # Compiled statistics or scaler function when compile is enabled
+        if self.compile_kwargs is None:
+            return fn
+        return _compiled(fn, self.compile_kwargs)
+
     def _init_params(self, num_features):
         # Initialize RevIN scaler params to broadcast:
         if self.dim == 1:  # [B,T,C]  [1,1,C]
@@ -421,7 +441,7 @@ class TemporalNorm(nn.Module):
         **Returns:**<br>
         `z`: torch.Tensor same shape as `x`, except scaled.
         """
-        x_shift, x_scale = self.compute_statistics(
+        x_shift, x_scale = self._fn(self.compute_statistics)(
             x=x, mask=mask, dim=self.dim, eps=self.eps
         )
         self.x_shift = x_shift
@@ -436,7 +456,7 @@ class TemporalNorm(nn.Module):
             self.x_shift = self.x_shift + self.revin_bias
             self.x_scale = self.x_scale * (torch.relu(self.revin_weight) + self.eps)
 
-        z = self.scaler(x, x_shift, x_scale)
+        z = self._fn(self.scaler)(x, x_shift, x_scale)
         return z
 
     # @torch.no_grad()
@@ -461,7 +481,7 @@ class TemporalNorm(nn.Module):
         # However this is only valid for point forecast not for
         # distribution's scale decouple technique.
 
-        x = self.inverse_scaler(z, x_shift, x_scale)
+        x = self._fn(self.inverse_scaler)(z, x_shift, x_scale)
         return x
 
     def forward(self, x):
@@ -4,9 +4,12 @@
 __all__ = ['NeuralForecast']
 
 # %% ../nbs/core.ipynb 4
+import multiprocessing
 import os
 import pickle
+import tempfile
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 from itertools import chain
 from typing import Any, Dict, List, Optional, Union
@@ -27,7 +30,9 @@ from utilsforecast.target_transforms import (
 from utilsforecast.validation import validate_freq
 
 import neuralforecast.config as nf_config
-from .tsdataset import TimeSeriesDataset
+from .tsdataset import TimeSeriesDataModule, TimeSeriesDataset, _ragged_arange
+from .common._base_windows import BaseWindows, _WindowsGroup
+from .common._inference import InferenceRunner
 from neuralforecast.models import (
     GRU,
     LSTM,
@@ -156,6 +161,21 @@ def _warn_id_as_idx():
         category=DeprecationWarning,
     )
 
+
+def _fit_predict_models(models, dataset, fit_kwargs, predict_kwargs, n_threads=None):
+    # Fits a single model or a lockstep group of models. In a worker process
+    # the thread limit keeps the workers from oversubscribing the cores
+    if n_threads is not None:
+        torch.set_num_threads(n_threads)
+    if len(models) > 1:
+        _WindowsGroup(models).fit(dataset=dataset, **fit_kwargs)
+    else:
+        models[0].fit(dataset=dataset, **fit_kwargs)
+    fcsts = [None] * len(models)
+    if predict_kwargs is not None:
+        fcsts = [model.predict(dataset, **predict_kwargs) for model in models]
+    return models, fcsts
+
 # %% ../nbs/core.ipynb 10
 class NeuralForecast:
     def __init__(
@@ -246,6 +266,75 @@ class NeuralForecast:
             self._scalers_fit_transform(dataset)
         return dataset, uids, last_dates, ds
 
+    def _fit_models(
+        self,
+        fit_kwargs: Dict[str, Any],
+        predict_kwargs: Optional[Dict[str, Any]] = None,
+        n_jobs: int = 1,
+        threads_per_job: Optional[int] = None,
+        lockstep: bool = False,
+    ) -> List[Optional[np.ndarray]]:
+        # Fits self.models on self.dataset and predicts it when predict_kwargs is passed
+        if lockstep:
+            # Models that sample the same train windows are fitted together
+            groups: Dict[Any, List[int]] = {}
+            for i, model in enumerate(self.models):
+                key = _WindowsGroup.group_key(model)
+                groups.setdefault(i if key is None else key, []).append(i)
+            units = list(groups.values())
+        else:
+            units = [[i] for i in range(len(self.models))]
+
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = min(n_jobs, len(units))
+        if n_jobs <= 1:
+            results = [
+                _fit_predict_models(
+                    [self.models[i] for i in unit],
+                    self.dataset,
+                    fit_kwargs,
+                    predict_kwargs,
+                )
+                for unit in units
+            ]
+            return self._collect_units(units, results)
+
+        if threads_per_job is None:
+            threads_per_job = max((os.cpu_count() or 1) // n_jobs, 1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Memory-mapped datasets are sent to the workers as a reference to their
+            # files, so all the workers read the same copy of the data
+            dataset = self.dataset
+            if dataset.mmap_path is None:
+                dataset.save(tmpdir)
+                dataset = TimeSeriesDataset.load(tmpdir, mmap=True)
+            with ProcessPoolExecutor(
+                max_workers=n_jobs, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _fit_predict_models,
+                        [self.models[i] for i in unit],
+                        dataset,
+                        fit_kwargs,
+                        predict_kwargs,
+                        threads_per_job,
+                    )
+                    for unit in units
+                ]
+                results = [future.result() for future in futures]
+        return self._collect_units(units, results)
+
+    def _collect_units(self, units, results) -> List[Optional[np.ndarray]]:
+        # Puts the fitted models and their forecasts back in the order of self.models
+        fcsts: List[Optional[np.ndarray]] = [None] * len(self.models)
+        for unit, (models, models_fcsts) in zip(units, results):
+            for i, model, model_fcsts in zip(unit, models, models_fcsts):
+                self.models[i] = model
+                fcsts[i] = model_fcsts
+        return fcsts
+
     def fit(
         self,
         df: Optional[DataFrame] = None,
@@ -254,6 +343,9 @@ class NeuralForecast:
         sort_df: bool = True,
         use_init_models: bool = False,
         verbose: bool = False,
+        n_jobs: int = 1,
+        threads_per_job: Optional[int] = None,
+        lockstep: bool = False,
     ):
         """Fit the core.NeuralForecast.
 
@@ -275,6 +367,15 @@ class NeuralForecast:
             Use initial model passed when NeuralForecast object was instantiated.
         verbose : bool (default=False)
             Print processing steps.
+        n_jobs : int (default=1)
+            Number of models fitted concurrently, each one in its own process.
+            Use -1 for one process per CPU core.
+        threads_per_job : int, optional (default=None)
+            Number of torch threads of each process. If None, the CPU cores are split between the processes.
+        lockstep : bool (default=False)
+            Fit together the window-based models that sample the same train windows
+            (same `input_size`, `h`, `step_size`, batch sizes and `max_steps`).
+            Each step the data is loaded once for the group, then every model takes its own optimizer step.
 
         Returns
         -------
@@ -313,8 +414,12 @@ class NeuralForecast:
             if self._fitted:
                 print("WARNING: Deleting previously fitted models.")
 
-        for model in self.models:
-            model.fit(self.dataset, val_size=val_size)
+        self._fit_models(
+            fit_kwargs=dict(val_size=val_size),
+            n_jobs=n_jobs,
+            threads_per_job=threads_per_job,
+            lockstep=lockstep,
+        )
 
         self._fitted = True
 
@@ -370,6 +475,8 @@ class NeuralForecast:
         futr_df: Optional[DataFrame] = None,
         sort_df: bool = True,
         verbose: bool = False,
+        fused: bool = False,
+        engine: str = "trainer",
         **data_kwargs,
     ):
         """Predict with core.NeuralForecast.
@@ -389,6 +496,12 @@ class NeuralForecast:
             Sort `df` before fitting.
         verbose : bool (default=False)
             Print processing steps.
+        fused : bool (default=False)
+            Predict the window-based models with point losses in a single pass over the dataset,
+            instead of one prediction loop per model. Only available with `engine='torch'`.
+        engine : str (default='trainer')
+            Prediction loop of the models, 'trainer' uses PL's `Trainer.predict` and
+            'torch' a plain PyTorch loop without the `Trainer` setup overhead.
         data_kwargs : kwargs
             Extra arguments to be passed to the dataset within each model.
 
@@ -404,6 +517,13 @@ class NeuralForecast:
         if not self._fitted:
             raise Exception("You must fit the model before predicting.")
 
+        if engine not in ["trainer", "torch"]:
+            raise ValueError(f"engine must be 'trainer' or 'torch', got {engine}")
+        if fused and engine != "torch":
+            raise ValueError(
+                "fused=True predicts in a plain PyTorch loop, use it with engine='torch'"
+            )
+
         needed_futr_exog = set(
             chain.from_iterable(getattr(m, "futr_exog_list", []) for m in self.models)
         )
@@ -477,19 +597,51 @@ class NeuralForecast:
                 raise ValueError("Found null values in `futr_df`")
             futr_dataset = dataset.align(futr_df)
         self._scalers_transform(futr_dataset)
+        # Window based models only need the last `input_size` steps of each serie,
+        # drop the rest of the history before copying it into the forecasting dataset
+        if all(
+            getattr(model, "SAMPLING_TYPE", None) in ["windows", "multivariate"]
+            and getattr(model, "input_size", None) is not None
+            for model in self.models
+        ):
+            input_sizes: List[int] = [model.input_size for model in self.models]
+            dataset = TimeSeriesDataset.tail_dataset(dataset, size=max(input_sizes))
         dataset = dataset.append(futr_dataset)
 
-        col_idx = 0
-        fcsts = np.full((self.h * len(uids), len(cols)), fill_value=np.nan)
+        old_test_sizes = [model.get_test_size() for model in self.models]
         for model in self.models:
-            old_test_size = model.get_test_size()
             model.set_test_size(self.h)  # To predict h steps ahead
-            model_fcsts = model.predict(dataset=dataset, **data_kwargs)
+        fused_idxs = []
+        if fused:
+            # Distribution losses sample their forecasts, they are predicted on their own
+            # to draw the same samples as with their own seed and batches
+            fused_idxs = [
+                i
+                for i, model in enumerate(self.models)
+                if isinstance(model, BaseWindows)
+                and type(model).predict_step is BaseWindows.predict_step
+                and not model.loss.is_distribution_output
+            ]
+        models_fcsts = {}
+        if len(fused_idxs) > 0:
+            fused_fcsts = self._predict_fused(
+                [self.models[i] for i in fused_idxs], dataset=dataset, **data_kwargs
+            )
+            models_fcsts = dict(zip(fused_idxs, fused_fcsts))
+
+        col_idx = 0
+        fcsts = np.full((self.h * len(uids), len(cols)), fill_value=np.nan)
+        for i, model in enumerate(self.models):
+            model_fcsts = models_fcsts.get(i, None)
+            if model_fcsts is None:
+                model_fcsts = model.predict(
+                    dataset=dataset, engine=engine, **data_kwargs
+                )
             # Append predictions in memory placeholder
             output_length = len(model.loss.output_names)
             fcsts[:, col_idx : col_idx + output_length] = model_fcsts
             col_idx += output_length
-            model.set_test_size(old_test_size)  # Set back to original value
+            model.set_test_size(old_test_sizes[i])  # Set back to original value
         if self.scalers_:
             indptr = np.append(0, np.full(len(uids), self.h).cumsum())
             fcsts = self._scalers_target_inverse_transform(fcsts, indptr)
@@ -505,6 +657,71 @@ class NeuralForecast:
             fcsts_df = fcsts_df.set_index("unique_id")
         return fcsts_df
 
+    def _predict_fused(
+        self, models, dataset, step_size=1, random_seed=None, **data_kwargs
+    ) -> List[np.ndarray]:
+        # Predicts window-based models with point losses in a single pass over the dataset.
+        # The windows view of each batch is built once for the models that share its input_size.
+        # Point forecasts draw no samples, neither the seed nor the batch size change them
+
+        # Windows only use the last input_size + test_size steps of each serie,
+        # and only carry y, the models' exogenous variables and the available_mask
+        dataset = TimeSeriesDataset.tail_dataset(
+            dataset,
+            size=max(model.input_size for model in models) + models[0].get_test_size(),
+        )
+        exog_list = [
+            col for model in models for col in model.hist_exog_list + model.futr_exog_list
+        ]
+        dataset = TimeSeriesDataset.project_dataset(
+            dataset, temporal_cols=["y"] + exog_list + ["available_mask"]
+        )
+        loader = TimeSeriesDataModule(
+            dataset=dataset,
+            valid_batch_size=models[0].valid_batch_size,
+            **data_kwargs,
+        ).predict_dataloader()
+
+        # Predicted on the device of the 'torch' engine, the models are put back afterwards
+        device = InferenceRunner._trainer_device(models[0].trainer_kwargs)
+        states = [(next(model.parameters()).device, model.training) for model in models]
+        for model in models:
+            model.to(device)
+            model.eval()
+            model.predict_step_size = step_size
+            model.decompose_forecast = False
+
+        fcsts: List[List[torch.Tensor]] = [[] for _ in models]
+        try:
+            with torch.inference_mode():
+                for batch in loader:
+                    batch = {
+                        key: value.to(device) if torch.is_tensor(value) else value
+                        for key, value in batch.items()
+                    }
+                    windows_views = {}
+                    for model, model_fcsts in zip(models, fcsts):
+                        # Right padding of the horizon depends on the future exogenous
+                        key = (model.input_size, len(model.futr_exog_list) == 0)
+                        if key not in windows_views:
+                            windows_views[key] = model._create_windows_view(
+                                batch, step="predict"
+                            )
+                        model_fcsts.append(
+                            model._predict_windows_view(batch, windows_views[key])
+                        )
+        finally:
+            for model, (model_device, training) in zip(models, states):
+                model.to(model_device)
+                model.train(training)
+        return [
+            torch.vstack(model_fcsts)
+            .cpu()
+            .numpy()
+            .reshape(-1, len(model.loss.output_names))
+            for model, model_fcsts in zip(models, fcsts)
+        ]
+
     def cross_validation(
         self,
         df: Optional[pd.DataFrame] = None,
@@ -516,6 +733,9 @@ class NeuralForecast:
         sort_df: bool = True,
         use_init_models: bool = False,
         verbose: bool = False,
+        n_jobs: int = 1,
+        threads_per_job: Optional[int] = None,
+        lockstep: bool = False,
         **data_kwargs,
     ):
         """Temporal Cross-Validation with core.NeuralForecast.
@@ -544,6 +764,15 @@ class NeuralForecast:
             Use initial model passed when object was instantiated.
         verbose : bool (default=False)
             Print processing steps.
+        n_jobs : int (default=1)
+            Number of models fitted concurrently, each one in its own process.
+            Use -1 for one process per CPU core.
+        threads_per_job : int, optional (default=None)
+            Number of torch threads of each process. If None, the CPU cores are split between the processes.
+        lockstep : bool (default=False)
+            Fit together the window-based models that sample the same train windows
+            (same `input_size`, `h`, `step_size`, batch sizes and `max_steps`).
+            Each step the data is loaded once for the group, then every model takes its own optimizer step.
         data_kwargs : kwargs
             Extra arguments to be passed to the dataset within each model.
 
@@ -616,12 +845,14 @@ class NeuralForecast:
             (self.dataset.n_groups * h * n_windows, len(cols)), np.nan, dtype=np.float32
         )
 
-        for model in self.models:
-            model.fit(dataset=self.dataset, val_size=val_size, test_size=test_size)
-            model_fcsts = model.predict(
-                self.dataset, step_size=step_size, **data_kwargs
-            )
-
+        models_fcsts = self._fit_models(
+            fit_kwargs=dict(val_size=val_size, test_size=test_size),
+            predict_kwargs=dict(step_size=step_size, **data_kwargs),
+            n_jobs=n_jobs,
+            threads_per_job=threads_per_job,
+            lockstep=lockstep,
+        )
+        for model, model_fcsts in zip(self.models, models_fcsts):
             # Append predictions in memory placeholder
             output_length = len(model.loss.output_names)
             fcsts[:, col_idx : (col_idx + output_length)] = model_fcsts
@@ -695,13 +926,8 @@ class NeuralForecast:
             trimmed_dataset = TimeSeriesDataset.trim_dataset(
                 dataset=self.dataset, right_trim=test_size, left_trim=0
             )
-            new_idxs = np.hstack(
-                [
-                    np.arange(
-                        self.dataset.indptr[i], self.dataset.indptr[i + 1] - test_size
-                    )
-                    for i in range(self.dataset.n_groups)
-                ]
+            new_idxs = _ragged_arange(
+                self.dataset.indptr[:-1], np.diff(self.dataset.indptr) - test_size
             )
             times = self.ds[new_idxs]
         else:
@@ -763,6 +989,30 @@ class NeuralForecast:
             fcsts_df = fcsts_df.set_index("unique_id")
         return fcsts_df
 
+    def quantize(self, dtype: str = "int8"):
+        """Quantize the fitted models.
+
+        Post-training dynamic quantization of the `nn.Linear`, `nn.LSTM` and `nn.GRU`
+        layers of the fitted `models` for CPU inference. `save` stores the quantized
+        weights and `load` restores them. Quantized models predict on the CPU and can
+        not be fitted again.
+
+        Parameters
+        ----------
+        dtype : str (default='int8')
+            Dtype of the quantized weights, 'int8' or 'float16'.
+
+        Returns
+        -------
+        self : NeuralForecast
+            Returns `NeuralForecast` with its quantized `models`.
+        """
+        if not self._fitted:
+            raise Exception("You must fit the model before quantizing it.")
+        for model in self.models:
+            model.quantize(dtype=dtype)
+        return self
+
     # Save list of models with pytorch lightning save_checkpoint function
     def save(
         self,
@@ -821,8 +1071,7 @@ class NeuralForecast:
 
         # Save dataset
         if (save_dataset) and (hasattr(self, "dataset")):
-            with open(f"{path}/dataset.pkl", "wb") as f:
-                pickle.dump(self.dataset, f)
+            self.dataset.save(f"{path}/dataset")
         elif save_dataset:
             raise Exception(
                 "You need to have a stored dataset to save it, \
@@ -846,7 +1095,7 @@ class NeuralForecast:
             pickle.dump(config_dict, f)
 
     @staticmethod
-    def load(path, verbose=False, **kwargs):
+    def load(path, verbose=False, mmap_dataset=False, **kwargs):
         """Load NeuralForecast
 
         `core.NeuralForecast`'s method to load checkpoint from path.
@@ -855,6 +1104,10 @@ class NeuralForecast:
         -----------
         path : str
             Directory to save current status.
+        verbose : bool (default=False)
+            Print processing steps.
+        mmap_dataset : bool (default=False)
+            Memory-map the stored dataset instead of reading it into memory.
         kwargs
             Additional keyword arguments to be passed to the function
             `load_from_checkpoint`.
@@ -887,7 +1140,12 @@ class NeuralForecast:
         if verbose:
             print(10 * "-" + " Loading dataset " + 10 * "-")
         # Load dataset
-        if "dataset.pkl" in files:
+        if os.path.isdir(f"{path}/dataset"):
+            dataset = TimeSeriesDataset.load(f"{path}/dataset", mmap=mmap_dataset)
+            if verbose:
+                print("Dataset loaded.")
+        elif "dataset.pkl" in files:
+            # Saved by previous versions
             with open(f"{path}/dataset.pkl", "rb") as f:
                 dataset = pickle.load(f)
             if verbose:
@@ -0,0 +1,201 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/export.ipynb.
+
+# %% auto 0
+__all__ = ['export_model', 'WindowsRuntime']
+
+# %% ../nbs/export.ipynb 3
+import json
+import zipfile
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+# %% ../nbs/export.ipynb 5
+class _WindowsGraph(nn.Module):
+    # Fitted window-based model with the normalization of its input windows
+    # and the inverse normalization of its forecasts folded into its forward
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+        self.scaler = model.scaler
+
+    def forward(self, insample_y, insample_mask):
+        # The scaler normalizes [B, L, C] windows along L, y is its only channel
+        y = insample_y.unsqueeze(-1)
+        mask = insample_mask.unsqueeze(-1)
+        x_shift, x_scale = self.scaler.compute_statistics(
+            x=y, mask=mask, dim=self.scaler.dim, eps=self.scaler.eps
+        )
+        z = self.scaler.scaler(y, x_shift, x_scale).squeeze(-1)
+        if self.scaler.scaler_type == "revin":
+            x_shift = x_shift + self.scaler.revin_bias
+            x_scale = x_scale * (torch.relu(self.scaler.revin_weight) + self.scaler.eps)
+        if self.model.exclude_insample_y:
+            z = z * 0
+
+        windows_batch = dict(
+            insample_y=z,  # [B, L]
+            insample_mask=insample_mask,  # [B, L]
+            futr_exog=None,
+            hist_exog=None,
+            stat_exog=None,
+        )
+        y_hat = self.model(windows_batch)
+        if y_hat.ndim == 2:
+            y_hat = y_hat.unsqueeze(-1)
+        return self.scaler.inverse_scaler(y_hat, x_shift, x_scale)  # [B, H, outputs]
+
+
+def export_model(
+    model, path: str, format: str = "torchscript", opset_version: int = 17
+):
+    """Export model
+
+    Exports a fitted window-based model (`MLP`, `NHITS`, `NBEATS`, `PatchTST`, `TFT`, ...)
+    as a TorchScript or ONNX graph that maps `[B, L]` windows to `[B, H, outputs]` forecasts.
+    The `TemporalNorm` normalization of the windows and the inverse normalization of the
+    forecasts are part of the graph. The graph is run by `WindowsRuntime`, which only needs
+    `torch` (TorchScript) or `onnxruntime` (ONNX).
+
+    Only models without exogenous variables and with point losses (e.g. `MAE`, `MQLoss`)
+    can be exported, distribution losses sample their forecasts.
+
+    **Parameters:**<br>
+    `model`: fitted `BaseWindows` model.<br>
+    `path`: str, file where the graph is saved.<br>
+    `format`: str='torchscript', graph format, 'torchscript' or 'onnx'.<br>
+    `opset_version`: int=17, ONNX opset of the 'onnx' format.<br>
+    """
+    if format not in ["torchscript", "onnx"]:
+        raise ValueError(f"format must be 'torchscript' or 'onnx', got {format}")
+    if getattr(model, "SAMPLING_TYPE", None) != "windows":
+        raise Exception("Only window-based models can be exported.")
+    if len(model.hist_exog_list + model.futr_exog_list + model.stat_exog_list) > 0:
+        raise Exception("Models with exogenous variables can not be exported.")
+    if model.loss.is_distribution_output:
+        raise Exception("Models with distribution losses can not be exported.")
+
+    metadata = json.dumps(
+        dict(
+            alias=repr(model),
+            h=model.h,
+            input_size=model.input_size,
+            output_names=list(model.loss.output_names),
+        )
+    )
+
+    graph = _WindowsGraph(model)
+    training = model.training
+    model.cpu()
+    model.eval()
+    # The batch dimension of the graph is dynamic, the trace is checked
+    # against a second batch size so that no batch size is baked into it
+    example = (
+        torch.randn(3, model.input_size),
+        torch.ones(3, model.input_size),
+    )
+    check_inputs = [
+        (torch.randn(5, model.input_size), torch.ones(5, model.input_size))
+    ]
+    try:
+        with torch.no_grad():
+            traced = torch.jit.trace(graph, example, check_inputs=check_inputs)
+            if format == "torchscript":
+                torch.jit.save(traced, path, _extra_files={"metadata.json": metadata})
+            else:
+                import onnx
+
+                torch.onnx.export(
+                    graph,
+                    example,
+                    path,
+                    input_names=["insample_y", "insample_mask"],
+                    output_names=["y_hat"],
+                    dynamic_axes={
+                        "insample_y": {0: "batch"},
+                        "insample_mask": {0: "batch"},
+                        "y_hat": {0: "batch"},
+                    },
+                    opset_version=opset_version,
+                )
+                onnx_model = onnx.load(path)
+                entry = onnx_model.metadata_props.add()
+                entry.key = "metadata.json"
+                entry.value = metadata
+                onnx.save(onnx_model, path)
+    finally:
+        model.train(training)
+
+
+class WindowsRuntime:
+    """Windows Runtime
+
+    Minimal CPU runtime for the graphs of `export_model`. It loads TorchScript graphs with
+    `torch.jit.load` and ONNX graphs with an `onnxruntime.InferenceSession`, without the
+    Lightning training stack.
+
+    **Parameters:**<br>
+    `path`: str, file saved by `export_model`.<br>
+
+    **Attributes:**<br>
+    `alias`, `h`, `input_size`: exported model's name, horizon and input size.<br>
+    `columns`: list with the names of the forecasts' outputs, as in `NeuralForecast.predict`.<br>
+    """
+
+    def __init__(self, path: str):
+        # TorchScript archives are zip files, ONNX graphs protobuf messages
+        if zipfile.is_zipfile(path):
+            extra_files = {"metadata.json": ""}
+            self.module = torch.jit.load(
+                path, map_location="cpu", _extra_files=extra_files
+            )
+            self.module.eval()
+            self.session = None
+            metadata_json = extra_files["metadata.json"]
+        else:
+            import onnxruntime
+
+            self.module = None
+            self.session = onnxruntime.InferenceSession(
+                path, providers=["CPUExecutionProvider"]
+            )
+            metadata_json = self.session.get_modelmeta().custom_metadata_map[
+                "metadata.json"
+            ]
+        meta = json.loads(metadata_json)
+        self.alias = meta["alias"]
+        self.h = meta["h"]
+        self.input_size = meta["input_size"]
+        self.columns = [self.alias + name for name in meta["output_names"]]
+
+    def predict(self, insample_y, insample_mask=None) -> np.ndarray:
+        """Predict
+
+        **Parameters:**<br>
+        `insample_y`: array-like [B, L], last `input_size` values of each serie.<br>
+        `insample_mask`: array-like [B, L]=None, 1 where `insample_y` is available
+        and 0 where it is padding. If None, all the values are available.<br>
+
+        **Returns:**<br>
+        `y_hat`: np.ndarray [B, H, outputs] with the forecasts of each window.<br>
+        """
+        insample_y = np.ascontiguousarray(insample_y, dtype=np.float32)
+        if insample_y.ndim != 2 or insample_y.shape[1] != self.input_size:
+            raise ValueError(
+                f"insample_y must have shape [B, {self.input_size}], got {insample_y.shape}"
+            )
+        if insample_mask is None:
+            insample_mask = np.ones_like(insample_y)
+        insample_mask = np.ascontiguousarray(insample_mask, dtype=np.float32)
+        if insample_mask.shape != insample_y.shape:
+            raise ValueError("insample_mask must have the same shape as insample_y")
+
+        if self.session is not None:
+            inputs = {"insample_y": insample_y, "insample_mask": insample_mask}
+            return self.session.run(None, inputs)[0]
+        with torch.inference_mode():
+            y_hat = self.module(
+                torch.from_numpy(insample_y), torch.from_numpy(insample_mask)
+            )
+        return y_hat.numpy()
@@ -296,9 +296,9 @@ class DeepAR(BaseWindows):
         if self.val_size == 0:
             return np.nan
 
-        # TODO: Hack to compute number of windows
-        windows = self._create_windows(batch, step="val")
-        n_windows = len(windows["temporal"])
+        # Windows view built once, every inference batch gathers from it
+        windows_view = self._create_windows_view(batch, step="val")
+        n_windows = windows_view["temporal"].shape[:2].numel()
 
         # Number of windows in batch
         windows_batch_size = self.inference_windows_batch_size
@@ -313,7 +313,7 @@ class DeepAR(BaseWindows):
             w_idxs = np.arange(
                 i * windows_batch_size, min((i + 1) * windows_batch_size, n_windows)
             )
-            windows = self._create_windows(batch, step="val", w_idxs=w_idxs)
+            windows = self._gather_windows(windows_view, w_idxs=w_idxs)
             original_outsample_y = torch.clone(windows["temporal"][:, -self.h :, 0])
             windows = self._normalization(windows=windows)
 
@@ -360,9 +360,9 @@ class DeepAR(BaseWindows):
     def predict_step(self, batch, batch_idx):
         self.h == self.horizon_backup
 
-        # TODO: Hack to compute number of windows
-        windows = self._create_windows(batch, step="predict")
-        n_windows = len(windows["temporal"])
+        # Windows view built once, every inference batch gathers from it
+        windows_view = self._create_windows_view(batch, step="predict")
+        n_windows = windows_view["temporal"].shape[:2].numel()
 
         # Number of windows in batch
         windows_batch_size = self.inference_windows_batch_size
@@ -376,7 +376,7 @@ class DeepAR(BaseWindows):
             w_idxs = np.arange(
                 i * windows_batch_size, min((i + 1) * windows_batch_size, n_windows)
             )
-            windows = self._create_windows(batch, step="predict", w_idxs=w_idxs)
+            windows = self._gather_windows(windows_view, w_idxs=w_idxs)
             windows = self._normalization(windows=windows)
 
             # Parse windows
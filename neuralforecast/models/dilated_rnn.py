@@ -202,6 +202,100 @@ class DRNN(nn.Module):
             inputs = inputs.transpose(0, 1)
         return inputs, outputs
 
+    def stateful_forward(self, inputs, hidden=None, n_seen=0):
+        """`forward` over the new steps `inputs` of series that already went through `n_seen` steps.
+        `hidden` are the states of each layer's dilated chains [B, dilation, n_hidden] after them
+        (None to start the chains). Returns the outputs and the new states.
+        """
+        if self.cell_type == "AttentiveLSTM":
+            raise Exception(
+                "AttentiveLSTM attends over whole dilated sequences, it can not continue from an encoder state."
+            )
+        if self.batch_first:
+            inputs = inputs.transpose(0, 1)
+        if hidden is None:
+            hidden = (None,) * len(self.cells)
+        new_hidden = []
+        for cell, dilation, layer_hidden in zip(self.cells, self.dilations, hidden):
+            inputs, layer_hidden = self._stateful_drnn_layer(
+                cell, inputs, dilation, layer_hidden, n_seen
+            )
+            new_hidden.append(layer_hidden)
+
+        if self.batch_first:
+            inputs = inputs.transpose(0, 1)
+        return inputs, tuple(new_hidden)
+
+    def _stateful_drnn_layer(self, cell, inputs, rate, hidden, n_seen):
+        n_steps, batch_size = inputs.size(0), inputs.size(1)
+
+        # Step t goes to the chain t % rate. Lead with the steps of the chains before the first new one
+        # and complete the last dilated step, these padded steps keep the state of their chains
+        offset = n_seen % rate
+        dilated_steps = -(-(offset + n_steps) // rate)
+        padded_inputs = inputs.new_zeros(
+            dilated_steps * rate, batch_size, inputs.size(2)
+        )
+        padded_inputs[offset : offset + n_steps] = inputs
+        valid = torch.zeros(
+            dilated_steps * rate, dtype=torch.bool, device=inputs.device
+        )
+        valid[offset : offset + n_steps] = True
+        valid = valid.view(dilated_steps, rate).repeat_interleave(
+            batch_size, dim=1
+        )  # [dilated_steps, rate*B]
+        dilated_inputs = self._prepare_inputs(padded_inputs, rate)
+
+        # Chain states [B, rate, n_hidden] <-> [1, rate*B, n_hidden] as in the dilated batch
+        if hidden is None:
+            hidden = torch.zeros(
+                1,
+                batch_size * rate,
+                cell.hidden_size,
+                dtype=inputs.dtype,
+                device=inputs.device,
+            )
+            if self.cell_type in ["LSTM", "ResLSTM"]:
+                hidden = (hidden, hidden)
+        elif isinstance(hidden, tuple):
+            hidden = tuple(
+                h.transpose(0, 1).reshape(1, batch_size * rate, -1) for h in hidden
+            )
+        else:
+            hidden = hidden.transpose(0, 1).reshape(1, batch_size * rate, -1)
+
+        # Run the fully valid dilated steps at once, and the padded ones masking the state update
+        full = valid.all(dim=1).tolist()
+        dilated_outputs = []
+        start = 0
+        while start < dilated_steps:
+            end = start + 1
+            while full[start] and end < dilated_steps and full[end]:
+                end += 1
+            outputs, new_hidden = cell(dilated_inputs[start:end], hidden)
+            if not full[start]:
+                keep = valid[start].view(-1, 1)
+                if isinstance(hidden, tuple):
+                    new_hidden = tuple(
+                        torch.where(keep, n, h) for n, h in zip(new_hidden, hidden)
+                    )
+                else:
+                    new_hidden = torch.where(keep, new_hidden, hidden)
+            hidden = new_hidden
+            dilated_outputs.append(outputs)
+            start = end
+
+        outputs = self._split_outputs(torch.cat(dilated_outputs), rate)[
+            offset : offset + n_steps
+        ]
+        if isinstance(hidden, tuple):
+            hidden = tuple(
+                h.reshape(rate, batch_size, -1).transpose(0, 1) for h in hidden
+            )
+        else:
+            hidden = hidden.reshape(rate, batch_size, -1).transpose(0, 1)
+        return outputs, hidden
+
     def drnn_layer(self, cell, inputs, rate, hidden=None):
         n_steps = len(inputs)
         batch_size = inputs[0].size(0)
@@ -315,6 +409,8 @@ class DilatedRNN(BaseRecurrent):
     `random_seed`: int=1, random_seed for pytorch initializer and numpy generators.<br>
     `num_workers_loader`: int=os.cpu_count(), workers to be used by `TimeSeriesDataLoader`.<br>
     `drop_last_loader`: bool=False, if True `TimeSeriesDataLoader` drops last non-full batch.<br>
+    `packed_sequences`: bool=False, if True every serie is unrolled only from its first available observation, skipping the batch padding.<br>
+    `carry_state`: bool=False, if True training walks every serie in consecutive `input_size` chunks carrying the detached encoder state, truncated backpropagation through time with an optimizer step per chunk.<br>
     `alias`: str, optional,  Custom name of the model.<br>
     `**trainer_kwargs`: int,  keyword trainer arguments inherited from [PyTorch Lighning's trainer](https://pytorch-lightning.readthedocs.io/en/stable/api/pytorch_lightning.trainer.trainer.Trainer.html?highlight=trainer).<br>
     """
@@ -350,8 +446,21 @@ class DilatedRNN(BaseRecurrent):
         random_seed: int = 1,
         num_workers_loader: int = 0,
         drop_last_loader: bool = False,
+        packed_sequences: bool = False,
+        carry_state: bool = False,
         **trainer_kwargs
     ):
+        # carry_state continues the encoder state of the previous chunk in every training step
+        if carry_state and packed_sequences:
+            raise Exception(
+                "DilatedRNN does not support carry_state with packed_sequences, "
+                "the dilated chains of packed series are not aligned."
+            )
+        if carry_state and cell_type == "AttentiveLSTM":
+            raise Exception(
+                "DilatedRNN does not support carry_state with the AttentiveLSTM cell, "
+                "it attends over whole dilated sequences."
+            )
         super(DilatedRNN, self).__init__(
             h=h,
             input_size=input_size,
@@ -371,6 +480,8 @@ class DilatedRNN(BaseRecurrent):
             stat_exog_list=stat_exog_list,
             num_workers_loader=num_workers_loader,
             drop_last_loader=drop_last_loader,
+            packed_sequences=packed_sequences,
+            carry_state=carry_state,
             random_seed=random_seed,
             **trainer_kwargs
         )
@@ -451,17 +562,52 @@ class DilatedRNN(BaseRecurrent):
             )  # [B, S] -> [B, seq_len, S]
             encoder_input = torch.cat((encoder_input, stat_exog), dim=2)
 
-        # DilatedRNN forward
+        # DilatedRNN forward, stateful inference continues the dilated chains of every layer
+        # from their states after the `n_steps` previous steps
+        stateful = "encoder_state" in windows_batch
+        if stateful and self.packed_sequences:
+            raise Exception(
+                "DilatedRNN can not continue an encoder state with packed_sequences, "
+                "the dilated chains of packed series are not aligned."
+            )
+        encoder_state = windows_batch.get("encoder_state", None)
+        if stateful and encoder_state is None:
+            n_steps = torch.zeros(
+                batch_size, dtype=torch.long, device=encoder_input.device
+            )
+            encoder_state = (n_steps,) + (None,) * len(self.rnn_stack)
+        # Packed sequences move every serie to the front, as the dilated chains are causal
+        # the padding moved to the back does not reach the outputs of its observations
+        if self.packed_sequences:
+            n_pad = self._padding_steps(windows_batch["insample_mask"])
+            encoder_input = self._roll_steps(encoder_input, n_pad)
+        layer_states = []
         for layer_num in range(len(self.rnn_stack)):
             residual = encoder_input
-            output, _ = self.rnn_stack[layer_num](encoder_input)
+            if stateful:
+                output, layer_state = self.rnn_stack[layer_num].stateful_forward(
+                    encoder_input,
+                    hidden=encoder_state[1 + layer_num],
+                    n_seen=int(encoder_state[0][0]),
+                )
+                layer_states.append(layer_state)
+            else:
+                output, _ = self.rnn_stack[layer_num](encoder_input)
             if layer_num > 0:
                 output += residual
             encoder_input = output
+        if self.packed_sequences:
+            encoder_input = self._roll_steps(encoder_input, -n_pad)
+        if stateful:
+            windows_batch["encoder_state"] = (encoder_state[0] + seq_len, *layer_states)
+
+        # Only decode the last `n_decode` positions, the ones that predictions return
+        seq_len = min(seq_len, windows_batch.get("n_decode", seq_len))
+        encoder_input = encoder_input[:, -seq_len:]
 
         if self.futr_exog_size > 0:
             futr_exog = futr_exog.permute(0, 2, 3, 1)[
-                :, :, 1:, :
+                :, -seq_len:, 1:, :
             ]  # [B, F, seq_len, 1+H] -> [B, seq_len, H, F]
             encoder_input = torch.cat(
                 (encoder_input, futr_exog.reshape(batch_size, seq_len, -1)), dim=2
@@ -287,4 +287,15 @@ class HINT:
         **Parameters:**<br>
         `path`: str, path to save the model.<br>
         """
-        self.model.trainer.save_checkpoint(path)
+        self.model.save(path)
+
+    def quantize(self, dtype="int8"):
+        """HINT.quantize
+
+        Post-training dynamic quantization of the HINT base model for CPU inference.
+
+        **Parameters:**<br>
+        `dtype`: str='int8', dtype of the quantized weights, 'int8' or 'float16'.<br>
+        """
+        self.model.quantize(dtype=dtype)
+        return self
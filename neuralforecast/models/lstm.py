@@ -50,6 +50,8 @@ class LSTM(BaseRecurrent):
     `random_seed`: int=1, random_seed for pytorch initializer and numpy generators.<br>
     `num_workers_loader`: int=os.cpu_count(), workers to be used by `TimeSeriesDataLoader`.<br>
     `drop_last_loader`: bool=False, if True `TimeSeriesDataLoader` drops last non-full batch.<br>
+    `packed_sequences`: bool=False, if True every serie is unrolled only from its first available observation, skipping the batch padding.<br>
+    `carry_state`: bool=False, if True training walks every serie in consecutive `input_size` chunks carrying the detached encoder state, truncated backpropagation through time with an optimizer step per chunk.<br>
     `alias`: str, optional,  Custom name of the model.<br>
     `**trainer_kwargs`: int,  keyword trainer arguments inherited from [PyTorch Lighning's trainer](https://pytorch-lightning.readthedocs.io/en/stable/api/pytorch_lightning.trainer.trainer.Trainer.html?highlight=trainer).<br>
     """
@@ -85,6 +87,8 @@ class LSTM(BaseRecurrent):
         random_seed=1,
         num_workers_loader=0,
         drop_last_loader=False,
+        packed_sequences=False,
+        carry_state=False,
         **trainer_kwargs
     ):
         super(LSTM, self).__init__(
@@ -106,6 +110,8 @@ class LSTM(BaseRecurrent):
             stat_exog_list=stat_exog_list,
             num_workers_loader=num_workers_loader,
             drop_last_loader=drop_last_loader,
+            packed_sequences=packed_sequences,
+            carry_state=carry_state,
             random_seed=random_seed,
             **trainer_kwargs
         )
@@ -180,13 +186,34 @@ class LSTM(BaseRecurrent):
             encoder_input = torch.cat((encoder_input, stat_exog), dim=2)
 
         # RNN forward
-        hidden_state, _ = self.hist_encoder(
-            encoder_input
-        )  # [B, seq_len, rnn_hidden_state]
+        if "encoder_state" in windows_batch:
+            # Stateful inference continues from the hidden and cell states of the last step [B, n_layers, rnn_hidden_state]
+            encoder_state = windows_batch["encoder_state"]
+            if encoder_state is not None:
+                encoder_state = tuple(
+                    state.transpose(0, 1).contiguous() for state in encoder_state
+                )
+            hidden_state, encoder_state = self._encoder_forward(
+                self.hist_encoder,
+                encoder_input,
+                windows_batch["insample_mask"],
+                encoder_state,
+            )
+            windows_batch["encoder_state"] = tuple(
+                state.transpose(0, 1) for state in encoder_state
+            )
+        else:
+            hidden_state, _ = self._encoder_forward(
+                self.hist_encoder, encoder_input, windows_batch["insample_mask"]
+            )  # [B, seq_len, rnn_hidden_state]
+
+        # Only decode the last `n_decode` positions, the ones that predictions return
+        seq_len = min(seq_len, windows_batch.get("n_decode", seq_len))
+        hidden_state = hidden_state[:, -seq_len:]
 
         if self.futr_exog_size > 0:
             futr_exog = futr_exog.permute(0, 2, 3, 1)[
-                :, :, 1:, :
+                :, -seq_len:, 1:, :
             ]  # [B, F, seq_len, 1+H] -> [B, seq_len, H, F]
             hidden_state = torch.cat(
                 (hidden_state, futr_exog.reshape(batch_size, seq_len, -1)), dim=2
@@ -111,10 +111,31 @@ class StockBlockLayer(nn.Module):
         )
         return iffted
 
+    def cheb_graph_conv(self, laplacian, input):
+        """
+        Apply the multi order Chebyshev polynomials of a sparse laplacian to the input,
+        with the recursion T_k(L) x = 2 L T_{k-1}(L) x - T_{k-2}(L) x.
+        :param laplacian: the sparse graph laplacian, [N, N].
+        :param input: the input, [batch, 1, input_channel, N, time_step].
+        :return: the graph convolution, [batch, K, input_channel, N, time_step].
+        """
+        batch_size, _, input_channel, node_cnt, time_step = input.size()
+        input = input.permute(3, 0, 1, 2, 4).reshape(node_cnt, -1)
+        first = torch.zeros_like(input)
+        second = torch.sparse.mm(laplacian, input)
+        third = 2 * torch.sparse.mm(laplacian, second) - first
+        forth = 2 * torch.sparse.mm(laplacian, third) - second
+        gfted = torch.stack([first, second, third, forth], dim=0)
+        gfted = gfted.reshape(-1, node_cnt, batch_size, input_channel, time_step)
+        return gfted.permute(2, 0, 3, 1, 4).contiguous()
+
     def forward(self, x, mul_L):
-        mul_L = mul_L.unsqueeze(1)
         x = x.unsqueeze(1)
-        gfted = torch.matmul(mul_L, x)
+        if mul_L.is_sparse:
+            # Sparse latent graph, the polynomials are applied to x instead of materialized
+            gfted = self.cheb_graph_conv(mul_L, x)
+        else:
+            gfted = torch.matmul(mul_L.unsqueeze(1), x)
         gconv_input = self.spe_seq_cell(gfted).unsqueeze(2)
         igfted = torch.matmul(gconv_input, self.weight)
         igfted = torch.sum(igfted, dim=1)
@@ -139,7 +160,7 @@ class StemGNN(BaseMultivariate):
     **Parameters:**<br>
     `h`: int, Forecast horizon. <br>
     `input_size`: int, autorregresive inputs size, y=[1,2,3,4] input_size=2 -> y_[t-2:t]=[1,2].<br>
-    `n_series`: int, number of time-series.<br>
+    `n_series`: int, number of time-series, panels with more series are trained and predicted in shards of `n_series` series.<br>
     `stat_exog_list`: str list, static exogenous columns.<br>
     `hist_exog_list`: str list, historic exogenous columns.<br>
     `futr_exog_list`: str list, future exogenous columns.<br>
@@ -147,6 +168,7 @@ class StemGNN(BaseMultivariate):
     `multi_layer`: int=5, multiplier for FC hidden size on StemGNN blocks.<br>
     `dropout_rate`: float=0.5, dropout rate.<br>
     `leaky_rate`: float=0.2, alpha for LeakyReLU layer on Latent Correlation layer.<br>
+    `graph_top_k`: int=None, if set the Latent Correlation layer keeps only the `graph_top_k` strongest neighbors of every serie and the graph convolutions use sparse matmuls, None keeps the dense graph.<br>
     `loss`: PyTorch module, instantiated train loss class from [losses collection](https://nixtla.github.io/neuralforecast/losses.pytorch.html).<br>
     `valid_loss`: PyTorch module=`loss`, instantiated valid loss class from [losses collection](https://nixtla.github.io/neuralforecast/losses.pytorch.html).<br>
     `max_steps`: int=1000, maximum number of training steps.<br>
@@ -155,11 +177,13 @@ class StemGNN(BaseMultivariate):
     `early_stop_patience_steps`: int=-1, Number of validation iterations before early stopping.<br>
     `val_check_steps`: int=100, Number of training steps between every validation loss check.<br>
     `batch_size`: int, number of windows in each batch.<br>
+    `inference_windows_batch_size`: int=None, number of windows in each inference batch, None uses `batch_size` and -1 uses all.<br>
     `step_size`: int=1, step size between each window of temporal data.<br>
     `scaler_type`: str='robust', type of scaler for temporal inputs normalization see [temporal scalers](https://nixtla.github.io/neuralforecast/common.scalers.html).<br>
     `random_seed`: int, random_seed for pytorch initializer and numpy generators.<br>
     `num_workers_loader`: int=os.cpu_count(), workers to be used by `TimeSeriesDataLoader`.<br>
     `drop_last_loader`: bool=False, if True `TimeSeriesDataLoader` drops last non-full batch.<br>
+    `shard_sampling`: str='clustered', sampling of the training shards on panels with more than `n_series` series, see `TimeSeriesShardSampler`. The GRU and attention weights of StemGNN are tied to the position of every serie in its shard: 'ordered' and 'clustered' keep every serie in the same position, 'random' moves the series across positions every epoch, which shares the weights between the series of the panel but drops their per-serie specialization.<br>
     `alias`: str, optional,  Custom name of the model.<br>
     `**trainer_kwargs`: int,  keyword trainer arguments inherited from [PyTorch Lighning's trainer](https://pytorch-lightning.readthedocs.io/en/stable/api/pytorch_lightning.trainer.trainer.Trainer.html?highlight=trainer).<br>
     """
@@ -179,6 +203,7 @@ class StemGNN(BaseMultivariate):
         multi_layer: int = 5,
         dropout_rate: float = 0.5,
         leaky_rate: float = 0.2,
+        graph_top_k=None,
         loss=MAE(),
         valid_loss=None,
         max_steps: int = 1000,
@@ -187,11 +212,13 @@ class StemGNN(BaseMultivariate):
         early_stop_patience_steps: int = -1,
         val_check_steps: int = 100,
         batch_size: int = 32,
+        inference_windows_batch_size=None,
         step_size: int = 1,
         scaler_type: str = "robust",
         random_seed: int = 1,
         num_workers_loader=0,
         drop_last_loader=False,
+        shard_sampling: str = "clustered",
         **trainer_kwargs
     ):
         # Inherit BaseMultivariate class
@@ -210,10 +237,12 @@ class StemGNN(BaseMultivariate):
             early_stop_patience_steps=early_stop_patience_steps,
             val_check_steps=val_check_steps,
             batch_size=batch_size,
+            inference_windows_batch_size=inference_windows_batch_size,
             step_size=step_size,
             scaler_type=scaler_type,
             num_workers_loader=num_workers_loader,
             drop_last_loader=drop_last_loader,
+            shard_sampling=shard_sampling,
             random_seed=random_seed,
             **trainer_kwargs
         )
@@ -226,6 +255,7 @@ class StemGNN(BaseMultivariate):
         self.unit = n_series
         self.stack_cnt = n_stacks
         self.alpha = leaky_rate
+        self.graph_top_k = graph_top_k
         self.time_step = input_size
         self.horizon = h
         self.h = h
@@ -296,6 +326,8 @@ class StemGNN(BaseMultivariate):
     def latent_correlation_layer(self, x):
         input, _ = self.GRU(x.permute(2, 0, 1).contiguous())
         input = input.permute(1, 0, 2).contiguous()
+        if self.graph_top_k is not None:
+            return self.sparse_latent_correlation_layer(input)
         attention = self.self_graph_attention(input)
         attention = torch.mean(attention, dim=0)
         degree = torch.sum(attention, dim=1)
@@ -309,6 +341,68 @@ class StemGNN(BaseMultivariate):
         mul_L = self.cheb_polynomial(laplacian)
         return mul_L, attention
 
+    def sparse_latent_correlation_layer(self, input):
+        """
+        Latent correlation layer that keeps the `graph_top_k` largest attention weights of every node.
+        :param input: the GRU encoding of the series, [batch, N, N].
+        :return: the sparse graph laplacian and attention, [N, N].
+        """
+        input = input.permute(0, 2, 1).contiguous()
+        key = torch.matmul(input, self.weight_key)
+        query = torch.matmul(input, self.weight_query)
+        values, cols = self.sparse_graph_attention(key, query)
+        return self.sparse_laplacian(values, cols)
+
+    def sparse_laplacian(self, values, cols):
+        """
+        Normalized laplacian of the top-k graph, symmetrized as the dense one.
+        :param values: the top-k attention weights of every node, [N, k].
+        :param cols: the columns of the top-k attention weights, [N, k].
+        :return: the sparse graph laplacian and attention, [N, N].
+        """
+        N, k = cols.size()
+        # degree of the top-k graph before the symmetrization, as in the dense layer
+        degree = torch.sum(values, dim=1)
+        degree_hat = 1 / (torch.sqrt(degree) + 1e-7)
+        nodes = torch.arange(N, device=cols.device)
+        rows = nodes.repeat_interleave(k)
+        cols, values = cols.flatten(), values.flatten()
+        edges = torch.cat([torch.stack([rows, cols]), torch.stack([cols, rows])], dim=1)
+        attention = torch.sparse_coo_tensor(
+            edges, 0.5 * torch.cat([values, values]), size=(N, N)
+        ).coalesce()
+        # D^-1/2 (D - 0.5 (A + A^T)) D^-1/2
+        norm_values = -0.5 * values * degree_hat[rows] * degree_hat[cols]
+        laplacian = torch.sparse_coo_tensor(
+            torch.cat([edges, torch.stack([nodes, nodes])], dim=1),
+            torch.cat([norm_values, norm_values, degree * degree_hat**2]),
+            size=(N, N),
+        ).coalesce()
+        return laplacian, attention
+
+    def sparse_graph_attention(self, key, query):
+        """
+        Top-k attention of every node, the rows of the [N, N] attention are scored in chunks.
+        :param key: the attention keys, [batch, N, 1].
+        :param query: the attention queries, [batch, N, 1].
+        :return: the top-k attention weights and their columns, [N, k].
+        """
+        bat, N, _ = key.size()
+        query = query.permute(0, 2, 1)
+        k = min(self.graph_top_k, N)
+        # About 2**24 attention scores per chunk
+        chunk_size = max(1, 2**24 // (bat * N))
+        values, cols = [], []
+        for start in range(0, N, chunk_size):
+            data = self.leakyrelu(key[:, start : start + chunk_size] + query)
+            attention = self.dropout(F.softmax(data, dim=2))
+            chunk_values, chunk_cols = torch.topk(
+                torch.mean(attention, dim=0), k=k, dim=1
+            )
+            values.append(chunk_values)
+            cols.append(chunk_cols)
+        return torch.cat(values), torch.cat(cols)
+
     def self_graph_attention(self, input):
         input = input.permute(0, 2, 1).contiguous()
         bat, N, fea = input.size()
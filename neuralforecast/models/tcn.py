@@ -46,6 +46,7 @@ class TCN(BaseRecurrent):
     `random_seed`: int=1, random_seed for pytorch initializer and numpy generators.<br>
     `num_workers_loader`: int=os.cpu_count(), workers to be used by `TimeSeriesDataLoader`.<br>
     `drop_last_loader`: bool=False, if True `TimeSeriesDataLoader` drops last non-full batch.<br>
+    `carry_state`: bool=False, if True training walks every serie in consecutive `input_size` chunks carrying the detached encoder state, truncated backpropagation through time with an optimizer step per chunk.<br>
     `alias`: str, optional,  Custom name of the model.<br>
     `**trainer_kwargs`: int,  keyword trainer arguments inherited from [PyTorch Lighning's trainer](https://pytorch-lightning.readthedocs.io/en/stable/api/pytorch_lightning.trainer.trainer.Trainer.html?highlight=trainer).<br>
     """
@@ -81,6 +82,7 @@ class TCN(BaseRecurrent):
         random_seed: int = 1,
         num_workers_loader=0,
         drop_last_loader=False,
+        carry_state=False,
         **trainer_kwargs
     ):
         super(TCN, self).__init__(
@@ -102,6 +104,7 @@ class TCN(BaseRecurrent):
             stat_exog_list=stat_exog_list,
             num_workers_loader=num_workers_loader,
             drop_last_loader=drop_last_loader,
+            carry_state=carry_state,
             random_seed=random_seed,
             **trainer_kwargs
         )
@@ -177,13 +180,26 @@ class TCN(BaseRecurrent):
             encoder_input = torch.cat((encoder_input, stat_exog), dim=2)
 
         # TCN forward
-        hidden_state = self.hist_encoder(
-            encoder_input
-        )  # [B, seq_len, tcn_hidden_state]
+        if "encoder_state" in windows_batch:
+            # Stateful inference continues from the receptive field buffers of every convolution
+            (
+                hidden_state,
+                windows_batch["encoder_state"],
+            ) = self.hist_encoder.stateful_forward(
+                encoder_input, windows_batch["encoder_state"]
+            )
+        else:
+            hidden_state = self.hist_encoder(
+                encoder_input
+            )  # [B, seq_len, tcn_hidden_state]
+
+        # Only decode the last `n_decode` positions, the ones that predictions return
+        seq_len = min(seq_len, windows_batch.get("n_decode", seq_len))
+        hidden_state = hidden_state[:, -seq_len:]
 
         if self.futr_exog_size > 0:
             futr_exog = futr_exog.permute(0, 2, 3, 1)[
-                :, :, 1:, :
+                :, -seq_len:, 1:, :
             ]  # [B, F, seq_len, 1+H] -> [B, seq_len, H, F]
             hidden_state = torch.cat(
                 (hidden_state, futr_exog.reshape(batch_size, seq_len, -1)), dim=2
@@ -0,0 +1,340 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/serving.ipynb.
+
+# %% auto 0
+__all__ = ['ForecastServer']
+
+# %% ../nbs/serving.ipynb 3
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Deque, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .core import NeuralForecast
+
+# %% ../nbs/serving.ipynb 5
+class ForecastServer:
+    """Forecast Server
+
+    Serves a fitted `NeuralForecast` over a local asyncio HTTP interface. The models
+    are loaded once, and the forecast requests that arrive within `max_wait_ms` of each
+    other are coalesced into a single `NeuralForecast.predict` call. Every batch still goes
+    through the pandas path of `NeuralForecast.predict`: the requests' frames are concatenated
+    and sorted into a `TimeSeriesDataset`, and the forecasts are built as a DataFrame. Only the
+    Lightning `Trainer` is skipped, so that pandas work remains part of every request's latency.
+
+    Endpoints:<br>
+    `POST /predict`: JSON body with `df` records [`unique_id`, `ds`, `y`, ...], and optional
+    `futr_df` and `static_df` records. Returns the forecasts' records under `forecasts`.<br>
+    `GET /stats`: number of requests and batches, and p50/p99 request latency in milliseconds.<br>
+    `GET /health`: liveness check.<br>
+
+    **Parameters:**<br>
+    `nf`: `NeuralForecast` or str, fitted object or directory saved with `NeuralForecast.save`.<br>
+    `host`: str='127.0.0.1', interface to listen on.<br>
+    `port`: int=0, port to listen on, 0 picks a free port (see `ForecastServer.port`).<br>
+    `max_batch_size`: int=64, maximum number of requests coalesced into one prediction.<br>
+    `max_wait_ms`: float=5.0, latency budget that the first request of a batch waits for others.<br>
+    `latency_window`: int=10_000, number of most recent request latencies kept for the statistics.<br>
+    `**predict_kwargs`: additional arguments for `NeuralForecast.predict`, by default `engine='torch'`.<br>
+    """
+
+    def __init__(
+        self,
+        nf: Union[NeuralForecast, str],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        latency_window: int = 10_000,
+        **predict_kwargs,
+    ):
+        fitted_nf: NeuralForecast = (
+            NeuralForecast.load(path=nf) if isinstance(nf, str) else nf
+        )
+        if not fitted_nf._fitted:
+            raise Exception("You must fit the model before serving it.")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer.")
+        self.nf = fitted_nf
+        self.host = host
+        self.port = port
+        # Multivariate models are fitted on a fixed number of series,
+        # their requests can not be stacked with each other
+        if any(
+            getattr(model, "SAMPLING_TYPE", None) == "multivariate"
+            for model in fitted_nf.models
+        ):
+            max_batch_size = 1
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1_000
+        self.predict_kwargs = {"engine": "torch", **predict_kwargs}
+        self.needed_futr_exog = set(
+            chain.from_iterable(
+                getattr(m, "futr_exog_list", []) for m in fitted_nf.models
+            )
+        )
+
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+        self.n_batches = 0
+        self._queue = None
+        self._server = None
+        self._batcher = None
+        # A single worker thread runs the predictions, out of the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def start(self):
+        """Start
+
+        Starts listening on `host`:`port` and coalescing the incoming requests.
+        """
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        """Stop
+
+        Closes the server and cancels the requests still waiting for a batch.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            future.cancel()
+
+    async def serve_forever(self):
+        """Serve forever
+
+        Starts the server if needed and serves requests until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def forecast(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Forecast
+
+        Queues a request for the next batch and waits for its forecasts.
+        This is the method behind `POST /predict`, and can be awaited in-process.
+
+        **Parameters:**<br>
+        `payload`: dict with `df` and optional `futr_df` and `static_df` lists of records.<br>
+
+        **Returns:**<br>
+        `forecasts`: list with the forecast records of the request's series.<br>
+        """
+        if self._queue is None:
+            raise Exception("You must start the server before forecasting.")
+        start = time.perf_counter()
+        dfs = self._parse_payload(payload)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((dfs, future, start))
+        forecasts = await future
+        self.latencies.append(time.perf_counter() - start)
+        return forecasts
+
+    def latency_stats(self) -> Dict[str, Optional[float]]:
+        """Latency statistics
+
+        **Returns:**<br>
+        `stats`: dict with the number of `requests` and `batches`, and the `p50_ms`
+        and `p99_ms` latency of the most recent requests, None before the first request.<br>
+        """
+        stats = {"requests": len(self.latencies), "batches": self.n_batches}
+        if len(self.latencies) == 0:
+            # NaN is not valid JSON, the /stats endpoint returns nulls
+            return {**stats, "p50_ms": None, "p99_ms": None}
+        p50, p99 = np.percentile(np.array(self.latencies) * 1_000, [50, 99])
+        return {**stats, "p50_ms": float(p50), "p99_ms": float(p99)}
+
+    def _parse_payload(self, payload):
+        if not isinstance(payload, dict) or "df" not in payload:
+            raise ValueError(
+                "The request must be a JSON object with a `df` list of records."
+            )
+        dfs = {}
+        for name in ["df", "futr_df", "static_df"]:
+            records = payload.get(name, None)
+            if records is None:
+                continue
+            df = pd.DataFrame(records)
+            required = ["unique_id"] if name == "static_df" else ["unique_id", "ds"]
+            if name == "df":
+                required.append("y")
+            missing = set(required) - set(df.columns)
+            if missing:
+                raise ValueError(f"`{name}` is missing the columns: {missing}")
+            if "ds" in df and isinstance(self.nf.freq, str):
+                df["ds"] = pd.to_datetime(df["ds"])
+            dfs[name] = df
+        if self.needed_futr_exog and "futr_df" not in dfs:
+            raise ValueError(
+                f"Models require the following future exogenous features: {self.needed_futr_exog}. "
+                "Please provide them through `futr_df`."
+            )
+        return dfs
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # The first request opens a batch that closes when it is full
+            # or when the latency budget of that request runs out
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                getter = asyncio.ensure_future(self._queue.get())
+                done, _ = await asyncio.wait({getter}, timeout=timeout)
+                if not done:
+                    getter.cancel()
+                    break
+                batch.append(getter.result())
+            batch = [item for item in batch if not item[1].done()]
+            if len(batch) == 0:
+                continue
+            self.n_batches += 1
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self._predict_requests, [dfs for dfs, _, _ in batch]
+                )
+            except asyncio.CancelledError:
+                for _, future, _ in batch:
+                    future.cancel()
+                raise
+            for (_, future, _), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _predict_requests(self, requests):
+        try:
+            return self._predict_batch(requests)
+        except Exception as batch_error:
+            if len(requests) == 1:
+                return [batch_error]
+        # A bad request fails its batch, retry one by one to isolate it
+        results = []
+        for dfs in requests:
+            try:
+                results.extend(self._predict_batch([dfs]))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _predict_batch(self, requests):
+        # The ids of each request are prefixed with its position in the batch,
+        # so that requests with the same series ids do not collide
+        stacked = {}
+        for name in ["df", "futr_df", "static_df"]:
+            dfs = [
+                dfs[name].assign(unique_id=f"{i}|" + dfs[name]["unique_id"].astype(str))
+                for i, dfs in enumerate(requests)
+                if name in dfs
+            ]
+            if len(dfs) > 0:
+                stacked[name] = pd.concat(dfs, ignore_index=True)
+        orig_ids = {
+            f"{i}|{uid}": (i, uid)
+            for i, dfs in enumerate(requests)
+            for uid in dfs["df"]["unique_id"].unique().tolist()
+        }
+
+        fcsts_df = self.nf.predict(
+            df=stacked["df"],
+            futr_df=stacked.get("futr_df", None),
+            static_df=stacked.get("static_df", None),
+            **self.predict_kwargs,
+        )
+        if "unique_id" not in fcsts_df.columns:
+            fcsts_df = fcsts_df.reset_index()
+        if isinstance(self.nf.freq, str):
+            fcsts_df["ds"] = fcsts_df["ds"].dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+        request_idxs, uids = zip(*fcsts_df["unique_id"].map(orig_ids))
+        fcsts_df["unique_id"] = list(uids)
+        fcsts_df["_request"] = request_idxs
+        results = [[] for _ in requests]
+        for i, request_fcsts in fcsts_df.groupby("_request", sort=False):
+            request_fcsts = request_fcsts.drop(columns="_request")
+            results[i] = request_fcsts.to_dict(orient="records")
+        return results
+
+    async def _handle(self, reader, writer):
+        # Minimal HTTP/1.1 with keep-alive connections
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, value = line.decode("latin-1").split(":", 1)
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, response = await self._route(method, path, body)
+                content = json.dumps(response).encode()
+                head = (
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n\r\n"
+                )
+                writer.write(head.encode("latin-1") + content)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        path = path.split("?", 1)[0]
+        if method == "GET" and path == "/health":
+            return "200 OK", {"status": "ok"}
+        if method == "GET" and path == "/stats":
+            return "200 OK", self.latency_stats()
+        if method != "POST" or path != "/predict":
+            return "404 Not Found", {"error": f"Unknown endpoint {method} {path}"}
+        try:
+            forecasts = await self.forecast(json.loads(body))
+        except (ValueError, KeyError) as e:
+            return "400 Bad Request", {"error": str(e)}
+        except Exception as e:
+            return "500 Internal Server Error", {"error": str(e)}
+        return "200 OK", {"forecasts": forecasts}
@@ -1,18 +1,21 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/tsdataset.ipynb.
 
 # %% auto 0
-__all__ = ['TimeSeriesLoader', 'TimeSeriesDataset', 'TimeSeriesDataModule']
+__all__ = ['TimeSeriesLoader', 'TimeSeriesDataset', 'TimeSeriesDeviceLoader', 'TimeSeriesShardSampler', 'TimeSeriesDataModule']
 
 # %% ../nbs/tsdataset.ipynb 4
+import os
+import pickle
 import warnings
 from collections.abc import Mapping
+from typing import Optional
 
 import numpy as np
 import pandas as pd
 import pytorch_lightning as pl
 import torch
 import utilsforecast.processing as ufp
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import Dataset, DataLoader, Sampler
 from utilsforecast.compat import DataFrame, pl_Series
 
 # %% ../nbs/tsdataset.ipynb 5
@@ -32,15 +35,30 @@ class TimeSeriesLoader(DataLoader):
     `shuffle`: (bool, optional): set to `True` to have the data reshuffled at every epoch (default: `False`).<br>
     `sampler`: (Sampler or Iterable, optional): defines the strategy to draw samples from the dataset.<br>
                 Can be any `Iterable` with `__len__` implemented. If specified, `shuffle` must not be specified.<br>
+    `ragged`: (bool, optional): yield batches in the CSR layout of the dataset (`temporal` [sum(n_i), C] and `indptr`) instead of padding every series to `max_size` (default: `False`).<br>
     """
 
-    def __init__(self, dataset, **kwargs):
+    def __init__(self, dataset, ragged=False, **kwargs):
         if "collate_fn" in kwargs:
             kwargs.pop("collate_fn")
-        kwargs_ = {**kwargs, **dict(collate_fn=self._collate_fn)}
-        DataLoader.__init__(self, dataset=dataset, **kwargs_)
+        self.ragged = ragged
+        if ragged:
+            # Iterate over series indices, the rows of the whole batch are gathered at once
+            self.ts_dataset = dataset
+            kwargs_ = {**kwargs, **dict(collate_fn=self._ragged_collate_fn)}
+            DataLoader.__init__(self, dataset=range(len(dataset)), **kwargs_)
+        else:
+            kwargs_ = {**kwargs, **dict(collate_fn=self._collate_fn)}
+            DataLoader.__init__(self, dataset=dataset, **kwargs_)
+
+    def _ragged_collate_fn(self, idxs):
+        return self.ts_dataset._get_ragged(np.asarray(idxs, dtype=np.int64))
 
     def _collate_fn(self, batch):
+        if isinstance(batch, Mapping):
+            # Batch already collated by `TimeSeriesDataset.__getitems__`
+            return batch
+
         elem = batch[0]
         elem_type = type(elem)
 
@@ -59,6 +77,9 @@ class TimeSeriesLoader(DataLoader):
                 return dict(
                     temporal=self.collate_fn([d["temporal"] for d in batch]),
                     temporal_cols=elem["temporal_cols"],
+                    available_cumsum=self.collate_fn(
+                        [d["available_cumsum"] for d in batch]
+                    ),
                 )
 
             return dict(
@@ -66,11 +87,22 @@ class TimeSeriesLoader(DataLoader):
                 static_cols=elem["static_cols"],
                 temporal=self.collate_fn([d["temporal"] for d in batch]),
                 temporal_cols=elem["temporal_cols"],
+                available_cumsum=self.collate_fn(
+                    [d["available_cumsum"] for d in batch]
+                ),
             )
 
         raise TypeError(f"Unknown {elem_type}")
 
 # %% ../nbs/tsdataset.ipynb 7
+def _ragged_arange(starts: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """Concatenation of the ranges `[starts[i], starts[i] + sizes[i])` without a Python loop."""
+    starts = np.asarray(starts, dtype=np.int64)
+    sizes = np.asarray(sizes, dtype=np.int64)
+    offsets = starts - np.append(0, sizes.cumsum()[:-1])
+    return np.arange(sizes.sum(), dtype=np.int64) + np.repeat(offsets, sizes)
+
+# %% ../nbs/tsdataset.ipynb 8
 class TimeSeriesDataset(Dataset):
     def __init__(
         self,
@@ -82,13 +114,15 @@ class TimeSeriesDataset(Dataset):
         static=None,
         static_cols=None,
         sorted=False,
+        available_cumsum=None,
     ):
         super().__init__()
-        self.temporal = torch.tensor(temporal, dtype=torch.float)
+        # as_tensor avoids copying float32 arrays, including memory-mapped ones
+        self.temporal = torch.as_tensor(temporal, dtype=torch.float)
         self.temporal_cols = pd.Index(list(temporal_cols))
 
         if static is not None:
-            self.static = torch.tensor(static, dtype=torch.float)
+            self.static = torch.as_tensor(static, dtype=torch.float)
             self.static_cols = static_cols
         else:
             self.static = static
@@ -99,10 +133,32 @@ class TimeSeriesDataset(Dataset):
         self.max_size = max_size
         self.min_size = min_size
 
+        # Number of available observations before each row of temporal [n_data + 1],
+        # window builders check availability with two lookups into it
+        if available_cumsum is None:
+            available_cumsum = TimeSeriesDataset._get_available_cumsum(
+                self.temporal, self.temporal_cols
+            )
+        self.available_cumsum = torch.as_tensor(available_cumsum)
+
         # Upadated flag. To protect consistency, dataset can only be updated once
         self.updated = False
         self.sorted = sorted
 
+        # Directory of the column files when the dataset is memory-mapped
+        self.mmap_path: Optional[str] = None
+
+    @staticmethod
+    def _get_available_cumsum(temporal, temporal_cols):
+        if "available_mask" in temporal_cols:
+            available = temporal[:, temporal_cols.get_loc("available_mask")] > 0
+        else:
+            available = torch.ones(len(temporal), dtype=torch.bool)
+        dtype = torch.int32 if len(temporal) < 2**31 else torch.int64
+        available_cumsum = torch.zeros(len(temporal) + 1, dtype=dtype)
+        torch.cumsum(available, dim=0, out=available_cumsum[1:])
+        return available_cumsum
+
     def __getitem__(self, idx):
         if isinstance(idx, int):
             # Parse temporal data and pad its left
@@ -112,6 +168,15 @@ class TimeSeriesDataset(Dataset):
             ts = self.temporal[self.indptr[idx] : self.indptr[idx + 1], :]
             temporal[: len(self.temporal_cols), -len(ts) :] = ts.permute(1, 0)
 
+            # Available observations before each step of the padded serie [max_size + 1]
+            available_cumsum = torch.zeros(
+                self.max_size + 1, dtype=self.available_cumsum.dtype
+            )
+            serie_cumsum = self.available_cumsum[
+                self.indptr[idx] : self.indptr[idx + 1] + 1
+            ]
+            available_cumsum[-len(serie_cumsum) :] = serie_cumsum - serie_cumsum[0]
+
             # Add static data if available
             static = None if self.static is None else self.static[idx, :]
 
@@ -120,11 +185,92 @@ class TimeSeriesDataset(Dataset):
                 temporal_cols=self.temporal_cols,
                 static=static,
                 static_cols=self.static_cols,
+                available_cumsum=available_cumsum,
             )
 
             return item
         raise ValueError(f"idx must be int, got {type(idx)}")
 
+    def __getitems__(self, idxs):
+        """Collated `__getitem__` of the series `idxs`, the `DataLoader` passes it whole batches of indices."""
+        idxs = np.asarray(idxs, dtype=np.int64)
+        starts = self.indptr[idxs]
+        sizes = self.indptr[idxs + 1] - starts
+        serie_idxs = np.repeat(np.arange(len(idxs)), sizes)
+
+        # Scatter the rows of every serie into a single left-padded [B, C, max_size] tensor,
+        # row `indptr[idx] + i` goes to the step `max_size - n_idx + i`
+        rows = _ragged_arange(starts, sizes)
+        steps = rows - np.repeat(starts - self.max_size + sizes, sizes)
+        temporal = torch.zeros(
+            size=(len(idxs), len(self.temporal_cols), self.max_size),
+            dtype=torch.float32,
+        )
+        temporal[
+            torch.from_numpy(serie_idxs), :, torch.from_numpy(steps)
+        ] = self.temporal[torch.from_numpy(rows)]
+
+        # Available observations before each step of the padded series [B, max_size + 1]
+        rows = _ragged_arange(starts, sizes + 1)
+        steps = rows - np.repeat(starts - self.max_size + sizes, sizes + 1)
+        serie_idxs = np.repeat(np.arange(len(idxs)), sizes + 1)
+        available_cumsum = torch.zeros(
+            size=(len(idxs), self.max_size + 1), dtype=self.available_cumsum.dtype
+        )
+        available_cumsum[
+            torch.from_numpy(serie_idxs), torch.from_numpy(steps)
+        ] = self.available_cumsum[torch.from_numpy(rows)] - self.available_cumsum[
+            torch.from_numpy(starts)
+        ].repeat_interleave(
+            torch.from_numpy(sizes + 1)
+        )
+
+        if self.static is None:
+            return dict(
+                temporal=temporal,
+                temporal_cols=self.temporal_cols,
+                available_cumsum=available_cumsum,
+            )
+
+        return dict(
+            static=self.static[torch.from_numpy(idxs)],
+            static_cols=self.static_cols,
+            temporal=temporal,
+            temporal_cols=self.temporal_cols,
+            available_cumsum=available_cumsum,
+        )
+
+    def _get_ragged(self, idxs):
+        """Unpadded data of the series `idxs`, `temporal` [sum(n_i), C] rows with their `indptr` [len(idxs)+1]."""
+        sizes = self.indptr[idxs + 1] - self.indptr[idxs]
+        rows = _ragged_arange(self.indptr[idxs], sizes)
+        # Available observations before each row of the batch [sum(n_i) + 1],
+        # shifting every serie's counts to the end of the previous one
+        serie_starts = self.available_cumsum[torch.from_numpy(self.indptr[idxs])]
+        serie_totals = (
+            self.available_cumsum[torch.from_numpy(self.indptr[idxs + 1])]
+            - serie_starts
+        )
+        offsets = serie_totals.cumsum(0) - serie_totals - serie_starts
+        available_cumsum = torch.cat(
+            [
+                self.available_cumsum.new_zeros(1),
+                self.available_cumsum[torch.from_numpy(rows + 1)]
+                + torch.repeat_interleave(offsets, torch.from_numpy(sizes)),
+            ]
+        )
+        batch = dict(
+            temporal=self.temporal[torch.from_numpy(rows)],
+            indptr=torch.from_numpy(np.append(0, sizes.cumsum()).astype(np.int64)),
+            max_size=self.max_size,
+            temporal_cols=self.temporal_cols,
+            available_cumsum=available_cumsum,
+        )
+        if self.static is not None:
+            batch["static"] = self.static[torch.from_numpy(idxs)]
+            batch["static_cols"] = self.static_cols
+        return batch
+
     def __len__(self):
         return self.n_groups
 
@@ -138,6 +284,112 @@ class TimeSeriesDataset(Dataset):
             self.indptr, other.indptr
         )
 
+    def __getstate__(self):
+        # Memory-mapped datasets are pickled as a reference to their files,
+        # so workers and child processes map them instead of copying the data.
+        state = self.__dict__.copy()
+        if self.mmap_path is not None:
+            for attr in ("temporal", "indptr", "static", "available_cumsum"):
+                state.pop(attr)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.mmap_path is not None:
+            arrays = TimeSeriesDataset._load_arrays(self.mmap_path, mmap=True)
+            self.temporal = torch.as_tensor(arrays["temporal"], dtype=torch.float)
+            self.indptr = arrays["indptr"]
+            self.static = arrays["static"]
+            if self.static is not None:
+                self.static = torch.as_tensor(self.static, dtype=torch.float)
+            self.available_cumsum = arrays["available_cumsum"]
+            if self.available_cumsum is None:
+                self.available_cumsum = TimeSeriesDataset._get_available_cumsum(
+                    self.temporal, self.temporal_cols
+                )
+            self.available_cumsum = torch.as_tensor(self.available_cumsum)
+
+    def save(self, path: str) -> None:
+        """Save the dataset as `.npy` column files.
+
+        `temporal`, `indptr`, `static` and the `available_cumsum` index
+        are stored in separate files that `TimeSeriesDataset.load` can memory-map.
+
+        **Parameters:**<br>
+        `path`: str, directory where the files are written.<br>
+        """
+        os.makedirs(path, exist_ok=True)
+        if self.mmap_path is not None and os.path.samefile(path, self.mmap_path):
+            # Rewriting the files that back the mapping would corrupt it
+            warnings.warn(
+                f"The dataset is memory-mapped from {path}, its files are kept as they are. "
+                "In-place changes to the mapped arrays are not saved."
+            )
+            return
+        np.save(f"{path}/temporal.npy", self.temporal.numpy())
+        np.save(f"{path}/indptr.npy", np.asarray(self.indptr))
+        if self.static is not None:
+            np.save(f"{path}/static.npy", self.static.numpy())
+        elif os.path.exists(f"{path}/static.npy"):
+            # A stale file would be loaded as the static data of this dataset
+            os.remove(f"{path}/static.npy")
+        np.save(f"{path}/available_cumsum.npy", self.available_cumsum.numpy())
+        metadata = {
+            "temporal_cols": self.temporal_cols,
+            "static_cols": self.static_cols,
+            "max_size": self.max_size,
+            "min_size": self.min_size,
+            "sorted": self.sorted,
+        }
+        with open(f"{path}/metadata.pkl", "wb") as f:
+            pickle.dump(metadata, f)
+
+    @staticmethod
+    def _load_arrays(path, mmap):
+        # Copy-on-write mapping, in-place changes never reach the files
+        mmap_mode = "c" if mmap else None
+        arrays = {
+            "temporal": np.load(f"{path}/temporal.npy", mmap_mode=mmap_mode),
+            "indptr": np.load(f"{path}/indptr.npy", mmap_mode=mmap_mode),
+            "static": None,
+            "available_cumsum": None,
+        }
+        if os.path.exists(f"{path}/static.npy"):
+            arrays["static"] = np.load(f"{path}/static.npy", mmap_mode=mmap_mode)
+        # Directories saved before the availability index was stored recompute it
+        if os.path.exists(f"{path}/available_cumsum.npy"):
+            arrays["available_cumsum"] = np.load(
+                f"{path}/available_cumsum.npy", mmap_mode=mmap_mode
+            )
+        return arrays
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> "TimeSeriesDataset":
+        """Load a dataset stored with `TimeSeriesDataset.save`.
+
+        **Parameters:**<br>
+        `path`: str, directory with the dataset files.<br>
+        `mmap`: bool=True, memory-map the files instead of reading them into memory.
+        Series are then read from disk as the loaders request them.<br>
+        """
+        with open(f"{path}/metadata.pkl", "rb") as f:
+            metadata = pickle.load(f)
+        arrays = TimeSeriesDataset._load_arrays(path, mmap=mmap)
+        dataset = TimeSeriesDataset(
+            temporal=arrays["temporal"],
+            temporal_cols=metadata["temporal_cols"],
+            indptr=arrays["indptr"],
+            max_size=metadata["max_size"],
+            min_size=metadata["min_size"],
+            static=arrays["static"],
+            static_cols=metadata["static_cols"],
+            sorted=metadata["sorted"],
+            available_cumsum=arrays["available_cumsum"],
+        )
+        if mmap:
+            dataset.mmap_path = os.path.abspath(path)
+        return dataset
+
     def align(self, df: DataFrame) -> "TimeSeriesDataset":
         # Protect consistency
         df = ufp.copy_if_pandas(df, deep=False)
@@ -167,20 +419,17 @@ class TimeSeriesDataset(Dataset):
         len_temporal, col_temporal = self.temporal.shape
         len_futr = futr_dataset.temporal.shape[0]
         new_temporal = torch.empty(size=(len_temporal + len_futr, col_temporal))
-        new_sizes = np.diff(self.indptr) + np.diff(futr_dataset.indptr)
+        curr_sizes = np.diff(self.indptr)
+        futr_sizes = np.diff(futr_dataset.indptr)
+        new_sizes = curr_sizes + futr_sizes
         new_indptr = np.append(0, new_sizes.cumsum()).astype(np.int32)
         new_max_size = np.max(new_sizes)
 
-        for i in range(self.n_groups):
-            curr_slice = slice(self.indptr[i], self.indptr[i + 1])
-            curr_size = curr_slice.stop - curr_slice.start
-            futr_slice = slice(futr_dataset.indptr[i], futr_dataset.indptr[i + 1])
-            new_temporal[new_indptr[i] : new_indptr[i] + curr_size] = self.temporal[
-                curr_slice
-            ]
-            new_temporal[
-                new_indptr[i] + curr_size : new_indptr[i + 1]
-            ] = futr_dataset.temporal[futr_slice]
+        # Scatter both datasets into their new positions in a single pass each
+        curr_idxs = _ragged_arange(new_indptr[:-1], curr_sizes)
+        futr_idxs = _ragged_arange(new_indptr[:-1] + curr_sizes, futr_sizes)
+        new_temporal[torch.from_numpy(curr_idxs)] = self.temporal
+        new_temporal[torch.from_numpy(futr_idxs)] = futr_dataset.temporal
 
         # Define new dataset
         updated_dataset = TimeSeriesDataset(
@@ -201,6 +450,58 @@ class TimeSeriesDataset(Dataset):
         futr_dataset = dataset.align(futr_df)
         return dataset.append(futr_dataset)
 
+    @staticmethod
+    def tail_dataset(dataset, size: int):
+        """
+        Keep only the last `size` temporal observations of every series.
+        Prediction only uses the latest windows, so this avoids loading full histories.
+        """
+        if dataset.max_size <= size:
+            return dataset
+
+        new_sizes = np.minimum(np.diff(dataset.indptr), size)
+        keep_idxs = _ragged_arange(dataset.indptr[1:] - new_sizes, new_sizes)
+        new_temporal = dataset.temporal[torch.from_numpy(keep_idxs)]
+        new_indptr = np.append(0, new_sizes.cumsum()).astype(np.int32)
+
+        # Define new dataset
+        updated_dataset = TimeSeriesDataset(
+            temporal=new_temporal,
+            temporal_cols=dataset.temporal_cols.copy(),
+            indptr=new_indptr,
+            max_size=new_sizes.max(),
+            min_size=new_sizes.min(),
+            static=dataset.static,
+            static_cols=dataset.static_cols,
+            sorted=dataset.sorted,
+        )
+        return updated_dataset
+
+    @staticmethod
+    def project_dataset(dataset, temporal_cols):
+        """
+        Keep only the temporal columns in `temporal_cols`, in the dataset's column order.
+        Models window their batches after it, so unused exogenous columns are never copied.
+        Memory-mapped datasets are returned as they are, to keep reading series lazily.
+        """
+        keep = dataset.temporal_cols.isin(temporal_cols)
+        if keep.all() or dataset.mmap_path is not None:
+            return dataset
+
+        # Define new dataset
+        updated_dataset = TimeSeriesDataset(
+            temporal=dataset.temporal[:, torch.from_numpy(np.flatnonzero(keep))],
+            temporal_cols=dataset.temporal_cols[keep],
+            indptr=dataset.indptr,
+            max_size=dataset.max_size,
+            min_size=dataset.min_size,
+            static=dataset.static,
+            static_cols=dataset.static_cols,
+            sorted=dataset.sorted,
+            available_cumsum=dataset.available_cumsum,
+        )
+        return updated_dataset
+
     @staticmethod
     def trim_dataset(dataset, left_trim: int = 0, right_trim: int = 0):
         """
@@ -214,20 +515,11 @@ class TimeSeriesDataset(Dataset):
             )
 
         # Define and fill new temporal with trimmed information
-        len_temporal, col_temporal = dataset.temporal.shape
-        total_trim = (left_trim + right_trim) * dataset.n_groups
-        new_temporal = torch.zeros(size=(len_temporal - total_trim, col_temporal))
-        new_indptr = [0]
-
-        acum = 0
-        for i in range(dataset.n_groups):
-            series_length = dataset.indptr[i + 1] - dataset.indptr[i]
-            new_length = series_length - left_trim - right_trim
-            new_temporal[acum : (acum + new_length), :] = dataset.temporal[
-                dataset.indptr[i] + left_trim : dataset.indptr[i + 1] - right_trim, :
-            ]
-            acum += new_length
-            new_indptr.append(acum)
+        # gathering the kept rows of all series at once
+        new_sizes = np.diff(dataset.indptr) - left_trim - right_trim
+        new_indptr = np.append(0, new_sizes.cumsum())
+        keep_idxs = _ragged_arange(dataset.indptr[:-1] + left_trim, new_sizes)
+        new_temporal = dataset.temporal[torch.from_numpy(keep_idxs)]
 
         new_max_size = dataset.max_size - left_trim - right_trim
         new_min_size = dataset.min_size - left_trim - right_trim
@@ -236,7 +528,7 @@ class TimeSeriesDataset(Dataset):
         updated_dataset = TimeSeriesDataset(
             temporal=new_temporal,
             temporal_cols=dataset.temporal_cols.copy(),
-            indptr=np.array(new_indptr).astype(np.int32),
+            indptr=new_indptr.astype(np.int32),
             max_size=new_max_size,
             min_size=new_min_size,
             static=dataset.static,
@@ -273,7 +565,6 @@ class TimeSeriesDataset(Dataset):
         temporal_cols = pd.Index(
             ["y"] + [c for c in df.columns if c not in ("unique_id", "ds", "y")]
         )
-        temporal = data.astype(np.float32, copy=False)
         indices = ids
         if isinstance(df, pd.DataFrame):
             dates = pd.Index(times, name="ds")
@@ -284,10 +575,15 @@ class TimeSeriesDataset(Dataset):
         min_size = min(sizes)
 
         # Add Available mask efficiently (without adding column to df)
+        # filling a single float32 array avoids keeping intermediate copies of the data
         if "available_mask" not in df.columns:
-            available_mask = np.ones((len(temporal), 1), dtype=np.float32)
-            temporal = np.append(temporal, available_mask, axis=1)
+            temporal = np.empty((data.shape[0], data.shape[1] + 1), dtype=np.float32)
+            temporal[:, :-1] = data
+            temporal[:, -1] = 1.0
             temporal_cols = temporal_cols.append(pd.Index(["available_mask"]))
+        else:
+            temporal = data.astype(np.float32, copy=False)
+        del data
 
         # Static features
         if static_df is not None:
@@ -312,7 +608,151 @@ class TimeSeriesDataset(Dataset):
             ds = ds[sort_idxs]
         return dataset, indices, dates, ds
 
-# %% ../nbs/tsdataset.ipynb 10
+# %% ../nbs/tsdataset.ipynb 11
+class TimeSeriesDeviceLoader:
+    """TimeSeriesDeviceLoader.
+
+    Iterable over ragged batches of a `TimeSeriesDataset` that are formed on a device, without a `DataLoader`.
+    `temporal`, `indptr`, `static` and the `available_cumsum` index are moved to `device` once,
+    every batch is then gathered by indexing them there. The series are shuffled with a generator on `device`,
+    that is passed along with the batches so that the models also sample their windows with it.
+
+    **Parameters:**<br>
+    `dataset`: TimeSeriesDataset, dataset to iterate over.<br>
+    `batch_size`: int=32, how many series per batch.<br>
+    `shuffle`: bool=False, set to `True` to have the series reshuffled at every epoch.<br>
+    `drop_last`: bool=False, set to `True` to drop the last incomplete batch.<br>
+    `device`: str or torch.device='cpu', device where the data is kept and the batches are formed.<br>
+    `seed`: int=None, seed of the device generator, drawn from torch's global generator if None.<br>
+    """
+
+    def __init__(
+        self,
+        dataset,
+        batch_size=32,
+        shuffle=False,
+        drop_last=False,
+        device="cpu",
+        seed=None,
+    ):
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.device = torch.device(device)
+        self.n_groups = dataset.n_groups
+        self.max_size = dataset.max_size
+        self.temporal_cols = dataset.temporal_cols
+        self.static_cols = dataset.static_cols
+
+        # Moved once, batches only index them
+        self.temporal = dataset.temporal.to(self.device)
+        self.indptr = torch.as_tensor(
+            np.asarray(dataset.indptr, dtype=np.int64), device=self.device
+        )
+        self.static = None if dataset.static is None else dataset.static.to(self.device)
+        self.available_cumsum = dataset.available_cumsum.to(self.device)
+
+        if seed is None:
+            seed = int(torch.randint(0, 2**62, size=(1,)))
+        self.generator = torch.Generator(device=self.device)
+        self.generator.manual_seed(seed)
+
+    def __len__(self):
+        if self.drop_last:
+            return self.n_groups // self.batch_size
+        return -(-self.n_groups // self.batch_size)
+
+    def __iter__(self):
+        if self.shuffle:
+            order = torch.randperm(
+                self.n_groups, generator=self.generator, device=self.device
+            )
+        else:
+            order = torch.arange(self.n_groups, device=self.device)
+        for i in range(len(self)):
+            yield self._get_ragged(
+                order[i * self.batch_size : (i + 1) * self.batch_size]
+            )
+
+    def _get_ragged(self, idxs):
+        # Same batches as `TimeSeriesDataset._get_ragged`, gathered with torch ops on the device
+        starts = self.indptr[idxs]
+        sizes = self.indptr[idxs + 1] - starts
+        indptr = torch.cat([sizes.new_zeros(1), sizes.cumsum(0)])
+        n_rows = int(indptr[-1])
+        rows = torch.arange(n_rows, device=self.device) + torch.repeat_interleave(
+            starts - indptr[:-1], sizes, output_size=n_rows
+        )
+
+        # Available observations before each row of the batch [sum(n_i) + 1],
+        # shifting every serie's counts to the end of the previous one
+        serie_starts = self.available_cumsum[starts]
+        serie_totals = self.available_cumsum[starts + sizes] - serie_starts
+        offsets = serie_totals.cumsum(0) - serie_totals - serie_starts
+        available_cumsum = torch.cat(
+            [
+                self.available_cumsum.new_zeros(1),
+                self.available_cumsum[rows + 1]
+                + torch.repeat_interleave(offsets, sizes, output_size=n_rows),
+            ]
+        )
+        batch = dict(
+            temporal=self.temporal[rows],
+            indptr=indptr,
+            max_size=self.max_size,
+            temporal_cols=self.temporal_cols,
+            available_cumsum=available_cumsum,
+            generator=self.generator,
+        )
+        if self.static is not None:
+            batch["static"] = self.static[idxs]
+            batch["static_cols"] = self.static_cols
+        return batch
+
+# %% ../nbs/tsdataset.ipynb 13
+class TimeSeriesShardSampler(Sampler):
+    """TimeSeriesShardSampler.
+
+    Batch sampler over shards of exactly `shard_size` series of a dataset, for models whose width is
+    a fixed number of series. The last shard is completed with the series that precede it, so every
+    serie is in at least one shard and the shards of the last series overlap.
+
+    **Parameters:**<br>
+    `n_groups`: int, number of series in the dataset.<br>
+    `shard_size`: int, number of series in every shard.<br>
+    `sampling`: str='ordered', `ordered` visits the consecutive shards of the dataset in order, `clustered` visits them in a random order
+    and `random` draws the shards from a random permutation of the series every epoch.<br>
+    """
+
+    def __init__(self, n_groups, shard_size, sampling="ordered"):
+        if shard_size > n_groups:
+            raise ValueError(
+                f"shard_size={shard_size} is larger than the {n_groups} series of the dataset"
+            )
+        if sampling not in ["ordered", "clustered", "random"]:
+            raise ValueError(
+                f"Unknown sampling {sampling}, use ordered, clustered or random"
+            )
+        self.n_groups = n_groups
+        self.shard_size = shard_size
+        self.sampling = sampling
+
+    def __len__(self):
+        return -(-self.n_groups // self.shard_size)
+
+    def __iter__(self):
+        if self.sampling == "random":
+            order = torch.randperm(self.n_groups).numpy()
+        else:
+            order = np.arange(self.n_groups)
+        starts = np.arange(len(self)) * self.shard_size
+        starts[-1] = self.n_groups - self.shard_size
+        if self.sampling == "clustered":
+            starts = starts[torch.randperm(len(starts)).numpy()]
+        for start in starts:
+            yield order[start : start + self.shard_size].tolist()
+
+# %% ../nbs/tsdataset.ipynb 15
 class TimeSeriesDataModule(pl.LightningDataModule):
     def __init__(
         self,
@@ -321,6 +761,10 @@ class TimeSeriesDataModule(pl.LightningDataModule):
         valid_batch_size=1024,
         num_workers=0,
         drop_last=False,
+        ragged=False,
+        device_resident=False,
+        shard_size=None,
+        shard_sampling="clustered",
     ):
         super().__init__()
         self.dataset = dataset
@@ -328,18 +772,51 @@ class TimeSeriesDataModule(pl.LightningDataModule):
         self.valid_batch_size = valid_batch_size
         self.num_workers = num_workers
         self.drop_last = drop_last
+        self.ragged = ragged
+        self.device_resident = device_resident
+        # Batches of exactly `shard_size` series, see `TimeSeriesShardSampler`
+        self.shard_size = shard_size
+        self.shard_sampling = shard_sampling
+
+    def _shard_loader(self, sampling):
+        sampler = TimeSeriesShardSampler(
+            len(self.dataset), shard_size=self.shard_size, sampling=sampling
+        )
+        return TimeSeriesLoader(
+            self.dataset, batch_sampler=sampler, num_workers=self.num_workers
+        )
 
     def train_dataloader(self):
+        if self.shard_size is not None:
+            return self._shard_loader(sampling=self.shard_sampling)
+
+        if self.device_resident:
+            # Ragged batches formed on the training device, no collation nor host-to-device copies
+            device = (
+                "cpu" if self.trainer is None else self.trainer.strategy.root_device
+            )
+            return TimeSeriesDeviceLoader(
+                self.dataset,
+                batch_size=self.batch_size,
+                shuffle=True,
+                drop_last=self.drop_last,
+                device=device,
+            )
+
         loader = TimeSeriesLoader(
             self.dataset,
             batch_size=self.batch_size,
             num_workers=self.num_workers,
             shuffle=True,
             drop_last=self.drop_last,
+            ragged=self.ragged,
         )
         return loader
 
     def val_dataloader(self):
+        if self.shard_size is not None:
+            return self._shard_loader(sampling="ordered")
+
         loader = TimeSeriesLoader(
             self.dataset,
             batch_size=self.valid_batch_size,
@@ -350,6 +827,9 @@ class TimeSeriesDataModule(pl.LightningDataModule):
         return loader
 
     def predict_dataloader(self):
+        if self.shard_size is not None:
+            return self._shard_loader(sampling="ordered")
+
         loader = TimeSeriesLoader(
             self.dataset,
             batch_size=self.valid_batch_size,